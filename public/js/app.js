@@ -4,61 +4,260 @@ document.addEventListener('DOMContentLoaded', () => {
     const locationDisplay = document.getElementById('current-location');
     const scheduleBody = document.getElementById('schedule-body');
 
-    // --- TEMPORARY: Simulate API Data for the MVP Front-End Test ---
-    // In production, this data would come from your MongoDB via the Serverless API.
-    const MOCK_API_DATA = [
-        { 
-            date_time: "7:00 PM CST", 
-            matchup: "Lakers @ Celtics (NBA)",
-            tier1: "ESPN, ESPN+",
-            regional_map: {
-                "90210": "Spectrum SportsNet",  // LA Area
-                "02108": "NBC Sports Boston",  // Boston Area
-                "default": "NBA League Pass"
-            }
-        },
-        { 
-            date_time: "1:30 PM CST", 
-            matchup: "Tottenham vs Chelsea (EPL)",
-            tier1: "USA Network, Peacock",
-            regional_map: {
-                "default": "Peacock Premium"
-            }
-        },
-        { 
-            date_time: "9:00 PM CST", 
-            matchup: "Warriors @ Suns (NBA)",
-            tier1: "NBA TV",
-            regional_map: {
-                "90210": "NBC Sports Bay Area", // San Francisco area (often blacked out if local)
-                "85001": "Suns Live (Local Stream)", // Phoenix area
-                "default": "NBA League Pass"
-            }
-        }
+    // Lookup API (src/api/lookup_game.py). Override with window.WWL_API_BASE when the API
+    // is served from another origin (e.g. http://localhost:5001 in development).
+    const API_BASE = window.WWL_API_BASE || '';
+
+    // --- Fallback data when the API is unreachable (same shape as /api/schedule games) ---
+    const FALLBACK_GAMES = [
+        { game_id: 'fallback-1', sport: 'NBA', time: '7:00 PM ET', time_tbd: false, start_utc: null,
+          away_team: 'Lakers', home_team: 'Celtics', national_broadcasts: ['ESPN', 'ESPN+'], local_channel: null },
+        { game_id: 'fallback-2', sport: 'EPL', time: '1:30 PM ET', time_tbd: false, start_utc: null,
+          away_team: 'Tottenham Hotspur', home_team: 'Chelsea', national_broadcasts: ['USA Network', 'Peacock'], local_channel: null },
     ];
 
     let currentZipCode = localStorage.getItem('zipCode') || null;
+    // game_id -> game in start order; change events update it in place
+    let games = new Map();
+    // Eastern calendar days (YYYY-MM-DD) the loaded schedule covers
+    let scheduleRange = null;
+    // Change-log seq the loaded schedule is current to (the API's 'version')
+    let scheduleVersion = null;
+    let changeSource = null;
 
     // --- Core Logic: Render Schedule ---
+    function formatTime(game) {
+        if (game.start_utc && !game.time_tbd) {
+            return new Date(game.start_utc).toLocaleTimeString([], { hour: 'numeric', minute: '2-digit' });
+        }
+        return game.time || 'TBD';
+    }
+
+    // Team names and channels come from scraped pages: set them as text, never as markup
+    function textCell(row, text) {
+        const cell = row.insertCell();
+        cell.textContent = text;
+        return cell;
+    }
+
+    function fillRow(row, game) {
+        const localSolution = game.local_channel || 'NBA League Pass / National Feed';
+
+        row.dataset.gameId = game.game_id;
+        row.replaceChildren();
+        textCell(row, formatTime(game));
+        textCell(row, `${game.away_team} @ ${game.home_team} (${game.sport})`);
+        textCell(row, (game.national_broadcasts || []).join(', ') || '—');
+
+        // Highlight the primary Tier 2 value
+        const localCell = textCell(row, '');
+        localCell.className = 'local-column';
+        const highlight = document.createElement('span');
+        highlight.className = 'local-solution-highlight';
+        highlight.textContent = localSolution;
+        localCell.appendChild(highlight);
+    }
+
     function renderSchedule(zipCode) {
         scheduleBody.innerHTML = '';
-        const displayZip = zipCode ? zipCode : 'N/A';
         locationDisplay.textContent = zipCode ? `ZIP: ${zipCode}` : '[Default: US National Feed]';
+        games.forEach(game => fillRow(scheduleBody.insertRow(), game));
+    }
+
+    function setGames(list) {
+        games = new Map(list.map(game => [game.game_id, game]));
+    }
+
+    function sortGames() {
+        setGames([...games.values()].sort((a, b) => (a.start_utc || '').localeCompare(b.start_utc || '')));
+    }
+
+    // Applies a diff to `games` and touches only the affected table rows
+    function patchSchedule(changed, removed) {
+        const touched = new Set();
+        removed.forEach(gameId => {
+            if (games.delete(gameId)) touched.add(gameId);
+        });
+        changed.forEach(game => {
+            games.set(game.game_id, game);
+            touched.add(game.game_id);
+        });
+        if (!touched.size) return false;
+        sortGames();
+
+        // Drop the touched rows, then insert the surviving ones at their new positions
+        [...scheduleBody.rows].forEach(row => {
+            if (touched.has(row.dataset.gameId)) row.remove();
+        });
+        [...games.keys()].forEach((gameId, index) => {
+            if (touched.has(gameId)) fillRow(scheduleBody.insertRow(index), games.get(gameId));
+        });
+        return true;
+    }
+
+    // --- Local cache of the last sync, per ZIP (localStorage) ---
+    // {version, start, end, games}: on a repeat visit the cached rows render at once and only
+    // the changes since `version` are fetched (/api/schedule/delta).
+    function cacheKey(zipCode) {
+        return `scheduleCache:${zipCode || 'national'}`;
+    }
+
+    function readCache(zipCode) {
+        try {
+            return JSON.parse(localStorage.getItem(cacheKey(zipCode)));
+        } catch (err) {
+            return null;
+        }
+    }
+
+    function writeCache(zipCode) {
+        if (scheduleVersion == null || !scheduleRange) return;
+        const entry = { version: scheduleVersion, ...scheduleRange, games: [...games.values()] };
+        try {
+            localStorage.setItem(cacheKey(zipCode), JSON.stringify(entry));
+        } catch (err) {
+            console.warn('Could not cache the schedule.', err);
+        }
+    }
+
+    // --- Static schedule files (src/api/static_export.py), served by the CDN ---
+    // Today's games come from data/schedule/<DMA or national>/<week>.json when the export
+    // covers this week; otherwise the API answers as before.
+    const STATIC_BASE = window.WWL_STATIC_BASE || 'data';
+    let manifestRequest = null;
+
+    async function fetchJson(url) {
+        const response = await fetch(url);
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        return response.json();
+    }
+
+    function todayEastern() {
+        // en-CA formats as YYYY-MM-DD
+        return new Intl.DateTimeFormat('en-CA', { timeZone: 'America/New_York' }).format(new Date());
+    }
+
+    function weekStart(day) {
+        const date = new Date(`${day}T00:00:00Z`);
+        date.setUTCDate(date.getUTCDate() - (date.getUTCDay() + 6) % 7);
+        return date.toISOString().slice(0, 10);
+    }
+
+    async function loadStaticSchedule(zipCode) {
+        manifestRequest = manifestRequest || fetchJson(`${STATIC_BASE}/manifest.json`);
+        const manifest = await manifestRequest;
+        const today = todayEastern();
+        const week = weekStart(today);
+        if (!manifest.weeks.includes(week)) throw new Error(`week ${week} not exported`);
+
+        let dmaCode = null;
+        if (zipCode) {
+            const shard = await fetchJson(`${STATIC_BASE}/zips/${zipCode.slice(0, 3)}.json`);
+            dmaCode = shard[zipCode] || null;
+        }
+        const market = dmaCode && (manifest.markets[dmaCode] || []).includes(week) ? dmaCode : 'national';
+        const data = await fetchJson(`${STATIC_BASE}/schedule/${market}/${week}.json?v=${manifest.version}`);
+        return {
+            games: data.games.filter(game => game.game_date === today),
+            start: today, end: today, version: manifest.seq,
+        };
+    }
+
+    function locationQuery(zipCode) {
+        return zipCode ? `zip=${encodeURIComponent(zipCode)}` : '';
+    }
+
+    async function loadFullSchedule(zipCode) {
+        try {
+            return await loadStaticSchedule(zipCode);
+        } catch (err) {
+            return fetchJson(`${API_BASE}/api/schedule?${locationQuery(zipCode)}`);
+        }
+    }
+
+    // Brings the cached schedule on screen up to date with one small request
+    async function syncCachedSchedule(zipCode, cached) {
+        const query = `${locationQuery(zipCode)}&start=${cached.start}&end=${cached.end}&since=${cached.version}`;
+        const delta = await fetchJson(`${API_BASE}/api/schedule/delta?${query}`);
+        if (delta.full) {
+            setGames(delta.games);
+            renderSchedule(zipCode);
+        } else {
+            patchSchedule(delta.changed, delta.removed);
+        }
+        scheduleVersion = delta.version;
+    }
+
+    async function loadSchedule(zipCode) {
+        const today = todayEastern();
+        const cached = readCache(zipCode);
+        let synced = false;
+
+        if (cached && cached.start === today && cached.end === today && cached.version != null) {
+            setGames(cached.games);
+            scheduleRange = { start: cached.start, end: cached.end };
+            scheduleVersion = cached.version;
+            renderSchedule(zipCode);
+            try {
+                await syncCachedSchedule(zipCode, cached);
+                synced = true;
+            } catch (err) {
+                console.warn('Could not sync the cached schedule, reloading it.', err);
+            }
+        }
+
+        if (!synced) {
+            try {
+                const data = await loadFullSchedule(zipCode);
+                setGames(data.games);
+                scheduleRange = { start: data.start, end: data.end };
+                scheduleVersion = data.version ?? null;
+                synced = true;
+            } catch (err) {
+                console.warn('Schedule API unavailable, showing sample data.', err);
+                setGames(FALLBACK_GAMES);
+                scheduleRange = null;
+                scheduleVersion = null;
+            }
+            renderSchedule(zipCode);
+        }
+        if (synced) writeCache(zipCode);
+        subscribeToChanges(zipCode);
+    }
+
+    // --- Live updates: Server-Sent Events from /api/schedule/changes ---
+    // The server filters changes to this market and sends the changed games already resolved,
+    // so only the diff crosses the wire. The stream starts from the loaded schedule's version,
+    // so nothing logged in between is missed. EventSource reconnects by itself and resumes
+    // from the last event id; a 'reset' means the server can no longer resume and we reload.
+    function subscribeToChanges(zipCode) {
+        if (changeSource) changeSource.close();
+        if (!window.EventSource) return;
+
+        const params = [locationQuery(zipCode), scheduleVersion != null ? `since=${scheduleVersion}` : '']
+            .filter(Boolean).join('&');
+        changeSource = new EventSource(`${API_BASE}/api/schedule/changes${params ? '?' + params : ''}`);
+
+        changeSource.addEventListener('games', event => {
+            const update = JSON.parse(event.data);
+            const changed = [];
+            const removed = [];
+            update.games.forEach(game => {
+                const inRange = scheduleRange && game.game_date >= scheduleRange.start && game.game_date <= scheduleRange.end;
+                if (inRange) {
+                    changed.push(game);
+                } else {
+                    removed.push(game.game_id);  // rescheduled to another day
+                }
+            });
+            patchSchedule(changed, removed);
+            scheduleVersion = update.seq;
+            writeCache(currentZipCode);
+        });
 
-        MOCK_API_DATA.forEach(game => {
-            let localSolution = game.regional_map[zipCode] || game.regional_map['default'];
-            
-            // Highlight the primary Tier 2 value
-            const localHtml = `<span class="local-solution-highlight">${localSolution}</span>`;
-
-            const row = scheduleBody.insertRow();
-            
-            row.innerHTML = `
-                <td>${game.date_time}</td>
-                <td>${game.matchup}</td>
-                <td>${game.tier1}</td>
-                <td class="local-column">${localHtml}</td>
-            `;
+        changeSource.addEventListener('reset', () => {
+            localStorage.removeItem(cacheKey(currentZipCode));
+            loadSchedule(currentZipCode);
         });
     }
 
@@ -68,9 +267,7 @@ document.addEventListener('DOMContentLoaded', () => {
         if (inputZip.length === 5 && !isNaN(inputZip)) {
             currentZipCode = inputZip;
             localStorage.setItem('zipCode', currentZipCode);
-            // In production: You would call your Serverless API here with the ZIP code.
-            // fetch('/api/schedule?zip=' + inputZip).then(res => res.json()).then(data => renderSchedule(data, inputZip));
-            renderSchedule(currentZipCode);
+            loadSchedule(currentZipCode);
         } else {
             alert('Please enter a valid 5-digit ZIP code.');
         }
@@ -80,5 +277,5 @@ document.addEventListener('DOMContentLoaded', () => {
     if (currentZipCode) {
         zipCodeInput.value = currentZipCode;
     }
-    renderSchedule(currentZipCode);
-});
\ No newline at end of file
+    loadSchedule(currentZipCode);
+});
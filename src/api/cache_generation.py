@@ -0,0 +1,46 @@
+# src/api/cache_generation.py
+# Process-independent cache generation counter, stored in MongoDB.
+# Scrapes and rule writes bump it; the response cache keys every entry by it, so a bump
+# invalidates all cached API responses in every worker at once. Kept free of Flask so the
+# scrapers can import it cheaply.
+
+import logging
+import os
+import threading
+import time
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+# How long a process trusts its last read of the counter before asking MongoDB again.
+GENERATION_CHECK_INTERVAL = float(os.getenv("RESPONSE_CACHE_GENERATION_CHECK", "2"))
+
+GENERATION_COLLECTION = 'cache_state'
+GENERATION_ID = 'response_generation'
+
+_generation = {'value': None, 'checked_at': 0.0}
+_generation_lock = threading.Lock()
+
+
+def current_generation(db) -> int:
+    now = time.monotonic()
+    with _generation_lock:
+        if _generation['value'] is not None and now - _generation['checked_at'] < GENERATION_CHECK_INTERVAL:
+            return _generation['value']
+    doc = db[GENERATION_COLLECTION].find_one({'_id': GENERATION_ID}) or {}
+    with _generation_lock:
+        _generation['value'] = doc.get('value', 0)
+        _generation['checked_at'] = now
+        return _generation['value']
+
+
+def bump_generation(db, reason: str = '') -> int:
+    """Invalidates every cached response (in every process). Called after scrapes and rule writes."""
+    doc = db[GENERATION_COLLECTION].find_one_and_update(
+        {'_id': GENERATION_ID}, {'$inc': {'value': 1}}, upsert=True, return_document=ReturnDocument.AFTER
+    )
+    with _generation_lock:
+        _generation['value'] = doc['value']
+        _generation['checked_at'] = time.monotonic()
+    logger.info(f"Response cache generation bumped to {doc['value']}{f' ({reason})' if reason else ''}.")
+    return doc['value']
@@ -0,0 +1,301 @@
+# src/api/change_feed.py
+# Append-only log of schedule changes, read by the SSE endpoint (/api/schedule/changes).
+# Writers (scrape runs, DMA rule saves and imports) record which games changed and for which
+# markets; each entry gets a sequence number that clients resume from (SSE Last-Event-ID).
+#
+#     {'seq': 42, 'at': <UTC>, 'source': 'NBA scrape', 'dma_codes': None, 'game_ids': [...]}
+#
+# dma_codes None means every market (scraped fields changed); a list means only those
+# markets' resolution changed (rule writes). Readers resolve the games for their own market.
+#
+# Storage: the schedule_changes collection (TTL-expired after CHANGE_LOG_RETENTION_HOURS),
+# or a JSON-lines file when CHANGE_LOG_FILE is set (development and tests, no MongoDB needed).
+# On a replica set readers wait on a change stream; elsewhere they poll.
+# Kept free of Flask so the scrapers can import it cheaply.
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from .cache_generation import GENERATION_COLLECTION
+from .schedule_resolver import SCHEDULE_COLLECTIONS, fetch_games_by_ids, load_rules, serialize_game
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serializes this process's writers
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CHANGE_LOG_ENABLED = os.getenv("CHANGE_LOG", "1") != "0"
+CHANGE_LOG_FILE = os.getenv("CHANGE_LOG_FILE", "")
+CHANGE_LOG_RETENTION_HOURS = float(os.getenv("CHANGE_LOG_RETENTION_HOURS", "48"))
+CHANGE_POLL_INTERVAL = float(os.getenv("CHANGE_POLL_INTERVAL", "1"))
+# Use MongoDB change streams to wake readers when the server supports them (replica sets)
+CHANGE_WATCH = os.getenv("CHANGE_FEED_WATCH", "1") != "0"
+# A missing sequence number younger than this is a write still in flight: readers wait for it
+# instead of skipping past it. Older gaps are a writer that died between its two writes.
+CHANGE_GAP_TIMEOUT = float(os.getenv("CHANGE_GAP_TIMEOUT", "5"))
+
+CHANGES_COLLECTION = 'schedule_changes'
+SEQUENCE_ID = 'change_seq'
+READ_LIMIT = 500
+# A delta spanning more entries than this is answered with the full schedule instead
+MAX_DELTA_ENTRIES = int(os.getenv("CHANGE_MAX_DELTA_ENTRIES", "5000"))
+# Rule changes only announce games that have not finished yet
+RULE_CHANGE_LOOKBACK = timedelta(hours=12)
+
+_file_lock = threading.Lock()
+
+
+def _utcnow() -> datetime:
+    # Naive UTC, as stored in BSON
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# --- Writing ---
+
+def _append_to_file(entry: dict) -> int:
+    """Appends under an exclusive lock so sequence numbers stay contiguous across processes."""
+    with _file_lock, open(CHANGE_LOG_FILE, 'a+', encoding='utf-8') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.seek(0)
+            last = None
+            for line in f:
+                if line.strip():
+                    last = line
+            entry['seq'] = json.loads(last)['seq'] + 1 if last else 1
+            f.write(json.dumps(entry, default=str, separators=(',', ':')) + '\n')
+            f.flush()
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    return entry['seq']
+
+
+def record_change(db, source: str, game_ids, dma_codes=None) -> int | None:
+    """Logs that `game_ids` changed (for `dma_codes`, or every market). Returns the entry's seq."""
+    game_ids = list(dict.fromkeys(str(game_id) for game_id in game_ids))
+    if not CHANGE_LOG_ENABLED or not game_ids:
+        return None
+    entry = {'at': _utcnow(), 'source': source,
+             'dma_codes': sorted(dma_codes) if dma_codes is not None else None, 'game_ids': game_ids}
+
+    if CHANGE_LOG_FILE:
+        seq = _append_to_file(entry)
+    else:
+        counter = db[GENERATION_COLLECTION].find_one_and_update(
+            {'_id': SEQUENCE_ID}, {'$inc': {'value': 1}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        seq = entry['seq'] = counter['value']
+        db[CHANGES_COLLECTION].insert_one(entry)
+    logger.info(f"Change {seq} logged ({source}): {len(game_ids)} games"
+                f"{'' if dma_codes is None else ' for ' + ', '.join(sorted(dma_codes))}.")
+    return seq
+
+
+def record_game_changes(db, source: str, games: list, key: str) -> int | None:
+    """Scrape side: scraped fields changed, so every market sees these games change."""
+    return record_change(db, source, [game[key] for game in games])
+
+
+def record_rule_changes(db, source: str, rules) -> list:
+    """
+    Rule side: each DMA whose rules changed gets one entry listing the upcoming games of the
+    rules' teams, since only that market's local channel can have changed.
+    """
+    teams_by_dma = {}
+    for rule in rules:
+        teams_by_dma.setdefault(rule['dma_code'], set()).add((rule['sport'], rule['team_name']))
+
+    since = _utcnow() - RULE_CHANGE_LOOKBACK
+    seqs = []
+    for dma_code, teams in sorted(teams_by_dma.items()):
+        team_filter = {'$or': [{'sport': sport, '$or': [{'home_team': team}, {'away_team': team}]}
+                               for sport, team in sorted(teams)]}
+        game_ids = []
+        for collection in SCHEDULE_COLLECTIONS:
+            for doc in db[collection].find({**team_filter, 'start_utc': {'$gte': since}}, {'game_id': 1}):
+                game_ids.append(doc.get('game_id') or doc['_id'])
+        seq = record_change(db, source, game_ids, dma_codes=[dma_code])
+        if seq is not None:
+            seqs.append(seq)
+    return seqs
+
+
+# --- Reading ---
+
+def _read_file(after_seq: int) -> list:
+    try:
+        with open(CHANGE_LOG_FILE, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+    return [entry for entry in entries if entry['seq'] > after_seq]
+
+
+def _contiguous(entries: list, after_seq: int) -> list:
+    """Entries up to the first recent gap in the sequence (see CHANGE_GAP_TIMEOUT)."""
+    result, expected = [], after_seq + 1
+    for entry in entries:
+        if entry['seq'] != expected:
+            at = entry['at']
+            at = datetime.fromisoformat(at) if isinstance(at, str) else at
+            if _utcnow() - at < timedelta(seconds=CHANGE_GAP_TIMEOUT):
+                break
+        result.append(entry)
+        expected = entry['seq'] + 1
+    return result
+
+
+def read_changes(db, after_seq: int, limit: int = READ_LIMIT) -> list:
+    """Log entries after `after_seq`, in sequence order."""
+    if CHANGE_LOG_FILE:
+        entries = _read_file(after_seq)[:limit]
+    else:
+        cursor = db[CHANGES_COLLECTION].find({'seq': {'$gt': after_seq}}, {'_id': 0}).sort('seq', 1).limit(limit)
+        entries = list(cursor)
+    return _contiguous(entries, after_seq)
+
+
+def latest_seq(db) -> int:
+    if CHANGE_LOG_FILE:
+        entries = _read_file(0)
+        return entries[-1]['seq'] if entries else 0
+    doc = db[GENERATION_COLLECTION].find_one({'_id': SEQUENCE_ID}) or {}
+    return doc.get('value', 0)
+
+
+def oldest_seq(db) -> int | None:
+    """Oldest entry still retained; None when the log is empty."""
+    if CHANGE_LOG_FILE:
+        entries = _read_file(0)
+        return entries[0]['seq'] if entries else None
+    doc = db[CHANGES_COLLECTION].find_one({}, {'seq': 1}, sort=[('seq', 1)])
+    return doc['seq'] if doc else None
+
+
+def _open_stream(db):
+    if CHANGE_LOG_FILE or not CHANGE_WATCH:
+        return None
+    try:
+        return db[CHANGES_COLLECTION].watch(
+            [{'$match': {'operationType': 'insert'}}], max_await_time_ms=int(CHANGE_POLL_INTERVAL * 1000)
+        )
+    except Exception as e:
+        # Standalone servers (OperationFailure) and in-memory stand-ins have no change streams
+        logger.info(f"Change streams unavailable ({e}); polling the change log.")
+        return None
+
+
+def follow_changes(db, after_seq: int, heartbeat: float = 15.0, deadline: float | None = None):
+    """
+    Yields batches of new entries as they are logged, and an empty batch every `heartbeat`
+    seconds without changes. Stops at `deadline` (time.monotonic()).
+    A change stream, when available, is only a wake-up signal: entries are always read
+    from the log by seq, so ordering and resumption work the same with or without it.
+    """
+    stream = _open_stream(db)
+    last_yield = time.monotonic()
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            entries = read_changes(db, after_seq)
+            if entries:
+                after_seq = entries[-1]['seq']
+                last_yield = time.monotonic()
+                yield entries
+                continue
+            if time.monotonic() - last_yield >= heartbeat:
+                last_yield = time.monotonic()
+                yield []
+            if stream is None:
+                time.sleep(CHANGE_POLL_INTERVAL)
+                continue
+            try:
+                stream.try_next()
+            except PyMongoError as e:
+                logger.warning(f"Change stream failed ({e}); falling back to polling.")
+                stream.close()
+                stream = None
+    finally:
+        if stream is not None:
+            stream.close()
+
+
+def market_game_ids(entries: list, dma_code: str | None) -> list:
+    """Ids of the games whose resolution for `dma_code` changed in `entries`, first mention first."""
+    game_ids = []
+    for entry in entries:
+        markets = entry.get('dma_codes')
+        if markets is None or (dma_code and dma_code in markets):
+            game_ids.extend(entry['game_ids'])
+    return list(dict.fromkeys(game_ids))
+
+
+def market_update(db, entries: list, dma_code: str | None, sport: str | None = None) -> dict | None:
+    """
+    The part of `entries` that concerns one market, resolved for it:
+    {'seq', 'dma_code', 'games': [...]} or None when nothing applies.
+    """
+    game_ids = market_game_ids(entries, dma_code)
+    if not game_ids:
+        return None
+
+    games = fetch_games_by_ids(db, game_ids)
+    if sport:
+        games = [game for game in games if game.get('sport') == sport]
+    if not games:
+        return None
+    rules = load_rules(db, [dma_code]) if dma_code else {}
+    return {
+        'seq': entries[-1]['seq'],
+        'dma_code': dma_code,
+        'games': [serialize_game(game, dma_code, rules) for game in games],
+    }
+
+
+def market_delta(db, dma_code: str | None, since: int, start_date, end_date) -> dict | None:
+    """
+    What changed in one market's schedule for [start_date, end_date] after version `since`:
+    {'version', 'changed': [games resolved for the market], 'removed': [game_id, ...]}.
+    'removed' lists changed games that left the range (or the database); clients drop them if
+    they have them. None when the log no longer reaches back to `since`: reload everything.
+    """
+    latest = latest_seq(db)
+    if since > latest:
+        return None  # the log was reset since the client synced
+    if since == latest:
+        return {'version': latest, 'changed': [], 'removed': []}
+    oldest = oldest_seq(db)
+    if oldest is None or oldest > since + 1:
+        return None
+
+    entries, version = [], since
+    while version < latest and len(entries) < MAX_DELTA_ENTRIES:
+        batch = read_changes(db, version)
+        if not batch:
+            break  # a write still in flight; the client picks it up on its next sync
+        entries.extend(batch)
+        version = batch[-1]['seq']
+    if version < latest and len(entries) >= MAX_DELTA_ENTRIES:
+        return None  # cheaper to send the whole schedule
+
+    game_ids = market_game_ids(entries, dma_code)
+    start, end = start_date.isoformat(), end_date.isoformat()
+    games = [game for game in fetch_games_by_ids(db, game_ids) if start <= (game.get('game_date') or '') <= end]
+    games.sort(key=lambda game: (game.get('start_utc') or datetime.max, str(game['_id'])))
+    rules = load_rules(db, [dma_code]) if dma_code and games else {}
+    changed = [serialize_game(game, dma_code, rules) for game in games]
+    kept = {game['game_id'] for game in changed}
+    return {
+        'version': version,
+        'changed': changed,
+        'removed': [game_id for game_id in game_ids if game_id not in kept],
+    }
@@ -0,0 +1,160 @@
+# src/api/handlers.py
+# Serverless entry points for the read API (AWS Lambda / Netlify Functions).
+# They serve the same routes and JSON as lookup_game.py through schedule_api.py, but never
+# import Flask, which is most of that module's cold start. The response cache, ETags and
+# Cache-Control work as in the Flask app (and share entries with it).
+#
+#   handler          every read route below, dispatched on the path
+#   schedule_handler / delta_handler / range_handler / batch_handler   one route each
+#
+# Events are API Gateway REST (v1) or HTTP API (v2) payloads; Netlify Functions use the same
+# shape. The SSE stream (/api/schedule/changes) needs a long-lived connection and stays on
+# the Flask app. Check the import cost with: python -m src.bench.import_budget
+
+import base64
+import json
+import logging
+from datetime import date, datetime, time, timezone
+
+from ..scraper.scraper_config import get_mongo_client
+from .response_cache import cache_control, cache_key, etag_matches, lookup_entry, store_entry
+from .schedule_api import batch_response, delta_response, range_response, schedule_response
+
+logger = logging.getLogger(__name__)
+
+# path -> (method, response function)
+ROUTES = {
+    '/api/schedule': ('GET', schedule_response),
+    '/api/schedule/delta': ('GET', delta_response),
+    '/api/schedule/range': ('GET', range_response),
+    '/api/schedule/batch': ('POST', batch_response),
+}
+JSON_MIMETYPE = 'application/json'
+
+
+def _json_default(value):
+    # The conversions of Flask's default JSON provider, without importing Flask. Only reached
+    # for values JSON cannot encode, so the imports stay off the cold-start path.
+    from decimal import Decimal
+    from email.utils import format_datetime
+    from uuid import UUID
+
+    if isinstance(value, date):
+        moment = value if isinstance(value, datetime) else datetime.combine(value, time())
+        moment = moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+        return format_datetime(moment, usegmt=True)
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode(payload) -> bytes:
+    """
+    Compact JSON in the layout jsonify uses outside debug mode. Cache entries are shared with
+    the Flask app as stored bytes plus their ETag, so whichever entry point fills an entry,
+    both serve it unchanged; nothing relies on the two encoders agreeing byte for byte.
+    """
+    return (json.dumps(payload, sort_keys=True, separators=(',', ':'), default=_json_default) + '\n').encode('utf-8')
+
+
+def _parse_event(event: dict) -> dict:
+    http = (event.get('requestContext') or {}).get('http') or {}
+    path = event.get('rawPath') or event.get('path') or '/'
+    # Netlify and API Gateway stages prefix the path (/.netlify/functions/api/..., /prod/api/...)
+    if '/api/' in path:
+        path = path[path.rindex('/api/'):]
+
+    if event.get('multiValueQueryStringParameters'):
+        args = [(name, value) for name, values in event['multiValueQueryStringParameters'].items()
+                for value in values or ()]
+    else:
+        args = list((event.get('queryStringParameters') or {}).items())
+
+    body = event.get('body') or ''
+    body = base64.b64decode(body) if event.get('isBase64Encoded') else body.encode('utf-8')
+    return {
+        'method': (event.get('httpMethod') or http.get('method') or 'GET').upper(),
+        'path': path.rstrip('/') or '/',
+        'args': args,
+        'headers': {name.lower(): value for name, value in (event.get('headers') or {}).items()},
+        'body': body,
+    }
+
+
+def _response(status: int, body: bytes = b'', headers=None) -> dict:
+    return {
+        'statusCode': status,
+        'headers': {'Content-Type': JSON_MIMETYPE, **(headers or {})},
+        'body': body.decode('utf-8'),
+        'isBase64Encoded': False,
+    }
+
+
+def _error(status: int, message: str) -> dict:
+    return _response(status, _encode({"error": message}))
+
+
+def _call(respond, request: dict) -> tuple:
+    if request['method'] == 'POST':
+        try:
+            data = json.loads(request['body'] or b'null')
+        except ValueError:
+            data = None
+        return respond(get_mongo_client(), data or {})
+    args = {}
+    for name, value in request['args']:
+        args.setdefault(name, value)  # first value wins, like Flask's request.args.get
+    return respond(get_mongo_client(), args)
+
+
+def handle(request: dict) -> dict:
+    """Serves one parsed request (see _parse_event)."""
+    route = ROUTES.get(request['path'])
+    if route is None:
+        return _error(404, "Not found")
+    method, respond = route
+    if request['method'] != method:
+        return _error(405, "Method not allowed")
+
+    key = cache_key(method, request['path'], request['args'], request['body'])
+    entry = lookup_entry(key) if key else None
+    if entry is None:
+        if get_mongo_client() is None:
+            return _error(500, "Database connection failed")
+        payload, status = _call(respond, request)
+        body = _encode(payload)
+        if status != 200 or key is None:
+            return _response(status, body)
+        entry = store_entry(key, body, JSON_MIMETYPE)
+
+    headers = {'ETag': entry['etag'], 'Cache-Control': cache_control(True)}
+    if etag_matches(request['headers'].get('if-none-match'), entry['etag']):
+        return _response(304, headers=headers)
+    return _response(entry['status'], entry['body'], {**headers, 'Content-Type': entry['mimetype']})
+
+
+def handler(event, context=None) -> dict:
+    """Lambda / Netlify Functions entry point for every read route."""
+    return handle(_parse_event(event))
+
+
+# One function per route: each deploys on its own and serves its path whatever URL invokes it
+
+def _handle_route(event, path: str) -> dict:
+    return handle({**_parse_event(event), 'path': path})
+
+
+def schedule_handler(event, context=None) -> dict:
+    return _handle_route(event, '/api/schedule')
+
+
+def delta_handler(event, context=None) -> dict:
+    return _handle_route(event, '/api/schedule/delta')
+
+
+def range_handler(event, context=None) -> dict:
+    return _handle_route(event, '/api/schedule/range')
+
+
+def batch_handler(event, context=None) -> dict:
+    return _handle_route(event, '/api/schedule/batch')
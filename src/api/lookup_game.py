@@ -0,0 +1,159 @@
+# src/api/lookup_game.py
+# Layer 2 lookup API: resolves a ZIP code (or DMA) and a date range into the schedule,
+# with national broadcasts and the local channel for that market.
+# Run locally with `python -m src.api.lookup_game`.
+
+from flask import Flask, Response, request, jsonify, stream_with_context
+import json
+import logging
+import os
+import time
+
+from ..scraper.scraper_config import get_mongo_client
+from .schedule_api import (
+    batch_response, delta_response, handle_db_error, range_response, schedule_response,
+)
+from .schedule_resolver import InvalidLookup, normalize_zip, resolve_locations
+from .change_feed import follow_changes, latest_seq, market_update, oldest_seq
+from .response_cache import cached_response
+
+app = Flask(__name__)
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Server-Sent Events (/api/schedule/changes). Streams end after SSE_MAX_SECONDS so workers are
+# recycled; EventSource reconnects on its own and resumes from Last-Event-ID.
+SSE_MAX_SECONDS = float(os.getenv("SSE_MAX_SECONDS", "300"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "3000"))
+
+
+# --- Routes (request handling lives in schedule_api.py, shared with the serverless handlers) ---
+
+@app.route('/api/schedule', methods=['GET'])
+@cached_response()
+def get_schedule():
+    """Schedule for one market; see schedule_api.schedule_response."""
+    db = get_mongo_client()
+    if db is None:
+        return jsonify({"error": "Database connection failed"}), 500
+    payload, status = schedule_response(db, request.args)
+    return jsonify(payload), status
+
+
+@app.route('/api/schedule/delta', methods=['GET'])
+@cached_response()
+def get_schedule_delta():
+    """Changes since an earlier schedule response; see schedule_api.delta_response."""
+    db = get_mongo_client()
+    if db is None:
+        return jsonify({"error": "Database connection failed"}), 500
+    payload, status = delta_response(db, request.args)
+    return jsonify(payload), status
+
+
+@app.route('/api/schedule/range', methods=['GET'])
+@cached_response()
+def get_schedule_range():
+    """Games starting in a UTC window; see schedule_api.range_response."""
+    db = get_mongo_client()
+    if db is None:
+        return jsonify({"error": "Database connection failed"}), 500
+    payload, status = range_response(db, request.args)
+    return jsonify(payload), status
+
+
+@app.route('/api/schedule/batch', methods=['POST'])
+@cached_response()
+def get_schedule_batch():
+    """Batch lookup for several markets; see schedule_api.batch_response."""
+    db = get_mongo_client()
+    if db is None:
+        return jsonify({"error": "Database connection failed"}), 500
+    payload, status = batch_response(db, request.get_json(silent=True) or {})
+    return jsonify(payload), status
+
+
+def _sse(event: str, data: dict, event_id=None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ''
+    return f"{head}event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def change_events(db, dma_code: str | None, sport: str | None, since: int | None):
+    """
+    The SSE body: 'ready' with the starting seq, then one 'games' event per batch of log
+    entries that concerns this market, with the games already resolved for it.
+    'reset' means the log no longer reaches back to `since`: reload the full schedule.
+    """
+    yield f"retry: {SSE_RETRY_MS}\n\n"
+    try:
+        latest = latest_seq(db)
+        if since is None or since > latest:
+            since = latest
+        elif since < latest:
+            oldest = oldest_seq(db)
+            if oldest is None or oldest > since + 1:
+                yield _sse('reset', {'seq': latest}, latest)
+                since = latest
+        yield _sse('ready', {'seq': since, 'dma_code': dma_code, 'sport': sport})
+
+        deadline = time.monotonic() + SSE_MAX_SECONDS
+        for entries in follow_changes(db, since, heartbeat=SSE_HEARTBEAT_SECONDS, deadline=deadline):
+            if not entries:
+                yield ": keepalive\n\n"
+                continue
+            update = market_update(db, entries, dma_code, sport)
+            if update:
+                yield _sse('games', update, update['seq'])
+    except Exception as e:
+        # The client reconnects and resumes from the last event it received
+        logger.error(f"Error streaming schedule changes: {e}")
+        handle_db_error(e)
+
+
+@app.route('/api/schedule/changes', methods=['GET'])
+def stream_schedule_changes():
+    """
+    Server-Sent Events stream of schedule changes for one market: ?zip= or ?dma=, optional
+    sport=. Changed games arrive already resolved for the market (same shape as
+    /api/schedule); the client merges them by game_id. Resumes after the Last-Event-ID
+    header (or ?since=); without either, only changes from now on are sent.
+    """
+    db = get_mongo_client()
+    if db is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    zip_code = request.args.get('zip')
+    dma_code = (request.args.get('dma') or '').strip().upper() or None
+    sport = (request.args.get('sport') or '').strip().upper() or None
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        since = int(since) if since else None
+    except ValueError:
+        return jsonify({"error": "'since' must be an integer sequence number"}), 400
+
+    try:
+        if zip_code:
+            zip_code = normalize_zip(zip_code)
+            location = resolve_locations(db, [zip_code]).get(zip_code)
+            if location is None:
+                return jsonify({"error": "Unknown ZIP code"}), 404
+            dma_code = location.get('dma_code')
+    except InvalidLookup as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error resolving change stream location: {e}")
+        handle_db_error(e)
+        return jsonify({"error": "Internal server error during schedule lookup"}), 500
+
+    return Response(
+        stream_with_context(change_events(db, dma_code, sport, since)),
+        mimetype='text/event-stream',
+        # No proxy buffering or caching: events must reach the browser as they are written
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+if __name__ == '__main__':
+    # For local development testing only
+    app.run(host='0.0.0.0', port=5001, debug=True)
@@ -0,0 +1,260 @@
+# src/api/response_cache.py
+# Response cache for the Flask APIs.
+# Every cached GET/POST response is stored under a key that includes the current cache
+# generation (cache_generation.py), which scrapes and rule writes bump. Bumping it makes
+# every older entry unreachable, so nothing has to be deleted or tracked per key.
+#
+# Layers:
+#   L1  in-process LRU with TTL (always on)
+#   L2  optional shared backend: RESPONSE_CACHE_BACKEND=disk (RESPONSE_CACHE_DIR) or
+#       redis (RESPONSE_CACHE_URL, any Redis-compatible server; needs the `redis` package)
+# L2 entries are plain JSON (body base64-encoded), never pickles: whoever can write to the
+# directory or the Redis server can at most serve a wrong response, not run code. The disk
+# directory defaults to a private (0700) one under the user's cache dir.
+# Responses carry a strong ETag (hash of the body); a matching If-None-Match gets a 304.
+# Flask is only imported by the decorator, so the serverless handlers (handlers.py) share the
+# cache without loading it.
+
+import base64
+import functools
+import hashlib
+import json
+import logging
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+
+from ..scraper.scraper_config import get_mongo_client
+from .cache_generation import current_generation
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv("RESPONSE_CACHE", "1") != "0"
+CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))                # seconds an entry lives
+CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))  # L1 size
+CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "60"))            # Cache-Control for public responses
+CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "").lower()          # '', 'disk' or 'redis'
+CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser('~'), '.cache'), 'watchwherelive', 'responses'))
+CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+
+
+# --- Backends: get(key) -> entry | None, set(key, entry, ttl) ---
+
+def _dump_entry(entry: dict, **extra) -> bytes:
+    fields = {'status': entry['status'], 'mimetype': entry['mimetype'], 'etag': entry['etag'],
+              'body': base64.b64encode(entry['body']).decode('ascii'), **extra}
+    return json.dumps(fields, separators=(',', ':')).encode('utf-8')
+
+
+def _load_entry(raw: bytes) -> tuple:
+    """(entry, fields) from _dump_entry's output; raises ValueError/KeyError/TypeError on anything else."""
+    fields = json.loads(raw)
+    entry = {'body': base64.b64decode(fields['body'], validate=True), 'status': int(fields['status']),
+             'mimetype': str(fields['mimetype']), 'etag': str(fields['etag'])}
+    return entry, fields
+
+
+class MemoryBackend:
+    """Thread-safe LRU with a per-entry expiry."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskBackend:
+    """One file per key in a directory shared by the workers; writes are atomic renames."""
+
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.stat(directory)
+        if info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"{directory} is writable by other users")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def get(self, key: str):
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry, fields = _load_entry(f.read())
+            expires_at = float(fields['expires_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return entry if expires_at >= time.time() else None
+
+    def set(self, key: str, entry, ttl: float):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_dump_entry(entry, expires_at=time.time() + ttl))
+        os.replace(tmp_path, path)
+
+
+class RedisBackend:
+    def __init__(self, url: str = CACHE_URL):
+        import redis  # optional dependency, only needed for this backend
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str):
+        raw = self._client.get(f"wwl:resp:{key}")
+        if not raw:
+            return None
+        try:
+            return _load_entry(raw)[0]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, key: str, entry, ttl: float):
+        self._client.setex(f"wwl:resp:{key}", max(1, int(ttl)), _dump_entry(entry))
+
+
+def _create_shared_backend():
+    try:
+        if CACHE_BACKEND == 'disk':
+            return DiskBackend()
+        if CACHE_BACKEND == 'redis':
+            return RedisBackend()
+    except Exception as e:
+        logger.warning(f"Response cache backend '{CACHE_BACKEND}' unavailable, using memory only: {e}")
+    return None
+
+
+_memory = MemoryBackend()
+_shared = _create_shared_backend() if CACHE_ENABLED else None
+
+
+def lookup_entry(key: str):
+    entry = _memory.get(key)
+    if entry is None and _shared is not None:
+        try:
+            entry = _shared.get(key)
+        except Exception as e:
+            logger.warning(f"Shared response cache read failed: {e}")
+        if entry is not None:
+            _memory.set(key, entry, CACHE_TTL)
+    return entry
+
+
+def store_entry(key: str, body: bytes, mimetype: str) -> dict:
+    """Caches a 200 response body and returns its entry."""
+    entry = {'body': body, 'status': 200, 'mimetype': mimetype, 'etag': strong_etag(body)}
+    _memory.set(key, entry, CACHE_TTL)
+    if _shared is not None:
+        try:
+            _shared.set(key, entry, CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Shared response cache write failed: {e}")
+    return entry
+
+
+# --- Request keys and validators (framework-neutral) ---
+
+def strong_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def cache_key(method: str, path: str, args, body: bytes = b'') -> str | None:
+    """
+    Key for a request under the current cache generation; `args` are (name, value) pairs.
+    None when caching is off or the generation cannot be read: the caller runs uncached.
+    """
+    if not CACHE_ENABLED:
+        return None
+    db = get_mongo_client()
+    if db is None:
+        return None
+    try:
+        generation = current_generation(db)
+    except Exception as e:
+        logger.warning(f"Could not read the response cache generation: {e}")
+        return None
+
+    query = '&'.join(sorted(f"{k}={v}" for k, v in args))
+    key = f"{generation}|{method}|{path}|{query}"
+    if method == 'POST':
+        key += '|' + hashlib.sha256(body).hexdigest()
+    return key
+
+
+def cache_control(public: bool) -> str:
+    # Public lookups may be cached by the CDN briefly; admin data is always revalidated.
+    return f"public, max-age={CACHE_MAX_AGE}" if public else "private, no-cache"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match check; a weak match is enough (RFC 9110)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
+
+
+# --- Flask integration ---
+
+def _from_entry(entry, public: bool):
+    from flask import make_response, request
+
+    if etag_matches(request.headers.get('If-None-Match'), entry['etag']):
+        response = make_response('', 304)
+    else:
+        response = make_response(entry['body'], entry['status'])
+        response.mimetype = entry['mimetype']
+    response.headers['ETag'] = entry['etag']
+    response.headers['Cache-Control'] = cache_control(public)
+    return response
+
+
+def cached_response(public: bool = True):
+    """
+    Decorator for read-only views. Only 200 responses are stored; anything else (400/404/500)
+    passes through untouched. Falls back to calling the view when MongoDB is unreachable.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import make_response, request
+
+            body = request.get_data() if request.method == 'POST' else b''
+            key = cache_key(request.method, request.path, request.args.items(multi=True), body)
+            if key is None:
+                return view(*args, **kwargs)
+
+            entry = lookup_entry(key)
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                entry = store_entry(key, response.get_data(), response.mimetype)
+            return _from_entry(entry, public)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,216 @@
+# src/api/schedule_api.py
+# The read API's request handling, independent of the web framework.
+# Each *_response function takes the request parameters (anything with .get(), e.g. Flask's
+# request.args or a plain dict) and returns (payload, status). lookup_game.py serves them
+# through Flask; handlers.py serves the same functions as serverless entry points without
+# importing Flask.
+
+import logging
+
+from ..scraper.scraper_config import reset_mongo_client
+from .change_feed import latest_seq, market_delta
+from .schedule_resolver import (
+    MAX_BATCH_SIZE, InvalidLookup, fetch_games, fetch_games_between, game_days, load_rules,
+    normalize_zip, parse_date_range, parse_utc_range, resolve_locations, serialize_game,
+)
+from .schedule_views import VIEWS_ENABLED, read_views
+
+logger = logging.getLogger(__name__)
+
+INTERNAL_ERROR = {"error": "Internal server error during schedule lookup"}
+
+
+def lookup_schedules(db, zip_codes=(), dma_codes=(), start=None, end=None, game_ids=None) -> dict:
+    """
+    Resolves the schedule for several ZIPs and/or DMAs at once.
+    Returns {'start', 'end', 'results': {key: {...}}, 'errors': {key: message}}.
+    """
+    start_date, end_date = parse_date_range(start, end)
+    zip_codes = [normalize_zip(z) for z in zip_codes]
+    dma_codes = [str(d).strip().upper() for d in dma_codes if str(d).strip()]
+
+    locations = resolve_locations(db, zip_codes) if zip_codes else {}
+    markets = {z: locations[z].get('dma_code') for z in zip_codes if z in locations}
+    markets.update({d: d for d in dma_codes})
+
+    results, errors = {}, {}
+    for zip_code in zip_codes:
+        if zip_code not in locations:
+            errors[zip_code] = "Unknown ZIP code"
+
+    # Fast path: one keyed fetch from the materialized per-DMA views
+    if VIEWS_ENABLED and not game_ids and markets:
+        views = read_views(db, markets, game_days(start_date, end_date))
+        if views is not None:
+            for key, dma_code in markets.items():
+                results[key] = {'dma_code': dma_code, 'games': views[key]}
+            return {'start': start_date.isoformat(), 'end': end_date.isoformat(), 'results': results, 'errors': errors}
+
+    games = fetch_games(db, start_date, end_date, game_ids)
+    rules = load_rules(db, set(markets.values())) if markets else {}
+
+    for key, dma_code in markets.items():
+        results[key] = {
+            'dma_code': dma_code,
+            'games': [serialize_game(game, dma_code, rules) for game in games],
+        }
+
+    return {'start': start_date.isoformat(), 'end': end_date.isoformat(), 'results': results, 'errors': errors}
+
+
+def market_schedule(db, zip_code=None, dma_code=None, start=None, end=None) -> dict | None:
+    """
+    The /api/schedule body for one market (national broadcasts only without a location), or
+    None for an unknown ZIP. 'version' is the change-log seq read before the games, so a
+    later /api/schedule/delta?since=<version> can only repeat changes, never miss one.
+    """
+    version = latest_seq(db)
+    if zip_code or dma_code:
+        lookup = lookup_schedules(
+            db, zip_codes=[zip_code] if zip_code else [], dma_codes=[dma_code] if dma_code else [],
+            start=start, end=end
+        )
+        key = normalize_zip(zip_code) if zip_code else dma_code.strip().upper()
+        if key in lookup['errors']:
+            return None
+        result = lookup['results'][key]
+    else:
+        start_date, end_date = parse_date_range(start, end)
+        games = fetch_games(db, start_date, end_date)
+        lookup = {'start': start_date.isoformat(), 'end': end_date.isoformat()}
+        result = {'dma_code': None, 'games': [serialize_game(g, None, {}) for g in games]}
+
+    return {'zip': zip_code, 'start': lookup['start'], 'end': lookup['end'], **result, 'version': version}
+
+
+def handle_db_error(e: Exception):
+    from pymongo.errors import ConnectionFailure  # already loaded by whatever raised `e`
+
+    if isinstance(e, ConnectionFailure):
+        logger.warning("MongoDB connection failure. Resetting the shared client.")
+        reset_mongo_client()
+
+
+def _market_dma(db, zip_code: str) -> tuple:
+    """(normalized ZIP, its DMA code, whether the ZIP is known)."""
+    zip_code = normalize_zip(zip_code)
+    location = resolve_locations(db, [zip_code]).get(zip_code)
+    return zip_code, (location.get('dma_code') if location else None), location is not None
+
+
+# --- Requests ---
+
+def schedule_response(db, args) -> tuple:
+    """
+    Schedule for one market: ?zip=90210 or ?dma=LA-DMA, plus optional start/end (YYYY-MM-DD).
+    Without a location, national broadcasts are still returned (local_channel is null).
+    """
+    try:
+        payload = market_schedule(db, args.get('zip'), args.get('dma'), args.get('start'), args.get('end'))
+        if payload is None:
+            return {"error": "Unknown ZIP code"}, 404
+        return payload, 200
+
+    except InvalidLookup as e:
+        return {"error": str(e)}, 400
+    except Exception as e:
+        logger.error(f"Error resolving schedule lookup: {e}")
+        handle_db_error(e)
+        return INTERNAL_ERROR, 500
+
+
+def delta_response(db, args) -> tuple:
+    """
+    What changed since an earlier /api/schedule response: the same parameters plus
+    since=<its version>. Returns 'changed' (games added or updated, resolved for the market),
+    'removed' (game ids to drop) and the new 'version'. When the change log no longer reaches
+    back to `since`, the full schedule comes back instead, with 'full': true.
+    """
+    zip_code = args.get('zip')
+    dma_code = (args.get('dma') or '').strip().upper() or None
+    try:
+        since = int(args.get('since') or '')
+    except ValueError:
+        return {"error": "'since' must be the version of an earlier schedule response"}, 400
+
+    try:
+        start_date, end_date = parse_date_range(args.get('start'), args.get('end'))
+        if zip_code:
+            zip_code, dma_code, known = _market_dma(db, zip_code)
+            if not known:
+                return {"error": "Unknown ZIP code"}, 404
+
+        delta = market_delta(db, dma_code, since, start_date, end_date)
+        if delta is None:
+            payload = market_schedule(db, zip_code, None if zip_code else dma_code,
+                                      start_date.isoformat(), end_date.isoformat())
+            return {**payload, 'zip': zip_code, 'full': True, 'since': since}, 200
+        return {
+            'zip': zip_code, 'dma_code': dma_code, 'start': start_date.isoformat(), 'end': end_date.isoformat(),
+            'full': False, 'since': since, **delta,
+        }, 200
+
+    except InvalidLookup as e:
+        return {"error": str(e)}, 400
+    except Exception as e:
+        logger.error(f"Error resolving schedule delta: {e}")
+        handle_db_error(e)
+        return INTERNAL_ERROR, 500
+
+
+def range_response(db, args) -> tuple:
+    """
+    Games starting in a UTC window, e.g. tonight's games:
+    ?from=2025-12-06T22:00:00Z&to=2025-12-07T06:00:00Z (default: the next 24 hours),
+    optional sport=NBA and zip= or dma= for the local channel. One indexed range query on start_utc.
+    """
+    zip_code = args.get('zip')
+    dma_code = (args.get('dma') or '').strip().upper() or None
+    sport = (args.get('sport') or '').strip().upper() or None
+    try:
+        start_at, end_at = parse_utc_range(args.get('from'), args.get('to'))
+        if zip_code:
+            zip_code, dma_code, known = _market_dma(db, zip_code)
+            if not known:
+                return {"error": "Unknown ZIP code"}, 404
+
+        games = fetch_games_between(db, start_at, end_at, sport)
+        rules = load_rules(db, [dma_code]) if dma_code else {}
+        return {
+            'zip': zip_code, 'dma_code': dma_code, 'sport': sport,
+            'from': start_at.isoformat() + 'Z', 'to': end_at.isoformat() + 'Z',
+            'games': [serialize_game(game, dma_code, rules) for game in games],
+        }, 200
+
+    except InvalidLookup as e:
+        return {"error": str(e)}, 400
+    except Exception as e:
+        logger.error(f"Error resolving schedule range: {e}")
+        handle_db_error(e)
+        return INTERNAL_ERROR, 500
+
+
+def batch_response(db, data) -> tuple:
+    """
+    Batch lookup. Body: {"zips": [...], "dmas": [...], "start": "...", "end": "...", "game_ids": [...]}.
+    All markets are resolved with the same three queries.
+    """
+    data = data if isinstance(data, dict) else {}
+    zip_codes = data.get('zips') or []
+    dma_codes = data.get('dmas') or []
+    game_ids = data.get('game_ids') or None
+    if not isinstance(zip_codes, list) or not isinstance(dma_codes, list):
+        return {"error": "'zips' and 'dmas' must be lists"}, 400
+    if not zip_codes and not dma_codes:
+        return {"error": "Provide at least one ZIP code or DMA"}, 400
+    if len(zip_codes) + len(dma_codes) > MAX_BATCH_SIZE:
+        return {"error": f"Batch is limited to {MAX_BATCH_SIZE} locations"}, 400
+
+    try:
+        return lookup_schedules(db, zip_codes, dma_codes, data.get('start'), data.get('end'), game_ids), 200
+    except InvalidLookup as e:
+        return {"error": str(e)}, 400
+    except Exception as e:
+        logger.error(f"Error resolving batch schedule lookup: {e}")
+        handle_db_error(e)
+        return INTERNAL_ERROR, 500
@@ -0,0 +1,212 @@
+# src/api/schedule_resolver.py
+# Data access and in-memory resolution shared by the Layer 2 lookup API and the
+# materialized schedule views. No Flask here, so it is cheap to import from anywhere.
+
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from ..scraper.schedule_dates import eastern_day_bounds, to_naive_utc
+from .zip_index import get_zip_index
+
+# Collections (see db_models.py)
+LOCATION_COLLECTION = 'user_location_map'
+RULES_COLLECTION = 'dma_rules'
+SCHEDULE_COLLECTIONS = ('schedules', 'epl_schedules')
+
+# Schedule dates on the source sites are US Eastern.
+EASTERN = ZoneInfo('America/New_York')
+MAX_RANGE_DAYS = 31
+MAX_BATCH_SIZE = 200
+
+GAME_FIELDS = {
+    '_id': 1, 'game_id': 1, 'sport': 1, 'date_str': 1, 'game_date': 1, 'start_utc': 1, 'time_tbd': 1,
+    'time_status': 1, 'time_str_et': 1,
+    'away_team': 1, 'home_team': 1, 'national_broadcasts': 1,
+    'regional_broadcast_placeholder': 1, 'regional_map': 1, 'is_validated': 1,
+}
+
+
+class InvalidLookup(ValueError):
+    """Raised for invalid lookup parameters; reported to the client as a 400."""
+
+
+# --- Parameter helpers ---
+
+def parse_date_range(start: str | None, end: str | None):
+    """Parses YYYY-MM-DD bounds (inclusive). Defaults to today in US Eastern time."""
+    try:
+        start_date = datetime.strptime(start, '%Y-%m-%d').date() if start else datetime.now(EASTERN).date()
+        end_date = datetime.strptime(end, '%Y-%m-%d').date() if end else start_date
+    except ValueError:
+        raise InvalidLookup("Dates must use the YYYY-MM-DD format")
+
+    if end_date < start_date:
+        raise InvalidLookup("'end' must not be before 'start'")
+    if (end_date - start_date).days >= MAX_RANGE_DAYS:
+        raise InvalidLookup(f"Date range is limited to {MAX_RANGE_DAYS} days")
+    return start_date, end_date
+
+
+def parse_utc_range(start: str | None, end: str | None):
+    """
+    Parses ISO-8601 datetime bounds, [start, end). Offsets are honoured ('Z', '-05:00');
+    naive values are taken as UTC. Defaults to the next 24 hours from now.
+    Returns naive UTC datetimes, as stored in start_utc.
+    """
+    try:
+        start_at = datetime.fromisoformat(start.replace('Z', '+00:00')) if start else datetime.now(timezone.utc)
+        end_at = datetime.fromisoformat(end.replace('Z', '+00:00')) if end else start_at + timedelta(days=1)
+    except ValueError:
+        raise InvalidLookup("'from' and 'to' must be ISO-8601 datetimes, e.g. 2025-12-06T23:00:00Z")
+
+    start_at, end_at = to_naive_utc(start_at), to_naive_utc(end_at)
+    if end_at <= start_at:
+        raise InvalidLookup("'to' must be after 'from'")
+    if end_at - start_at > timedelta(days=MAX_RANGE_DAYS):
+        raise InvalidLookup(f"Date range is limited to {MAX_RANGE_DAYS} days")
+    return start_at, end_at
+
+
+def game_days(start_date, end_date) -> list:
+    """Every Eastern calendar day in the range as YYYY-MM-DD (the keys the materialized views use)."""
+    days = []
+    day = start_date
+    while day <= end_date:
+        days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+
+def eastern_day(start_utc: datetime) -> str:
+    """The Eastern calendar day (YYYY-MM-DD) a naive UTC start time falls on, as fetch_games buckets it."""
+    return start_utc.replace(tzinfo=timezone.utc).astimezone(EASTERN).date().isoformat()
+
+
+def normalize_zip(zip_code) -> str:
+    zip_code = str(zip_code or '').strip()
+    if len(zip_code) != 5 or not zip_code.isdigit():
+        raise InvalidLookup(f"Invalid ZIP code: {zip_code!r}")
+    return zip_code
+
+
+# --- Data access (a fixed number of queries, independent of the number of games) ---
+
+def resolve_locations(db, zip_codes) -> dict:
+    """
+    {zip: location document} for every known ZIP. Uses the memory-mapped ZIP index when one
+    has been built (no database round trip), otherwise one query on user_location_map.
+    """
+    index = get_zip_index()
+    if index is not None:
+        return {z: location for z in zip_codes if (location := index.location(z))}
+
+    # Some imports stored ZIPs as integers (02134 as 2134): match both forms, key by the padded string
+    zip_codes = set(zip_codes)
+    ids = list(zip_codes) + [int(zip_code) for zip_code in zip_codes if zip_code.isdigit()]
+    locations = {}
+    for doc in db[LOCATION_COLLECTION].find({'_id': {'$in': ids}}):
+        zip_code = str(doc['_id']).zfill(5)
+        if zip_code in zip_codes:
+            locations[zip_code] = {**doc, '_id': zip_code}
+    return locations
+
+
+def _aggregate_games(db, match: dict, game_ids=None, sort=None) -> list:
+    """One aggregated query across the NBA and EPL schedule collections."""
+    if game_ids:
+        match = {'$and': [match, {'$or': [{'_id': {'$in': game_ids}}, {'game_id': {'$in': game_ids}}]}]}
+
+    first, *others = SCHEDULE_COLLECTIONS
+    pipeline = [{'$match': match}]
+    for collection in others:
+        pipeline.append({'$unionWith': {'coll': collection, 'pipeline': [{'$match': match}]}})
+    if sort:
+        pipeline.append({'$sort': sort})
+    pipeline.append({'$project': GAME_FIELDS})
+    return list(db[first].aggregate(pipeline))
+
+
+def fetch_games(db, start_date, end_date, game_ids=None) -> list:
+    """Games on the Eastern calendar days start_date..end_date, via the start_utc index."""
+    start_at, end_at = eastern_day_bounds(start_date, end_date)
+    return fetch_games_between(db, start_at, end_at, game_ids=game_ids)
+
+
+def fetch_games_between(db, start_at, end_at, sport: str | None = None, game_ids=None) -> list:
+    """Games starting in [start_at, end_at) (naive UTC), in start order. TBD times sort at midnight ET."""
+    match = {'start_utc': {'$gte': start_at, '$lt': end_at}}
+    if sport:
+        match['sport'] = sport
+    return _aggregate_games(db, match, game_ids, sort={'start_utc': 1, '_id': 1})
+
+
+def fetch_games_for_days(db, days) -> list:
+    """
+    Games on an explicit set of Eastern calendar days (YYYY-MM-DD), in start order: the same
+    start_utc ranges and sort as fetch_games, so the materialized views match the live path.
+    """
+    ranges = []
+    for day in sorted(set(days)):
+        start_at, end_at = eastern_day_bounds(date.fromisoformat(day), date.fromisoformat(day))
+        ranges.append({'start_utc': {'$gte': start_at, '$lt': end_at}})
+    if not ranges:
+        return []
+    return _aggregate_games(db, ranges[0] if len(ranges) == 1 else {'$or': ranges}, sort={'start_utc': 1, '_id': 1})
+
+
+def fetch_games_by_ids(db, game_ids) -> list:
+    """Games by game_id (EPL) or _id (NBA), from both collections in one query."""
+    return _aggregate_games(db, {}, list(game_ids)) if game_ids else []
+
+
+def load_rules(db, dma_codes) -> dict:
+    """One query: {(dma_code, sport, team_name): local_channel} for the requested markets."""
+    cursor = db[RULES_COLLECTION].find(
+        {'dma_code': {'$in': list(dma_codes)}},
+        {'_id': 0, 'dma_code': 1, 'sport': 1, 'team_name': 1, 'local_channel': 1}
+    )
+    return {(r['dma_code'], r['sport'], r['team_name']): r['local_channel'] for r in cursor}
+
+
+# --- Resolution (in memory) ---
+
+def resolve_local_channel(game: dict, dma_code: str | None, rules: dict):
+    """
+    Returns (local_channel, source) for one game in one market:
+    admin-validated per-game map first, then the home team's DMA rule, then the away team's.
+    """
+    if not dma_code:
+        return None, None
+
+    regional_map = game.get('regional_map') or {}
+    if regional_map.get(dma_code):
+        return regional_map[dma_code], 'game_map'
+
+    sport = (game.get('sport') or '').upper()
+    for team in (game.get('home_team'), game.get('away_team')):
+        channel = rules.get((dma_code, sport, team))
+        if channel:
+            return channel, 'dma_rule'
+    return None, None
+
+
+def _iso_utc(moment) -> str | None:
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ') if isinstance(moment, datetime) else None
+
+
+def serialize_game(game: dict, dma_code: str | None, rules: dict) -> dict:
+    local_channel, local_source = resolve_local_channel(game, dma_code, rules)
+    return {
+        'game_id': game.get('game_id') or str(game['_id']),
+        'sport': game.get('sport'),
+        'date_str': game.get('date_str'),
+        'game_date': game.get('game_date'),
+        'start_utc': _iso_utc(game.get('start_utc')),
+        'time_tbd': game.get('time_tbd'),
+        'time': game.get('time_status') or game.get('time_str_et'),
+        'away_team': game.get('away_team'),
+        'home_team': game.get('home_team'),
+        'national_broadcasts': game.get('national_broadcasts') or [],
+        'local_channel': local_channel,
+        'local_source': local_source,
+    }
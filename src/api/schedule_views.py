@@ -0,0 +1,171 @@
+# src/api/schedule_views.py
+# Materialized per-DMA schedule views.
+# One document per (DMA, Eastern calendar day) holds the fully resolved games for that market,
+# in start order, so a schedule read is a single keyed fetch instead of resolving dma_rules for
+# every game and every user. Days are bucketed by start_utc exactly as the live path
+# (fetch_games) does, so both return the same list.
+#
+# Views are maintained incrementally:
+# - a DMA rule upsert (or bulk import) rebuilds only the affected DMAs' views, on the dates
+#   the rules' teams play;
+# - a scrape rebuilds only the days whose games actually changed (including a game's previous
+#   day when it moved).
+# Markets with no local channel on a date have no view of their own and read the
+# national view (dma_code '*'), which also records dates that have no games.
+#
+# Full rebuild: python -m src.api.schedule_views
+
+import logging
+import os
+from datetime import datetime, timezone
+from pymongo import DeleteOne, ReplaceOne
+
+from .schedule_resolver import (
+    RULES_COLLECTION, SCHEDULE_COLLECTIONS, eastern_day, fetch_games_for_days, load_rules, serialize_game,
+)
+
+logger = logging.getLogger(__name__)
+
+VIEWS_COLLECTION = 'schedule_views'
+NATIONAL = '*'
+VIEWS_ENABLED = os.getenv("SCHEDULE_VIEWS", "1") != "0"
+BULK_BATCH_SIZE = 500
+
+
+def view_id(dma_code: str, day: str) -> str:
+    return f"{dma_code}|{day}"
+
+
+def _markets_for(db, games) -> set:
+    """Every DMA that has a rule, plus any DMA an admin mapped directly on one of `games`."""
+    markets = set(db[RULES_COLLECTION].distinct('dma_code'))
+    for game in games:
+        markets.update((game.get('regional_map') or {}).keys())
+    return markets
+
+
+def _view(dma_code: str, day: str, games: list, now: datetime) -> dict:
+    return {'_id': view_id(dma_code, day), 'dma_code': dma_code, 'game_date': day,
+            'games': games, 'updated_at': now}
+
+
+def _game_days(games) -> set:
+    return {eastern_day(game['start_utc']) for game in games if game and game.get('start_utc')}
+
+
+def rebuild_views(db, days, markets=None) -> dict:
+    """
+    Recomputes the views for the given Eastern days (YYYY-MM-DD).
+    With `markets=None` every market and the national view are rebuilt; otherwise only the
+    listed DMAs (the national view does not depend on DMA rules).
+    """
+    days = set(days)
+    if not days:
+        return {'written': 0, 'deleted': 0}
+
+    games = fetch_games_for_days(db, days)  # in start order, so each day's list is too
+    games_by_day = {}
+    for game in games:
+        games_by_day.setdefault(eastern_day(game['start_utc']), []).append(game)
+
+    include_national = markets is None
+    markets = _markets_for(db, games) if markets is None else set(markets)
+    rules = load_rules(db, markets) if markets else {}
+    now = datetime.now(timezone.utc)
+
+    operations, written, deleted = [], 0, 0
+    for day in days:
+        day_games = games_by_day.get(day, [])
+        if include_national:
+            national = [serialize_game(game, None, {}) for game in day_games]
+            operations.append(ReplaceOne({'_id': view_id(NATIONAL, day)}, _view(NATIONAL, day, national, now), upsert=True))
+            written += 1
+
+        for dma_code in markets:
+            resolved = [serialize_game(game, dma_code, rules) for game in day_games]
+            if any(game['local_channel'] for game in resolved):
+                operations.append(ReplaceOne({'_id': view_id(dma_code, day)}, _view(dma_code, day, resolved, now), upsert=True))
+                written += 1
+            else:
+                # Nothing market-specific on this day: readers fall back to the national view.
+                operations.append(DeleteOne({'_id': view_id(dma_code, day)}))
+                deleted += 1
+
+    collection = db[VIEWS_COLLECTION]
+    for start in range(0, len(operations), BULK_BATCH_SIZE):
+        collection.bulk_write(operations[start:start + BULK_BATCH_SIZE], ordered=False)
+
+    logger.info(f"Rebuilt schedule views for {len(days)} days and {len(markets)} markets "
+                f"({written} written, {deleted} cleared).")
+    return {'written': written, 'deleted': deleted}
+
+
+def refresh_views_for_rule(db, dma_code: str, team_name: str, sport: str) -> dict:
+    """Called after a dma_rules upsert: rebuild that DMA's views on the days the team plays."""
+    return refresh_views_for_rules(db, [{'dma_code': dma_code, 'team_name': team_name, 'sport': sport}])
+
+
+def refresh_views_for_rules(db, rules) -> dict:
+    """Bulk form of refresh_views_for_rule: one rebuild for every DMA and team day touched."""
+    teams = {(rule['sport'], rule['team_name']) for rule in rules}
+    if not teams:
+        return {'written': 0, 'deleted': 0}
+    team_filter = {'$or': [{'sport': sport, '$or': [{'home_team': team}, {'away_team': team}]}
+                           for sport, team in teams]}
+    days = set()
+    for collection in SCHEDULE_COLLECTIONS:
+        days.update(_game_days(db[collection].find(team_filter, {'start_utc': 1})))
+    return rebuild_views(db, days, markets={rule['dma_code'] for rule in rules})
+
+
+def refresh_views_for_games(db, changed_games, previous_games=()) -> dict:
+    """
+    Called after a scrape: rebuild every market's views on the days whose games changed.
+    `previous_games` are the stored versions of those games, so a game that moved to another
+    day also leaves its old day's view.
+    """
+    return rebuild_views(db, _game_days(changed_games) | _game_days(previous_games))
+
+
+def read_views(db, markets: dict, days) -> dict | None:
+    """
+    One keyed fetch for {key: dma_code} markets over the days (YYYY-MM-DD, in order).
+    Returns {key: games} or None when a day has not been materialized (callers resolve live).
+    """
+    days = list(days)
+    dma_codes = {dma for dma in markets.values() if dma}
+    ids = [view_id(NATIONAL, day) for day in days]
+    ids.extend(view_id(dma, day) for dma in dma_codes for day in days)
+    docs = {doc['_id']: doc for doc in db[VIEWS_COLLECTION].find({'_id': {'$in': ids}})}
+
+    if any(view_id(NATIONAL, day) not in docs for day in days):
+        return None
+
+    results = {}
+    for key, dma_code in markets.items():
+        games = []
+        for day in days:
+            doc = docs.get(view_id(dma_code, day)) or docs[view_id(NATIONAL, day)]
+            games.extend(doc['games'])
+        results[key] = games
+    return results
+
+
+def main():
+    """Rebuilds every view from scratch (initial deploy or after a data repair)."""
+    logging.basicConfig(level=logging.INFO)
+    from ..scraper.scraper_config import get_mongo_client
+    db = get_mongo_client()
+    if db is None:
+        logger.error("Could not connect to MongoDB. Exiting.")
+        return 1
+
+    days = set()
+    for collection in SCHEDULE_COLLECTIONS:
+        days.update(_game_days(db[collection].find({'start_utc': {'$ne': None}}, {'start_utc': 1})))
+    rebuild_views(db, days)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
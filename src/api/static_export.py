@@ -0,0 +1,206 @@
+# src/api/static_export.py
+# Static export of resolved schedules for the CDN.
+# After each scrape the schedule is written under public/data as plain JSON files, so the
+# front end can render most page views from the CDN without invoking the API:
+#
+#   data/manifest.json                   weeks exported, DMAs with their own files, version, change seq
+#   data/zips/<first 3 digits>.json      {zip: dma_code} shard (a few KB each)
+#   data/schedule/national/<week>.json   national broadcasts only
+#   data/schedule/<DMA>/<week>.json      games resolved for a DMA, for weeks where it has a local channel
+#
+# <week> is the Monday (US Eastern) the 7-day window starts on. Every JSON file also gets
+# .gz and, when the optional `brotli` package is installed, .br siblings, for CDNs that serve
+# precompressed files. A file is only rewritten when its content hash changed; files for
+# weeks or markets that dropped out of the export are removed.
+#
+# Run by run_scrape after a scrape that changed games; manual run: python -m src.api.static_export
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import timedelta
+
+from .change_feed import latest_seq
+from .schedule_resolver import (
+    LOCATION_COLLECTION, RULES_COLLECTION, fetch_games, load_rules, serialize_game,
+)
+from ..scraper.schedule_dates import today_eastern
+
+logger = logging.getLogger(__name__)
+
+EXPORT_ENABLED = os.getenv("STATIC_EXPORT", "1") != "0"
+EXPORT_DIR = os.getenv(
+    "STATIC_EXPORT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'public', 'data'),
+)
+EXPORT_WEEKS = int(os.getenv("STATIC_EXPORT_WEEKS", "2"))  # current week plus the following ones
+NATIONAL = 'national'
+ENCODINGS = ('.gz', '.br')
+# DMA codes become directory names
+_SAFE_CODE = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def _brotli():
+    try:
+        import brotli  # optional dependency: .br files are skipped without it
+    except ImportError:
+        return None
+    return brotli
+
+
+def export_weeks(today=None, weeks: int = EXPORT_WEEKS) -> list:
+    """Monday of the current Eastern week and of the following `weeks - 1` weeks."""
+    today = today or today_eastern()
+    monday = today - timedelta(days=today.weekday())
+    return [monday + timedelta(weeks=i) for i in range(weeks)]
+
+
+def _encode(payload) -> bytes:
+    # Deterministic output, so unchanged content hashes the same on every run
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class StaticWriter:
+    """Writes JSON files plus compressed variants, skipping files whose content is unchanged."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.brotli = _brotli()
+        self.written = 0
+        self.unchanged = 0
+        self.paths = set()  # every .json path of this export, for pruning
+
+    def _is_current(self, path: str, digest: str) -> bool:
+        variants = [path + '.gz'] + ([path + '.br'] if self.brotli is not None else [])
+        if not all(os.path.exists(variant) for variant in variants):
+            return False
+        try:
+            with open(path, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest() == digest
+        except FileNotFoundError:
+            return False
+
+    def write(self, relative_path: str, payload) -> str:
+        """Returns the content hash of the file."""
+        data = _encode(payload)
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.root, relative_path)
+        self.paths.add(os.path.normpath(path))
+
+        if self._is_current(path, digest):
+            self.unchanged += 1
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_write(path, data)
+        _atomic_write(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        if self.brotli is not None:
+            _atomic_write(path + '.br', self.brotli.compress(data, quality=11))
+        self.written += 1
+        return digest
+
+    def prune(self, directory: str) -> int:
+        """Removes files under `directory` that this export did not write."""
+        removed = 0
+        for folder, _, files in os.walk(os.path.join(self.root, directory), topdown=False):
+            for name in files:
+                base, ext = os.path.splitext(name)
+                if ext not in ENCODINGS:
+                    base = name
+                if base.endswith('.json') and os.path.normpath(os.path.join(folder, base)) not in self.paths:
+                    os.remove(os.path.join(folder, name))
+                    removed += 1
+            if folder != self.root and not os.listdir(folder):
+                os.rmdir(folder)
+        return removed
+
+
+def _zip_shards(db) -> dict:
+    shards = {}
+    for doc in db[LOCATION_COLLECTION].find({}, {'_id': 1, 'dma_code': 1}):
+        zip_code = str(doc['_id']).strip().zfill(5)  # integer ZIPs lose their leading zero
+        if len(zip_code) == 5 and zip_code.isdigit() and doc.get('dma_code'):
+            shards.setdefault(zip_code[:3], {})[zip_code] = doc['dma_code'].upper()
+    return shards
+
+
+def export_static(db, root: str = EXPORT_DIR, today=None) -> dict:
+    """Writes the whole export under `root`. Returns counts of written/unchanged/removed files."""
+    weeks = export_weeks(today)
+    writer = StaticWriter(root)
+    # Read before the games, like /api/schedule's version, so clients can delta-sync from it
+    seq = latest_seq(db)
+
+    games = fetch_games(db, weeks[0], weeks[-1] + timedelta(days=6))
+    games_by_week = {week: [] for week in weeks}
+    for game in games:
+        for week in reversed(weeks):
+            if (game.get('game_date') or '') >= week.isoformat():
+                games_by_week[week].append(game)
+                break
+
+    markets = set(db[RULES_COLLECTION].distinct('dma_code'))
+    for game in games:
+        markets.update((game.get('regional_map') or {}).keys())
+    markets = {dma_code for dma_code in markets if _SAFE_CODE.match(dma_code or '')}
+    rules = load_rules(db, markets) if markets else {}
+
+    hashes, market_weeks = [], {}
+    for week, week_games in games_by_week.items():
+        window = {'week_start': week.isoformat(), 'week_end': (week + timedelta(days=6)).isoformat()}
+        national = [serialize_game(game, None, {}) for game in week_games]
+        hashes.append(writer.write(f"schedule/{NATIONAL}/{week.isoformat()}.json",
+                                   {**window, 'dma_code': None, 'games': national}))
+        for dma_code in sorted(markets):
+            resolved = [serialize_game(game, dma_code, rules) for game in week_games]
+            if any(game['local_channel'] for game in resolved):
+                hashes.append(writer.write(f"schedule/{dma_code}/{week.isoformat()}.json",
+                                           {**window, 'dma_code': dma_code, 'games': resolved}))
+                market_weeks.setdefault(dma_code, []).append(week.isoformat())
+
+    for prefix, zips in _zip_shards(db).items():
+        hashes.append(writer.write(f"zips/{prefix}.json", zips))
+
+    # The version only changes when some file did; seq whenever the change log moved on
+    version = hashlib.sha256(''.join(hashes).encode('ascii')).hexdigest()[:16]
+    writer.write('manifest.json', {
+        'version': version,
+        'seq': seq,
+        'weeks': [week.isoformat() for week in weeks],
+        'markets': market_weeks,
+    })
+    removed = writer.prune('schedule') + writer.prune('zips')
+
+    report = {'written': writer.written, 'unchanged': writer.unchanged, 'removed': removed, 'version': version}
+    logger.info(f"Static export to {root}: {report}")
+    return report
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Export resolved schedules as static JSON for the CDN.")
+    parser.add_argument('--out', default=EXPORT_DIR, help="Output directory (default: public/data)")
+    args = parser.parse_args(argv)
+
+    from ..scraper.scraper_config import get_mongo_client
+    db = get_mongo_client()
+    if db is None:
+        logger.error("Could not connect to MongoDB. Exiting.")
+        return 1
+    export_static(db, args.out)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
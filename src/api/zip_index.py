@@ -0,0 +1,263 @@
+# src/api/zip_index.py
+# Compact, memory-mapped ZIP -> DMA/RSN index.
+# A build step compiles the user_location_map collection (or a CSV export of it) into one
+# binary file that serverless workers mmap at startup, so resolving a ZIP is an O(1) array
+# read instead of a MongoDB round trip.
+#
+# Build:  python -m src.api.zip_index --mongo --out src/api/zip_dma.idx
+#         python -m src.api.zip_index --csv zips.csv --out src/api/zip_dma.idx
+#
+# File layout (little-endian):
+#   header   magic(8) format_version(u16) reserved(u16) record_count(u32) string_count(u32)
+#            built_at(u32) payload_crc32(u32)
+#   zips     100000 x u16: record index + 1 for every 5-digit ZIP (0 = unknown)
+#   records  record_count x (dma(u16) state(u16) rsn_start(u16) rsn_count(u16))
+#   rsns     sport(u16) channel(u16) pairs, referenced by records
+#   strings  string_count x u32 end offsets, then the UTF-8 blob (interned DMA codes, states, RSNs)
+
+import argparse
+import csv
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'WWLZIDX\x00'
+FORMAT_VERSION = 1
+ZIP_SLOTS = 100000
+
+DEFAULT_INDEX_PATH = os.getenv(
+    "ZIP_INDEX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'zip_dma.idx')
+)
+
+_HEADER = struct.Struct('<8sHHIIII')
+_U16 = struct.Struct('<H')
+_RECORD = struct.Struct('<HHHH')
+_RSN = struct.Struct('<HH')
+
+
+class ZipIndexError(Exception):
+    """Raised when an index file is missing, corrupt or built by an incompatible version."""
+
+
+# --- Build ---
+
+def build_index(locations, out_path: str) -> dict:
+    """
+    Compiles location documents ({'_id': zip, 'dma_code', 'state', 'rsn_affiliations'})
+    into an index file. Returns build stats.
+    """
+    strings, string_ids = [], {}
+
+    def intern(value) -> int:
+        value = str(value or '')
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    intern('')  # id 0 is the empty string
+    zips = [0] * ZIP_SLOTS
+    records, record_ids, rsn_pairs = [], {}, []
+    skipped = 0
+
+    for doc in locations:
+        zip_code = str(doc.get('_id') or doc.get('zip') or '').strip()
+        if len(zip_code) != 5 or not zip_code.isdigit():
+            skipped += 1
+            continue
+
+        affiliations = tuple(sorted((doc.get('rsn_affiliations') or {}).items()))
+        key = ((doc.get('dma_code') or '').upper(), doc.get('state') or '', affiliations)
+        if key not in record_ids:
+            rsn_start = len(rsn_pairs)
+            rsn_pairs.extend((intern(sport), intern(channel)) for sport, channel in affiliations)
+            records.append((intern(key[0]), intern(key[1]), rsn_start, len(affiliations)))
+            record_ids[key] = len(records)  # stored +1 so that 0 means "unknown ZIP"
+        zips[int(zip_code)] = record_ids[key]
+
+    if len(records) >= 0xFFFF or len(strings) >= 0xFFFF or len(rsn_pairs) >= 0xFFFF:
+        raise ZipIndexError("Too many distinct markets/strings for the 16-bit index format")
+
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets, end = [], 0
+    for value in encoded:
+        end += len(value)
+        offsets.append(end)
+
+    payload = b''.join([
+        struct.pack(f'<{ZIP_SLOTS}H', *zips),
+        b''.join(_RECORD.pack(*record) for record in records),
+        b''.join(_RSN.pack(*pair) for pair in rsn_pairs),
+        struct.pack(f'<{len(offsets)}I', *offsets),
+        b''.join(encoded),
+    ])
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(records), len(strings),
+                          int(time.time()), zlib.crc32(payload))
+
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, out_path)
+
+    stats = {'zips': sum(1 for z in zips if z), 'markets': len(records), 'strings': len(strings),
+             'skipped': skipped, 'bytes': len(header) + len(payload)}
+    logger.info(f"Built ZIP index {out_path}: {stats}")
+    return stats
+
+
+def locations_from_csv(path: str):
+    """
+    Reads a CSV with columns zip, dma_code, state and one `rsn_<SPORT>` column per sport,
+    e.g. rsn_NBA, rsn_MLB.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield {
+                '_id': (row.get('zip') or '').strip().zfill(5),
+                'dma_code': (row.get('dma_code') or '').strip(),
+                'state': (row.get('state') or '').strip(),
+                'rsn_affiliations': {
+                    column[4:].upper(): value.strip()
+                    for column, value in row.items()
+                    if column and column.lower().startswith('rsn_') and value and value.strip()
+                },
+            }
+
+
+def locations_from_mongo(db, collection: str = 'user_location_map'):
+    """Reads the location documents, zero-padding ZIPs stored as integers (2134 -> '02134') like the CSV path."""
+    for doc in db[collection].find({}, {'_id': 1, 'dma_code': 1, 'state': 1, 'rsn_affiliations': 1}):
+        yield {**doc, '_id': str(doc['_id']).strip().zfill(5)}
+
+
+# --- Load / lookup ---
+
+class ZipIndex:
+    """
+    Read-only view over an index file. The ZIP array stays in the mmap; the small interned
+    record table is decoded once, so lookups only do one array read and a list index.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            record_count, string_count, built_at, crc = self._check_header()
+        except ZipIndexError:
+            self._mm.close()
+            raise
+
+        self.built_at = built_at
+        self.version = f"{FORMAT_VERSION}.{built_at}.{crc:08x}"
+
+        self._zips_offset = _HEADER.size
+        records_offset = self._zips_offset + ZIP_SLOTS * _U16.size
+        rsns_offset = records_offset + record_count * _RECORD.size
+        raw_records = [_RECORD.unpack_from(self._mm, records_offset + i * _RECORD.size) for i in range(record_count)]
+        rsn_count = sum(r[3] for r in raw_records)
+        strings_offset = rsns_offset + rsn_count * _RSN.size
+        blob_offset = strings_offset + string_count * 4
+
+        ends = struct.unpack_from(f'<{string_count}I', self._mm, strings_offset)
+        strings, start = [], 0
+        for end in ends:
+            strings.append(self._mm[blob_offset + start:blob_offset + end].decode('utf-8'))
+            start = end
+
+        # Decoded once; index 0 is a placeholder for "unknown ZIP".
+        self._records = [None]
+        for dma, state, rsn_start, count in raw_records:
+            affiliations = {}
+            for i in range(rsn_start, rsn_start + count):
+                sport, channel = _RSN.unpack_from(self._mm, rsns_offset + i * _RSN.size)
+                affiliations[strings[sport]] = strings[channel]
+            self._records.append((strings[dma], strings[state], affiliations))
+
+    def _check_header(self) -> tuple:
+        if len(self._mm) < _HEADER.size:
+            raise ZipIndexError(f"{self.path} is too small to be a ZIP index")
+        magic, version, _, record_count, string_count, built_at, crc = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ZipIndexError(f"{self.path} is not a ZIP index")
+        if version != FORMAT_VERSION:
+            raise ZipIndexError(f"{self.path} has format version {version}, expected {FORMAT_VERSION}")
+        if zlib.crc32(memoryview(self._mm)[_HEADER.size:]) != crc:
+            raise ZipIndexError(f"{self.path} failed its checksum")
+        return record_count, string_count, built_at, crc
+
+    def _record(self, zip_code):
+        try:
+            slot = int(zip_code)
+        except (TypeError, ValueError):
+            return None
+        if not 0 <= slot < ZIP_SLOTS:
+            return None
+        return self._records[_U16.unpack_from(self._mm, self._zips_offset + slot * 2)[0]]
+
+    def dma_for_zip(self, zip_code) -> str | None:
+        record = self._record(zip_code)
+        return record[0] if record else None
+
+    def location(self, zip_code) -> dict | None:
+        """Same shape as a user_location_map document (LOCATION_SCHEMA)."""
+        record = self._record(zip_code)
+        if not record:
+            return None
+        dma_code, state, affiliations = record
+        return {'_id': str(zip_code).zfill(5), 'dma_code': dma_code, 'state': state,
+                'rsn_affiliations': dict(affiliations)}
+
+    def close(self):
+        self._mm.close()
+
+
+_index = None
+_index_checked = False
+
+
+def get_zip_index(path: str = DEFAULT_INDEX_PATH) -> ZipIndex | None:
+    """Loads the index once per process. Returns None (use MongoDB) if there is no usable file."""
+    global _index, _index_checked
+    if not _index_checked:
+        _index_checked = True
+        if os.path.exists(path):
+            try:
+                _index = ZipIndex(path)
+                logger.info(f"Loaded ZIP index {path} (version {_index.version})")
+            except (OSError, ZipIndexError) as e:
+                logger.warning(f"Ignoring ZIP index {path}: {e}")
+    return _index
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Build the memory-mapped ZIP -> DMA index.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--csv', help="CSV with zip, dma_code, state and rsn_<SPORT> columns")
+    source.add_argument('--mongo', action='store_true', help="Read the user_location_map collection")
+    parser.add_argument('--out', default=DEFAULT_INDEX_PATH, help="Output path for the index file")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        locations = locations_from_csv(args.csv)
+    else:
+        from ..scraper.scraper_config import get_mongo_client
+        db = get_mongo_client()
+        if db is None:
+            logger.error("Could not connect to MongoDB. Exiting.")
+            return 1
+        locations = locations_from_mongo(db)
+
+    build_index(locations, args.out)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
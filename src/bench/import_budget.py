@@ -0,0 +1,109 @@
+# src/bench/import_budget.py
+# Import-time budget for the serverless entry points, measured with `python -X importtime`.
+# Each module is imported in a fresh interpreter (as on a cold start, with AWS_LAMBDA_FUNCTION_NAME
+# set so scraper_config skips .env loading); the best of --runs is compared to its budget, and
+# modules that must stay lazy (Flask on the read handlers, Playwright/bs4 on the scrapers) must
+# not be loaded at all. Exits 1 when any module is over budget or loads a forbidden module.
+#
+# Usage: python -m src.bench.import_budget [--runs 3] [--scale 1.5] [--top 8] [module ...]
+# The same check runs as a test (tests/test_import_budget.py), so the suite fails on a regression.
+
+import argparse
+import logging
+import os
+import re
+import subprocess
+import sys
+
+logger = logging.getLogger(__name__)
+
+# module -> (budget in ms, top-level packages it must not import)
+BUDGETS = {
+    'src.api.handlers': (150, ('flask', 'werkzeug', 'dotenv', 'playwright', 'bs4', 'requests')),
+    'src.scraper.nba_scraper': (200, ('flask', 'playwright', 'bs4', 'requests')),
+    'src.scraper.epl_scraper': (200, ('flask', 'playwright', 'bs4', 'requests')),
+    'src.scraper.run_scrape': (250, ('flask', 'playwright', 'bs4', 'requests')),
+}
+# Slower machines (CI runners) can scale every budget, e.g. IMPORT_BUDGET_SCALE=2
+BUDGET_SCALE = float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+
+# "import time: self [us] | cumulative | imported package", nesting shown by indentation
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def measure(module: str) -> dict:
+    """One cold import: {'ms': cumulative time, 'modules': every module loaded, 'children': [(ms, name)]}."""
+    env = {**os.environ, 'AWS_LAMBDA_FUNCTION_NAME': os.getenv('AWS_LAMBDA_FUNCTION_NAME', 'import-budget'),
+           'PYTHONDONTWRITEBYTECODE': '1'}
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            cwd=_ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            entries.append((int(match.group(2)), len(match.group(3)), match.group(4)))
+    total = next(us for us, _, name in entries if name == module)
+    # Lines are printed when an import finishes, so the module's own imports come just before it
+    end = next(i for i, (_, _, name) in enumerate(entries) if name == module)
+    depth = entries[end][1]
+    start = end
+    while start > 0 and entries[start - 1][1] > depth:
+        start -= 1
+    children = [(us / 1000, name) for us, child_depth, name in entries[start:end] if child_depth == depth + 2]
+    return {
+        'ms': total / 1000,
+        'modules': {name for _, _, name in entries},
+        'children': sorted(children, reverse=True),
+    }
+
+
+def check(module: str, budget_ms: float, forbidden, runs: int = 3) -> dict:
+    """Best of `runs` cold imports against the budget."""
+    samples = [measure(module) for _ in range(runs)]
+    best = min(samples, key=lambda sample: sample['ms'])
+    loaded = sorted({name.split('.')[0] for name in best['modules']} & set(forbidden))
+    return {
+        'module': module,
+        'ms': round(best['ms'], 1),
+        'budget_ms': budget_ms,
+        'forbidden_loaded': loaded,
+        'children': best['children'],
+        'ok': best['ms'] <= budget_ms and not loaded,
+    }
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Check cold-import time of the serverless entry points.")
+    parser.add_argument('modules', nargs='*', default=list(BUDGETS), help="Modules to check (default: all budgeted)")
+    parser.add_argument('--runs', type=int, default=3, help="Cold imports per module; the fastest counts")
+    parser.add_argument('--scale', type=float, default=BUDGET_SCALE, help="Multiply every budget")
+    parser.add_argument('--top', type=int, default=5, help="Heaviest direct imports to list per module")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for module in args.modules:
+        budget_ms, forbidden = BUDGETS.get(module, (200, ()))
+        try:
+            report = check(module, budget_ms * args.scale, forbidden, args.runs)
+        except (RuntimeError, StopIteration) as e:
+            logger.error(f"{module}: {e}")
+            failed += 1
+            continue
+
+        status = 'ok' if report['ok'] else 'OVER BUDGET' if not report['forbidden_loaded'] else 'FORBIDDEN IMPORTS'
+        logger.info(f"{module}: {report['ms']:.1f} ms (budget {report['budget_ms']:.0f} ms) {status}")
+        if report['forbidden_loaded']:
+            logger.info(f"    loads {', '.join(report['forbidden_loaded'])}")
+        for ms, name in report['children'][:args.top]:
+            logger.info(f"    {ms:7.1f} ms  {name}")
+        failed += not report['ok']
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,57 @@
+# src/bench/recordings.py
+# Record/replay of real fetched schedule content, so parser benchmarks can run on what the
+# live sites actually serve without hitting them on every run.
+# A recording is the raw fetch result gzipped: HTML as <league>-<stamp>.html.gz, the NBA
+# schedule feed (a dict) as <league>-<stamp>.json.gz.
+
+import glob
+import gzip
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_DIR = os.getenv(
+    "BENCH_RECORDINGS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recordings'),
+)
+
+
+def save_recording(league: str, content, directory: str = RECORDINGS_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime('%Y%m%dT%H%M%S')
+    if isinstance(content, dict):
+        path, raw = os.path.join(directory, f"{league.lower()}-{stamp}.json.gz"), json.dumps(content)
+    else:
+        path, raw = os.path.join(directory, f"{league.lower()}-{stamp}.html.gz"), content
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(raw)
+    logger.info(f"Recorded {league} ({len(raw)} chars) to {path}")
+    return path
+
+
+def load_recording(path: str):
+    """Returns what the scraper's fetch returned: an HTML string or, for .json.gz, the feed dict."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        raw = f.read()
+    return json.loads(raw) if path.endswith('.json.gz') else raw
+
+
+def list_recordings(league: str | None = None, directory: str = RECORDINGS_DIR) -> list:
+    """Recording paths, oldest first (file names sort by timestamp)."""
+    pattern = f"{league.lower()}-*" if league else '*'
+    return sorted(glob.glob(os.path.join(directory, f"{pattern}.gz")))
+
+
+async def record(scrapers, directory: str = RECORDINGS_DIR) -> list:
+    """Fetches each scraper's page once through the browser pool and saves the result."""
+    paths = []
+    for scraper in scrapers:
+        content = await scraper.fetch(scraper.url)
+        if content:
+            paths.append(save_recording(scraper.name, content, directory))
+        else:
+            logger.error(f"[{scraper.name}] Nothing fetched; no recording written.")
+    return paths
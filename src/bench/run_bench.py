@@ -0,0 +1,224 @@
+# src/bench/run_bench.py
+# Offline benchmarks for the scrape pipeline: parse time and peak memory per parser engine,
+# and upsert throughput, on synthetic pages (synthetic_pages.py) and on recorded real pages
+# (recordings.py). Results are written as JSON so runs can be compared between versions.
+#
+# Usage: python -m src.bench.run_bench [--days 30 --games 10] [--replay] [--out bench.json]
+#                                      [--mongo-uri mongodb://localhost:27017] [--compare old.json]
+#        python -m src.bench.run_bench --record          (fetch live pages once and save them)
+#
+# Upserts run against --mongo-uri (a local mongod; a throwaway 'wwl_bench' database is dropped
+# afterwards) or, without it, against mongomock when that package is installed.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from ..scraper import epl_scraper, html_select, nba_scraper
+from ..scraper.schedule_store import upsert_games
+from .recordings import list_recordings, load_recording, record
+from .synthetic_pages import PAGE_BUILDERS
+
+logger = logging.getLogger(__name__)
+
+SCRAPERS = {'NBA': nba_scraper.SCRAPER, 'EPL': epl_scraper.SCRAPER}
+BENCH_DATABASE = 'wwl_bench'
+MODIFIED_FRACTION = 0.1
+# Which number decides a regression, and whether higher is better
+KEY_METRICS = {'parse': ('median_seconds', False), 'upsert': ('docs_per_second', True)}
+
+
+def _engines() -> list:
+    return ['lxml', 'soup'] if html_select.HAS_LXML else ['soup']
+
+
+# --- Parse ---
+
+def bench_parse(name: str, league: str, content, repeat: int) -> list:
+    """Times SCRAPER.parse on `content` with every available engine; one result per engine."""
+    parse = SCRAPERS[league].parse
+    engines = ['feed'] if isinstance(content, dict) else _engines()
+    size = len(json.dumps(content)) if isinstance(content, dict) else len(content.encode('utf-8'))
+    results = []
+
+    previous_engine = html_select.PARSER_ENGINE
+    try:
+        for engine in engines:
+            html_select.PARSER_ENGINE = 'soup' if engine == 'soup' else 'auto'
+            games = parse(content)  # warm-up; also gives the game count
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                parse(content)
+                timings.append(time.perf_counter() - started)
+
+            tracemalloc.start()
+            parse(content)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results.append({
+                'name': f"parse/{name}/{engine}", 'kind': 'parse', 'league': league, 'engine': engine,
+                'input_bytes': size, 'games': len(games), 'repeat': repeat,
+                'median_seconds': statistics.median(timings), 'min_seconds': min(timings),
+                'games_per_second': round(len(games) / statistics.median(timings), 1) if timings else 0,
+                'peak_memory_bytes': peak,
+            })
+    finally:
+        html_select.PARSER_ENGINE = previous_engine
+    return results
+
+
+# --- Upsert ---
+
+def _open_bench_db(mongo_uri: str | None):
+    if mongo_uri:
+        from pymongo import MongoClient
+        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
+        return client[BENCH_DATABASE], 'mongod', lambda: client.drop_database(BENCH_DATABASE)
+    try:
+        import mongomock
+    except ImportError:
+        return None, None, None
+    return mongomock.MongoClient()[BENCH_DATABASE], 'mongomock', lambda: None
+
+
+def bench_upsert(db, backend: str, name: str, league: str, games: list) -> list:
+    """Three passes over the same games: all new, all unchanged, then ~10% modified."""
+    scraper = SCRAPERS[league]
+    collection = db[f"bench_{scraper.collection}"]
+    collection.drop()
+
+    modified = [
+        {**game, 'national_broadcasts': [*game.get('national_broadcasts', []), 'Bench TV']}
+        if i % int(1 / MODIFIED_FRACTION) == 0 else game
+        for i, game in enumerate(games)
+    ]
+
+    results = []
+    for label, batch in (('insert', games), ('unchanged', games), ('modify', modified)):
+        started = time.perf_counter()
+        counts = upsert_games(collection, batch, key=scraper.key)
+        seconds = time.perf_counter() - started
+        results.append({
+            'name': f"upsert/{name}/{label}", 'kind': 'upsert', 'league': league, 'backend': backend,
+            'games': len(batch), 'inserted': counts['inserted'], 'modified': counts['modified'],
+            'unchanged': counts['unchanged'], 'seconds': seconds,
+            'docs_per_second': round(len(batch) / seconds, 1) if seconds else 0,
+        })
+    collection.drop()
+    return results
+
+
+# --- Reporting ---
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """Prints the change of each key metric against a baseline run. Returns the regressions."""
+    previous = {result['name']: result for result in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        metric, higher_is_better = KEY_METRICS[result['kind']]
+        old = previous.get(result['name'], {}).get(metric)
+        if not old:
+            continue
+        change = (result[metric] - old) / old
+        worse = -change if higher_is_better else change
+        flag = 'REGRESSION' if worse > threshold else ''
+        print(f"{result['name']:<40} {metric:<16} {old:>12.4g} -> {result[metric]:>12.4g} ({change:+.1%}) {flag}")
+        if flag:
+            regressions.append(result['name'])
+    return regressions
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Offline parser/upsert benchmarks.")
+    parser.add_argument('--days', type=int, default=30, help="Day sections per synthetic page")
+    parser.add_argument('--games', type=int, default=10, help="Games per day on synthetic pages")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed parse runs per case")
+    parser.add_argument('--leagues', nargs='*', default=list(SCRAPERS), help="Leagues to benchmark")
+    parser.add_argument('--replay', action='store_true', help="Also parse the latest recording of each league")
+    parser.add_argument('--record', action='store_true', help="Fetch the live pages once, save them and exit")
+    parser.add_argument('--mongo-uri', help="Benchmark upserts against this mongod instead of mongomock")
+    parser.add_argument('--out', default='bench_results.json', help="Where to write the JSON results")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+    leagues = [league.upper() for league in args.leagues if league.upper() in SCRAPERS]
+
+    if args.record:
+        from ..scraper.browser_pool import run_with_browser_pool
+        paths = asyncio.run(run_with_browser_pool(record([SCRAPERS[league] for league in leagues])))
+        return 0 if paths else 1
+
+    # The parsers log every call; keep the benchmark output readable.
+    logging.getLogger('src.scraper').setLevel(logging.WARNING)
+
+    results = []
+    synthetic = {}
+    for league in leagues:
+        page = PAGE_BUILDERS[league](days=args.days, games=args.games)
+        synthetic[league] = page
+        results.extend(bench_parse(f"{league.lower()}-synthetic-{args.days}x{args.games}", league, page, args.repeat))
+        if args.replay:
+            recordings = list_recordings(league)
+            if recordings:
+                name = os.path.basename(recordings[-1]).split('.')[0]
+                results.extend(bench_parse(f"replay-{name}", league, load_recording(recordings[-1]), args.repeat))
+            else:
+                logger.warning(f"No {league} recording to replay (run with --record first).")
+
+    db, backend, cleanup = _open_bench_db(args.mongo_uri)
+    if db is None:
+        logger.warning("Skipping upsert benchmarks: pass --mongo-uri or install mongomock.")
+    else:
+        try:
+            for league in leagues:
+                games = SCRAPERS[league].parse(synthetic[league])
+                results.extend(bench_upsert(db, backend, f"{league.lower()}-{args.days}x{args.games}", league, games))
+        finally:
+            cleanup()
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'lxml': html_select.HAS_LXML,
+        'params': {'days': args.days, 'games': args.games, 'repeat': args.repeat},
+        'results': results,
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for result in results:
+        metric = KEY_METRICS[result['kind']][0]
+        print(f"{result['name']:<40} {metric:<16} {result[metric]:>12.4g}  ({result['games']} games)")
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+# src/bench/synthetic_pages.py
+# Synthetic schedule pages for offline benchmarks.
+# The markup mirrors what parse_nba_schedule / parse_epl_schedule read on nba.com and
+# worldsoccertalk.com (same tags, class names and nesting), so the generated pages exercise
+# the real parsing paths: regular games, NBA Cup games without team links, TBD times,
+# regional TV, streaming providers that get filtered, and so on. Output is deterministic per seed.
+
+import html
+import random
+from datetime import date, timedelta
+
+from ..scraper.team_registry import TEAM_DATA
+
+NBA_NATIONAL = ['ESPN', 'TNT', 'ABC', 'NBA TV', 'Prime Video', 'LEAGUE PASS']
+NBA_REGIONAL = ['FanDuel SN Detroit', 'Spectrum SportsNet', 'MSG', 'NBC Sports Bay Area', 'KJZZ']
+EPL_PROVIDERS = ['USA Network', 'Peacock', 'NBC', 'Telemundo', 'Universo', 'fubo', 'Sling', 'DirecTV Stream']
+NBA_TIMES = ['12:00 pm ET', '3:30 pm ET', '7:00 pm ET', '7:30 pm ET', '8:00 pm ET', '10:00 pm ET', '10:30 pm ET']
+EPL_TIMES = ['7:30 AM ET', '10:00 AM ET', '12:30 PM ET', '2:00 PM ET', '3:00 PM ET']
+
+
+def _day_label(day: date) -> str:
+    return f"{day:%A}, {day:%B} {day.day}"
+
+
+def nba_schedule_page(days: int = 30, games: int = 10, start: date = date(2025, 12, 6), seed: int = 1) -> str:
+    """An nba.com schedule page with `days` day sections of `games` games each."""
+    rng = random.Random(seed)
+    teams = [name for _, name, *_ in TEAM_DATA['NBA']]
+    out = ['<html><head><title>NBA Schedule</title></head><body><div id="__next"><main>']
+
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        out.append('<div class="ScheduleDay_sd__GFE_w">')
+        out.append(f'<h4 class="ScheduleDay_sdDay__3s2Xt">{_day_label(day)}</h4>')
+        out.append('<div class="ScheduleDay_sdGames__NGdO5">')
+        for _ in range(games):
+            away, home = rng.sample(teams, 2)
+            out.append('<div class="ScheduleGame_sg__RmD9I">')
+            out.append('<div class="ScheduleGame_sgLeft__fKSmX">')
+            status = rng.choice(NBA_TIMES) if rng.random() > 0.05 else 'TBD'
+            out.append(f'<span class="ScheduleStatusText_base__Jgvjb">{status}</span>')
+            if rng.random() < 0.05:
+                # NBA Cup knockout games list the teams as figure text instead of links
+                out.append('<p class="ScheduleGame_sgLabel__wkprj">Emirates NBA Cup</p>')
+                out.append(f'<p class="ScheduleGame_sgFigtext__gYud6">{html.escape(away)}:</p>'
+                           f'<p class="ScheduleGame_sgFigtext__gYud6">{html.escape(home)}</p>')
+            else:
+                out.append(f'<a class="Anchor_anchor__cSc3P Link_styled__okbXW" href="/team/{away.lower()}">{html.escape(away)}</a>'
+                           '<span> @ </span>'
+                           f'<a class="Anchor_anchor__cSc3P Link_styled__okbXW" href="/team/{home.lower()}">{html.escape(home)}</a>')
+            out.append('</div><div class="Broadcasters_base__Wet1u">')
+            for network in rng.sample(NBA_NATIONAL, rng.randint(0, 2)):
+                out.append(f'<img class="Broadcasters_icon__82MTV" title="{network}" alt="{network}" src="/logos/{network}.svg">')
+            if rng.random() < 0.7:
+                out.append('<p class="Broadcasters_title__B1dGd">TV</p>'
+                           f'<p><a class="Anchor_anchor__cSc3P Broadcasters_tv__AIeZb" href="#">{rng.choice(NBA_REGIONAL)}</a></p>')
+            out.append('</div></div>')
+        out.append('</div></div>')
+
+    out.append('</main></div></body></html>')
+    return ''.join(out)
+
+
+def epl_schedule_page(days: int = 20, games: int = 8, start: date = date(2025, 12, 6), seed: int = 1) -> str:
+    """A worldsoccertalk.com Premier League TV schedule with `days` date headers."""
+    rng = random.Random(seed)
+    teams = [rng.choice([name, *aliases]) if aliases else name for _, name, *aliases in TEAM_DATA['EPL']]
+    out = ['<html><head><title>Premier League TV Schedule</title></head><body><main><div class="schedule">']
+
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        out.append(f'<h3 class="text-stvsDate font-bold">{_day_label(day)}</h3><ul>')
+        for _ in range(games):
+            away, home = rng.sample(teams, 2)
+            out.append('<li><div class="flex">')
+            if rng.random() > 0.05:
+                out.append(f'<span class="text-stvsMatchHour">{rng.choice(EPL_TIMES)}</span>')
+            out.append(f'<h4 class="text-stvsMatchTitle">{html.escape(away)} vs. {html.escape(home)} (Premier League)</h4>')
+            out.append('<div class="flex flex-wrap gap-[3px_5px]">')
+            for provider in rng.sample(EPL_PROVIDERS, rng.randint(1, 4)):
+                out.append(f'<div class="text-stvsProviderLink"><a href="#">{provider}</a><a href="#">{provider}</a></div>')
+            out.append('</div></div></li>')
+        out.append('</ul>')
+
+    out.append('</div></main></body></html>')
+    return ''.join(out)
+
+
+PAGE_BUILDERS = {
+    'NBA': nba_schedule_page,
+    'EPL': epl_schedule_page,
+}
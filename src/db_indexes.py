@@ -0,0 +1,140 @@
+# src/db_indexes.py
+# Index bootstrap and query-plan checks for the WatchWhereLive collections.
+# ensure_indexes() is idempotent and safe to run on every deploy / scrape run;
+# check_query_plans() runs explain() on the hot queries and reports any COLLSCAN.
+#
+# Usage: python -m src.db_indexes           (create indexes, then check plans)
+#        python -m src.db_indexes --check   (only check plans; exits 1 on a COLLSCAN)
+
+import argparse
+import logging
+from datetime import datetime
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from .api.change_feed import CHANGE_LOG_RETENTION_HOURS
+from .scraper.schedule_history import HISTORY_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+# Games are matched on game_id (EPL) or _id (NBA). NBA documents have no game_id field,
+# so uniqueness is only enforced where the field exists.
+_GAME_ID_UNIQUE = IndexModel(
+    [('game_id', ASCENDING)], name='game_id_unique', unique=True,
+    partialFilterExpression={'game_id': {'$exists': True}},
+)
+# The admin validation queue only ever reads unvalidated games, paged in (game_date, _id) order.
+_UNVALIDATED = IndexModel(
+    [('is_validated', ASCENDING), ('game_date', ASCENDING), ('_id', ASCENDING)], name='unvalidated_queue_by_date',
+    partialFilterExpression={'is_validated': False},
+)
+_DATE = IndexModel([('date_str', ASCENDING)], name='date_str')
+# Range reads ("tonight's games"); sport follows so a sport filter is covered by the same scan.
+_START = IndexModel([('start_utc', ASCENDING), ('sport', ASCENDING)], name='start_utc_sport')
+_HOME_TEAM = IndexModel([('sport', ASCENDING), ('home_team', ASCENDING)], name='sport_home_team')
+_AWAY_TEAM = IndexModel([('sport', ASCENDING), ('away_team', ASCENDING)], name='sport_away_team')
+
+INDEXES = {
+    'schedules': [_GAME_ID_UNIQUE, _UNVALIDATED, _DATE, _START, _HOME_TEAM, _AWAY_TEAM],
+    'epl_schedules': [_GAME_ID_UNIQUE, _UNVALIDATED, _DATE, _START, _HOME_TEAM, _AWAY_TEAM],
+    'dma_rules': [
+        IndexModel([('dma_code', ASCENDING), ('team_name', ASCENDING), ('sport', ASCENDING)],
+                   name='dma_team_sport_unique', unique=True),
+    ],
+    'schedule_views': [
+        IndexModel([('game_date', ASCENDING)], name='game_date'),
+    ],
+    # Change log for the SSE feed: read by seq, expired by MongoDB's TTL monitor
+    'schedule_changes': [
+        IndexModel([('seq', ASCENDING)], name='seq_unique', unique=True),
+        IndexModel([('at', ASCENDING)], name='at_ttl', expireAfterSeconds=int(CHANGE_LOG_RETENTION_HOURS * 3600)),
+    ],
+    # Field history: segments of one game by number; segments with recent broadcast changes
+    HISTORY_COLLECTION: [
+        IndexModel([('game', ASCENDING), ('seg', ASCENDING)], name='game_seg_unique', unique=True),
+        IndexModel([('broadcast_at', ASCENDING)], name='broadcast_at'),
+    ],
+}
+
+# (collection, filter) pairs for every query on a hot path. Values are placeholders;
+# only the shape matters to the planner.
+HOT_QUERIES = [
+    ('schedules', {'_id': 'SaturdayDecember6_Lakers_Celtics'}),
+    ('epl_schedules', {'game_id': 'EPL_Arsenal_vs_Chelsea_saturdaydecember6'}),
+    ('schedules', {'is_validated': False, 'regional_broadcast_placeholder': {'$ne': ''}}),
+    ('epl_schedules', {'is_validated': False}),
+    ('epl_schedules', {'is_validated': False, 'game_date': {'$gte': '2025-12-06'}}),
+    ('dma_rules', {'dma_code': 'LA-DMA', 'team_name': 'Lakers', 'sport': 'NBA'}),
+    ('dma_rules', {'dma_code': {'$in': ['LA-DMA', 'NY-DMA']}}),
+    ('schedules', {'date_str': {'$in': ['Saturday, December 6']}}),
+    ('epl_schedules', {'date_str': {'$in': ['Saturday, December 6']}}),
+    ('schedules', {'sport': 'NBA', '$or': [{'home_team': 'Lakers'}, {'away_team': 'Lakers'}]}),
+    ('schedules', {'start_utc': {'$gte': datetime(2025, 12, 6, 5), '$lt': datetime(2025, 12, 7, 5)}}),
+    ('epl_schedules', {'start_utc': {'$gte': datetime(2025, 12, 6, 5), '$lt': datetime(2025, 12, 7, 5)}, 'sport': 'EPL'}),
+    ('schedule_views', {'_id': {'$in': ['*|2025-12-06']}}),
+    ('schedule_changes', {'seq': {'$gt': 41}}),
+    (HISTORY_COLLECTION, {'game': {'$in': ['schedules/SaturdayDecember6_Lakers_Celtics']}, 'open': True}),
+    (HISTORY_COLLECTION, {'broadcast_at': {'$gte': datetime(2025, 12, 6)}}),
+]
+
+
+def ensure_indexes(db) -> dict:
+    """Creates every index in INDEXES. Existing identical indexes are left untouched."""
+    report = {}
+    for collection, models in INDEXES.items():
+        try:
+            report[collection] = db[collection].create_indexes(models)
+        except OperationFailure as e:
+            # e.g. an index with the same name but different options already exists
+            logger.error(f"Could not create indexes on {collection}: {e}")
+            report[collection] = f"error: {e}"
+    logger.info(f"Index bootstrap finished: {report}")
+    return report
+
+
+def _stages(plan):
+    """Yields every 'stage' name in an explain() plan tree, whatever its nesting format."""
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item)
+
+
+def check_query_plans(db, queries=HOT_QUERIES) -> list:
+    """Returns a list of (collection, filter, stages) for every hot query whose plan has a COLLSCAN."""
+    failures = []
+    for collection, query in queries:
+        explained = db[collection].find(query).explain()
+        stages = list(_stages(explained.get('queryPlanner', {}).get('winningPlan', {})))
+        if 'COLLSCAN' in stages:
+            logger.error(f"COLLSCAN on {collection} for {query}")
+            failures.append((collection, query, stages))
+        else:
+            logger.info(f"OK {collection} {query}: {' > '.join(stages)}")
+    return failures
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Create indexes and check hot query plans.")
+    parser.add_argument('--check', action='store_true', help="Only run the query-plan check")
+    args = parser.parse_args(argv)
+
+    from .scraper.scraper_config import get_mongo_client
+    db = get_mongo_client()
+    if db is None:
+        logger.error("Could not connect to MongoDB. Exiting.")
+        return 1
+
+    if not args.check:
+        ensure_indexes(db)
+    failures = check_query_plans(db)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
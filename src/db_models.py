@@ -5,8 +5,13 @@
 SCHEDULE_SCHEMA = {
     "_id": "Unique Game ID (e.g., LAL_GSW_20251210)",
     "sport": "NBA",
+    "date_str": "Source day header (e.g., Saturday, December 6)",
+    # Derived at ingest (schedule_store / schedule_dates); times on the sources are US Eastern
+    "game_date": "YYYY-MM-DD (Eastern calendar day)",
+    "start_utc": "datetime, UTC start (Eastern midnight of game_date when time_tbd)",
     "date_utc": "YYYY-MM-DD",
-    "time_utc": "HH:MM:SS",
+    "time_utc": "HH:MM:SS (None when time_tbd)",
+    "time_tbd": False,
     "home_team": "Team Name (e.g., Los Angeles Lakers)",
     "away_team": "Team Name (e.g., Golden State Warriors)",
     "national_broadcasts": ["ESPN", "ABC", "TNT"], # Tier 1 Data
@@ -1,56 +1,246 @@
 # src/api/admin_api.py
-from flask import Flask, request, jsonify
-from datetime import datetime
+from flask import Flask, Response, request, jsonify
+from datetime import date, datetime, timedelta, timezone
+import base64
 import json
 import logging
 
 # Assuming scraper_config is correctly configured for pymongo and .env
 # We use relative import, but need to run with `python -m src.api.admin_api` for local testing.
-from ..scraper.scraper_config import get_mongo_client 
+from bson import ObjectId
+from pymongo.errors import ConnectionFailure
+from ..scraper.scraper_config import get_mongo_client, reset_mongo_client
+from ..api.cache_generation import bump_generation
+from ..api.change_feed import record_rule_changes
+from ..api.response_cache import cached_response
+from ..api.schedule_resolver import InvalidLookup, fetch_games_between, parse_utc_range, serialize_game
+from ..api.schedule_views import refresh_views_for_rule
+from . import scrape_metrics
+from .schedule_dates import to_naive_utc
+from .schedule_history import game_as_of, game_changes, recent_broadcast_changes
+from .dma_import import (
+    FORMATS, detect_format, import_rules, iter_rows, normalize_rule, refresh_views_after_import,
+)
 
 # Initialize Flask app (required for routing structure, even in serverless context)
 app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Helper function to get database connection
+# Helper function to get database connection.
+# get_mongo_client() reuses one process-wide client, so this is cheap on every request.
 def get_db():
-    client = get_mongo_client()
-    if client:
-        return client['sports_schedule']
-    return None
+    return get_mongo_client()
+
+
+def _handle_db_error(e: Exception):
+    """Drops the shared client after a connection failure so the next request reconnects."""
+    if isinstance(e, ConnectionFailure):
+        logger.warning("MongoDB connection failure. Resetting the shared client.")
+        reset_mongo_client()
+
+def _invalidate_responses(db, reason: str):
+    """
+    Rule writes change resolved schedules: drop every cached API response. Call it after
+    _log_rule_changes, so no delta cached under the new generation misses the change.
+    """
+    try:
+        bump_generation(db, reason)
+    except Exception as e:
+        logger.error(f"Could not invalidate cached responses after {reason}: {e}")
+
+
+def _log_rule_changes(db, reason: str, rules):
+    """Tells live subscribers (/api/schedule/changes) of the affected markets about the new channels."""
+    try:
+        record_rule_changes(db, reason, rules)
+    except Exception as e:
+        logger.error(f"Could not log schedule changes after {reason}: {e}")
+
+
+# --- Validation queue ---
+# Both schedule collections are read as one stream ordered by (game_date, collection, _id).
+# Each page pulls at most page_size + 1 documents per collection from the
+# (is_validated, game_date, _id) index and merges them; the opaque cursor is the sort key
+# of the last game returned, so paging never skips or repeats and never re-reads earlier pages.
+QUEUE_SOURCES = [
+    # (collection, extra filter). The list position is the collection's rank in the merged order.
+    ('schedules', {"regional_broadcast_placeholder": {"$ne": ""}}),
+    ('epl_schedules', {}),
+]
+QUEUE_FIELDS = {"_id": 1, "sport": 1, "away_team": 1, "home_team": 1, "national_broadcasts": 1,
+                "regional_broadcast_placeholder": 1, "date_str": 1, "game_date": 1, "time_str_et": 1,
+                "start_utc": 1, "time_tbd": 1}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(game: dict, rank: int) -> str:
+    is_oid = isinstance(game['_id'], ObjectId)
+    key = json.dumps([game.get('game_date'), rank, is_oid, str(game['_id'])], separators=(',', ':'))
+    return base64.urlsafe_b64encode(key.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Returns (game_date, rank, is_oid, id). Raises ValueError for anything that is not one of our cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        game_date, rank, is_oid, game_id = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(game_date, (str, type(None))) or not isinstance(rank, int) or not isinstance(is_oid, bool):
+        raise ValueError("Invalid cursor")
+    if not isinstance(game_id, str) or (is_oid and not ObjectId.is_valid(game_id)):
+        raise ValueError("Invalid cursor")
+    return game_date, rank, is_oid, game_id
+
+
+def _sort_key(game_date, rank: int, is_oid: bool, game_id: str) -> tuple:
+    # MongoDB sorts missing/null game_date before every string, and string _ids before
+    # ObjectIds (hex order is byte order); mirror that when merging.
+    return (game_date is not None, game_date or '', rank, is_oid, game_id)
+
+
+def _ids_after(is_oid: bool, game_id: str) -> dict:
+    # EPL documents use generated ObjectIds, NBA documents string keys, but either collection
+    # may hold both. $gt only compares within one BSON type, so add the later type explicitly.
+    if is_oid:
+        return {"_id": {"$gt": ObjectId(game_id)}}
+    return {"$or": [{"_id": {"$gt": game_id}}, {"_id": {"$type": "objectId"}}]}
+
+
+def _after_filter(rank: int, after) -> dict:
+    """Everything in this collection that sorts after the cursor key."""
+    after_date, after_rank, is_oid, after_id = after
+    if after_date is None:
+        # Cursor is still inside the games whose date could not be inferred.
+        later_dates = {"game_date": {"$type": "string"}}
+        if rank < after_rank:
+            return later_dates
+        if rank > after_rank:
+            return {}
+        return {"$or": [later_dates, {"$and": [{"game_date": None}, _ids_after(is_oid, after_id)]}]}
+
+    if rank < after_rank:
+        return {"game_date": {"$gt": after_date}}
+    if rank > after_rank:
+        return {"game_date": {"$gte": after_date}}
+    return {"$or": [{"game_date": {"$gt": after_date}},
+                    {"$and": [{"game_date": after_date}, _ids_after(is_oid, after_id)]}]}
+
+
+def _queue_filter(rank: int, extra: dict, sport, start, end, after) -> dict:
+    clauses = [{"is_validated": False, **extra}]
+    if sport:
+        clauses.append({"sport": sport})
+    if start or end:
+        date_range = {}
+        if start:
+            date_range["$gte"] = start
+        if end:
+            date_range["$lte"] = end
+        clauses.append({"game_date": date_range})
+    if after:
+        clauses.append(_after_filter(rank, after))
+    clauses = [clause for clause in clauses if clause]
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def read_validation_queue(db, page_size=DEFAULT_PAGE_SIZE, cursor=None, sport=None, start=None, end=None) -> dict:
+    """One page of the merged validation queue: {"games", "next_cursor", "count"}."""
+    after = decode_cursor(cursor) if cursor else None
+    sort = [("game_date", 1), ("_id", 1)]
+
+    candidates = []
+    for rank, (collection, extra) in enumerate(QUEUE_SOURCES):
+        query = _queue_filter(rank, extra, sport, start, end, after)
+        for game in db[collection].find(query, QUEUE_FIELDS).sort(sort).limit(page_size + 1):
+            candidates.append((game.get('game_date'), rank, isinstance(game['_id'], ObjectId), str(game['_id']), game))
+    candidates.sort(key=lambda item: _sort_key(*item[:4]))
+
+    page = candidates[:page_size]
+    next_cursor = encode_cursor(page[-1][4], page[-1][1]) if len(candidates) > page_size else None
+
+    count = None
+    if not after:
+        # Counted on the first page only; later pages keep the number the client already has.
+        count = sum(db[collection].count_documents(_queue_filter(rank, extra, sport, start, end, None))
+                    for rank, (collection, extra) in enumerate(QUEUE_SOURCES))
+
+    games = []
+    for _, _, _, game_id, game in page:
+        game['_id'] = game_id
+        games.append(game)
+    return {"games": games, "next_cursor": next_cursor, "count": count}
+
 
 @app.route('/api/admin/unvalidated', methods=['GET'])
+@cached_response(public=False)
 def get_unvalidated_games():
     """
     Endpoint to retrieve games lacking Layer 2 RSN mapping (is_validated: False).
     This populates the Admin Page's default view.
+    Query params: limit, cursor (from the previous page's next_cursor), sport,
+    start / end (YYYY-MM-DD, inclusive, on game_date).
     """
+    try:
+        page_size = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+    start, end = request.args.get('start'), request.args.get('end')
+    for value in (start, end):
+        if value:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                return jsonify({"error": "start and end must be YYYY-MM-DD"}), 400
+    sport = (request.args.get('sport') or '').strip().upper() or None
+
     db = get_db()
-    if not db:
+    if db is None:
         return jsonify({"error": "Database connection failed"}), 500
 
-    # Retrieve games from both collections that require validation
     try:
-        nba_games = list(db['schedules'].find(
-            {"is_validated": False, "regional_broadcast_placeholder": {"$ne": ""}}, 
-            {"_id": 1, "sport": 1, "away_team": 1, "home_team": 1, "national_broadcasts": 1, "regional_broadcast_placeholder": 1, "date_str": 1, "time_str_et": 1}
-        ).limit(50)) # Limit to 50 for a manageable queue
-
-        epl_games = list(db['epl_schedules'].find(
-            {"is_validated": False}, 
-            {"_id": 1, "sport": 1, "away_team": 1, "home_team": 1, "national_broadcasts": 1, "date_str": 1, "time_str_et": 1}
-        ).limit(50))
-        
-        # Merge, convert ObjectIds to strings, and return
-        all_games = nba_games + epl_games
-        for game in all_games:
-            game['_id'] = str(game['_id'])
-
-        return jsonify(all_games), 200
+        page = read_validation_queue(db, page_size, request.args.get('cursor'), sport, start, end)
+        return jsonify(page), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error retrieving unvalidated games: {e}")
+        _handle_db_error(e)
+        return jsonify({"error": "Internal server error during data retrieval"}), 500
+
+
+@app.route('/api/admin/games', methods=['GET'])
+@cached_response(public=False)
+def get_games_in_range():
+    """
+    Games from both collections starting in a UTC window, with their validation state.
+    Query params: from / to (ISO-8601, default the next 24 hours), sport.
+    """
+    db = get_db()
+    if db is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    sport = (request.args.get('sport') or '').strip().upper() or None
+    try:
+        start_at, end_at = parse_utc_range(request.args.get('from'), request.args.get('to'))
+        games = [
+            {**serialize_game(game, None, {}), 'is_validated': game.get('is_validated'),
+             'regional_broadcast_placeholder': game.get('regional_broadcast_placeholder') or ''}
+            for game in fetch_games_between(db, start_at, end_at, sport)
+        ]
+        return jsonify({"from": start_at.isoformat() + 'Z', "to": end_at.isoformat() + 'Z', "games": games}), 200
+
+    except InvalidLookup as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error retrieving games in range: {e}")
+        _handle_db_error(e)
         return jsonify({"error": "Internal server error during data retrieval"}), 500
 
 
@@ -61,22 +251,15 @@ def add_or_update_dma_map():
     This handles the crucial proprietary data input.
     """
     db = get_db()
-    if not db:
+    if db is None:
         return jsonify({"error": "Database connection failed"}), 500
 
     try:
-        data = request.json
-        if not all(k in data for k in ['dma_code', 'team', 'sport', 'channel']):
+        try:
+            rule = normalize_rule(request.json)
+        except ValueError:
             return jsonify({"error": "Missing required fields in rule data"}), 400
 
-        rule = {
-            "dma_code": data['dma_code'].upper(),
-            "team_name": data['team'].strip(),
-            "sport": data['sport'].upper(),
-            "local_channel": data['channel'].strip(),
-            "last_updated": datetime.utcnow().isoformat()
-        }
-
         # Use the combination of DMA, Team, and Sport as the unique key for the rule
         result = db['dma_rules'].update_one(
             {'dma_code': rule['dma_code'], 'team_name': rule['team_name'], 'sport': rule['sport']},
@@ -85,13 +268,164 @@ def add_or_update_dma_map():
         )
 
         logger.info(f"Rule updated/inserted for {rule['dma_code']}/{rule['team_name']}. ID: {str(result.upserted_id or result.modified_count)}")
+
+        # Keep the materialized schedule views for this market in sync with the new rule
+        try:
+            refresh_views_for_rule(db, rule['dma_code'], rule['team_name'], rule['sport'])
+        except Exception as e:
+            logger.error(f"Rule saved but schedule views for {rule['dma_code']} were not refreshed: {e}")
+        _log_rule_changes(db, f"rule {rule['dma_code']}/{rule['team_name']}", [rule])
+        _invalidate_responses(db, f"rule {rule['dma_code']}/{rule['team_name']}")
+
         return jsonify({"success": True, "message": "DMA Rule saved.", "id": str(result.upserted_id or result.modified_count)}), 200
 
     except Exception as e:
         logger.error(f"Error processing DMA map update: {e}")
+        _handle_db_error(e)
         return jsonify({"error": "Internal server error during rule update"}), 500
 
 
+@app.route('/api/admin/map/import', methods=['POST'])
+def import_dma_map():
+    """
+    Bulk version of /api/admin/map. Accepts a CSV or JSONL upload (multipart field `file`,
+    or the raw request body) and streams it into dma_rules.
+    Query params: format=csv|jsonl (default: from filename / Content-Type), dry_run=1.
+    """
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    fmt = (request.args.get('format') or
+           detect_format(upload.filename if upload else None, request.content_type)).lower()
+    if fmt not in FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(FORMATS)}"}), 400
+    dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+
+    db = get_db()
+    if db is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    try:
+        report = import_rules(db, iter_rows(stream, fmt), dry_run=dry_run)
+    except Exception as e:
+        logger.error(f"Error importing DMA rules: {e}")
+        _handle_db_error(e)
+        return jsonify({"error": "Internal server error during rule import"}), 500
+
+    try:
+        refresh_views_after_import(db, report)
+    except Exception as e:
+        logger.error(f"Rules imported but schedule views were not refreshed: {e}")
+    if report['changed_rules'] and not dry_run:
+        _log_rule_changes(db, "rule import", report['changed_rules'])
+        _invalidate_responses(db, "rule import")
+
+    report.pop('changed_rules')
+    if not dry_run:
+        report.pop('diff')
+    return jsonify(report), 200
+
+
+# --- Field history (schedule_history) ---
+MAX_HISTORY_HOURS = 24 * 31
+MAX_HISTORY_LIMIT = 500
+
+
+def _json_times(value):
+    """History values keep datetimes; send them as ISO-8601 UTC like the rest of the API."""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+    if isinstance(value, dict):
+        return {k: _json_times(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_json_times(v) for v in value]
+    return value
+
+
+@app.route('/api/admin/history/broadcasts', methods=['GET'])
+@cached_response(public=False)
+def get_broadcast_changes():
+    """
+    Recent broadcast changes (national_broadcasts / regional_broadcast_placeholder), newest first.
+    Query params: hours (default 24), sport, limit (default 100).
+    """
+    try:
+        hours = float(request.args.get('hours', 24))
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({"error": "hours and limit must be numbers"}), 400
+    if not 0 < hours <= MAX_HISTORY_HOURS or not 1 <= limit <= MAX_HISTORY_LIMIT:
+        return jsonify({"error": f"hours must be in (0, {MAX_HISTORY_HOURS}] and limit in [1, {MAX_HISTORY_LIMIT}]"}), 400
+    sport = (request.args.get('sport') or '').strip().upper() or None
+
+    db = get_db()
+    if db is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=hours)
+    try:
+        changes = recent_broadcast_changes(db, since, sport, limit)
+        return jsonify({"since": _json_times(since), "changes": _json_times(changes)}), 200
+    except Exception as e:
+        logger.error(f"Error retrieving broadcast changes: {e}")
+        _handle_db_error(e)
+        return jsonify({"error": "Internal server error during data retrieval"}), 500
+
+
+@app.route('/api/admin/history/game', methods=['GET'])
+@cached_response(public=False)
+def get_game_history():
+    """
+    One game's scraped fields as of a point in time, plus every recorded change.
+    Query params: game_id (_id for NBA), collection (schedules / epl_schedules), at (ISO-8601, default latest).
+    """
+    game_id = request.args.get('game_id')
+    collection = request.args.get('collection', 'schedules')
+    if not game_id:
+        return jsonify({"error": "game_id is required"}), 400
+    if collection not in [name for name, _ in QUEUE_SOURCES]:
+        return jsonify({"error": "Unknown collection"}), 400
+    at = None
+    if request.args.get('at'):
+        try:
+            at = to_naive_utc(datetime.fromisoformat(request.args['at'].replace('Z', '+00:00')))
+        except ValueError:
+            return jsonify({"error": "at must be an ISO-8601 datetime, e.g. 2025-12-06T23:00:00Z"}), 400
+
+    db = get_db()
+    if db is None:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    try:
+        as_of = game_as_of(db, collection, game_id, at)
+        changes = game_changes(db, collection, game_id)
+        if as_of is None and not changes:
+            return jsonify({"error": "No history for this game"}), 404
+        return jsonify({"game_id": game_id, "collection": collection, "at": _json_times(at),
+                        "as_of": _json_times(as_of), "changes": _json_times(changes)}), 200
+    except Exception as e:
+        logger.error(f"Error retrieving game history: {e}")
+        _handle_db_error(e)
+        return jsonify({"error": "Internal server error during data retrieval"}), 500
+
+
+@app.route('/api/admin/metrics', methods=['GET'])
+def get_scrape_metrics():
+    """
+    Prometheus text exposition of the last scrape run per league. Scrapes usually run in
+    another process, so the file they write (SCRAPE_METRICS_FILE) is served when configured.
+    """
+    body = None
+    if scrape_metrics.METRICS_FILE:
+        try:
+            with open(scrape_metrics.METRICS_FILE, encoding='utf-8') as f:
+                body = f.read()
+        except FileNotFoundError:
+            pass
+    if body is None:
+        body = scrape_metrics.render_prometheus()
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+
 # NOTE: You would add /api/admin/dma-map GET endpoint and a game validation endpoint here later.
 
 if __name__ == '__main__':
@@ -0,0 +1,152 @@
+# src/scraper/base_scraper.py
+# The small interface every league scraper plugs into, plus the shared
+# fetch -> parse -> upsert step, so new leagues don't copy main_async again.
+
+import logging
+import time
+from urllib.parse import urlparse
+
+from ..api.cache_generation import bump_generation
+from ..api.change_feed import record_game_changes
+from ..api.schedule_views import refresh_views_for_games
+from .scraper_config import get_mongo_client
+from .schedule_history import record_history
+from .schedule_store import upsert_games
+from .scrape_metrics import count, league_run, phase, profiled
+from .snapshot_cache import commit_snapshot, parse_with_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+class LeagueScraper:
+    """
+    Describes one league source. Each scraper module exposes a module-level `SCRAPER`.
+    - fetch: async (url) -> html or None
+    - parse: (html) -> list of game dicts
+    - collection / key: where and how parsed games are upserted
+    - section_pattern: optional compiled regex matching the opening tag of a day section,
+      used by the snapshot cache to re-parse only the sections that changed
+    """
+
+    def __init__(self, name: str, url: str, fetch, parse, collection: str, key: str = 'game_id',
+                 section_pattern=None):
+        self.name = name
+        self.url = url
+        self.fetch = fetch
+        self.parse = parse
+        self.collection = collection
+        self.key = key
+        self.section_pattern = section_pattern
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.url).netloc
+
+    def __repr__(self):
+        return f"LeagueScraper({self.name!r}, {self.url!r})"
+
+
+def _refresh_views(scraper: LeagueScraper, db, changed_games: list, previous_games: list):
+    """Re-materializes the per-DMA schedule views for the days whose games changed,
+    logs the change for live subscribers and invalidates cached API responses."""
+    try:
+        refresh_views_for_games(db, changed_games, previous_games)
+    except Exception as e:
+        logger.error(f"[{scraper.name}] Games saved but schedule views were not refreshed: {e}")
+    # Log first: a /api/schedule/delta response cached under the new generation must already see the change
+    try:
+        record_game_changes(db, f"{scraper.name} scrape", changed_games, scraper.key)
+    except Exception as e:
+        logger.error(f"[{scraper.name}] Could not log the schedule change: {e}")
+    try:
+        bump_generation(db, f"{scraper.name} scrape")
+    except Exception as e:
+        logger.error(f"[{scraper.name}] Could not invalidate cached API responses: {e}")
+
+
+async def run_league(scraper: LeagueScraper, db=None, fetch=None) -> dict:
+    """
+    Runs one league end to end and returns its summary.
+    `fetch` overrides scraper.fetch (the orchestrator passes a retrying, rate-limited wrapper).
+    Phase timings and counters are recorded through scrape_metrics and included as 'metrics'.
+    """
+    with league_run(scraper.name) as metrics:
+        summary = await _run_league(scraper, db, fetch)
+        metrics.status = summary['status']
+    summary['metrics'] = metrics.as_record()
+    return summary
+
+
+def record_parse_result(scraper: LeagueScraper, games, summary: dict) -> bool:
+    """
+    Sets the league status for a parse result. Returns True when there are games to write.
+    With several pages per league, a page that was written ('ok') is not downgraded by another.
+    """
+    if games is None:
+        if summary['status'] != 'ok':
+            summary['status'] = 'unchanged'
+        return False
+    if not games:
+        logger.warning(f"[{scraper.name}] No games parsed. Skipping MongoDB update.")
+        if summary['status'] not in ('ok', 'unchanged'):
+            summary['status'] = 'empty'
+        return False
+    summary['games'] += len(games)
+    count('games_parsed', len(games))
+    return True
+
+
+def write_games(scraper: LeagueScraper, db, games: list, snapshots: list, summary: dict):
+    """
+    Write stage: upserts the games, stores the page snapshots they came from, then records the
+    field history and refreshes views, the response cache and the change log if anything
+    changed. Counts add up in `summary`, so a league may be written in several batches.
+    """
+    with phase('write'):
+        counts = upsert_games(db[scraper.collection], games, key=scraper.key)
+    changed_games = counts.pop('changed_games')
+    field_changes = counts.pop('field_changes')
+    count('writes', counts['inserted'] + counts['modified'])
+    for name, value in counts.items():
+        summary[name] = summary.get(name, 0) + value
+    summary['status'] = 'ok'
+    for snapshot in snapshots:
+        commit_snapshot(scraper, snapshot)
+    if field_changes:
+        with phase('history'):
+            try:
+                record_history(db, scraper.collection, field_changes, scraper.key)
+            except Exception as e:
+                logger.error(f"[{scraper.name}] Games saved but their change history was not recorded: {e}")
+    if changed_games:
+        with phase('views'):
+            previous_games = [change['before'] for change in field_changes if change['before']]
+            _refresh_views(scraper, db, changed_games, previous_games)
+
+
+async def _run_league(scraper: LeagueScraper, db, fetch) -> dict:
+    started = time.perf_counter()
+    summary = {'league': scraper.name, 'status': 'failed', 'games': 0}
+
+    if db is None:
+        db = get_mongo_client()
+    if db is None:
+        logger.error(f"[{scraper.name}] Could not connect to MongoDB. Skipping.")
+        count('errors')
+        summary['error'] = 'database unavailable'
+        summary['seconds'] = round(time.perf_counter() - started, 3)
+        return summary
+
+    with phase('fetch'):
+        html = await (fetch or scraper.fetch)(scraper.url)
+    if not html:
+        logger.error(f"[{scraper.name}] Failed to retrieve schedule page. Aborting.")
+        summary['error'] = 'fetch failed'
+    else:
+        with phase('parse'), profiled(f"{scraper.name.lower()}-parse"):
+            games, snapshot = parse_with_snapshot(scraper, html)
+        if record_parse_result(scraper, games, summary):
+            write_games(scraper, db, games, [snapshot], summary)
+
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+    return summary
@@ -0,0 +1,226 @@
+# src/scraper/browser_pool.py
+# Shared Playwright browser for all scrapers.
+# One warm Chromium process per event loop, with a bounded set of reusable pages
+# that are health-checked on checkout and recycled after MAX_NAVIGATIONS uses.
+# Contexts run in lean mode by default: heavy resources are blocked through request routing.
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from .scrape_metrics import phase
+
+logger = logging.getLogger(__name__)
+
+# Pool sizing can be tuned per deployment without code changes.
+POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+MAX_NAVIGATIONS = int(os.getenv("BROWSER_MAX_NAVIGATIONS", "20"))
+
+# Lean mode aborts requests the parsers never need (set BROWSER_LEAN_MODE=0 to load everything).
+LEAN_MODE = os.getenv("BROWSER_LEAN_MODE", "1") != "0"
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+BLOCKED_HOST_KEYWORDS = (
+    'doubleclick', 'googlesyndication', 'googletagmanager', 'google-analytics', 'adservice',
+    'adsystem', 'adnxs', 'taboola', 'outbrain', 'scorecardresearch', 'chartbeat', 'hotjar',
+    'facebook.net', 'segment.io', 'optimizely', 'newrelic', 'nr-data', 'quantserve',
+)
+
+
+def _is_blocked(request) -> bool:
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlparse(request.url).netloc
+    return any(keyword in host for keyword in BLOCKED_HOST_KEYWORDS)
+
+
+async def _lean_route(route):
+    """Context-wide route handler: drop images, media, fonts, ads and trackers."""
+    if _is_blocked(route.request):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _PageSlot:
+    """A browser context + page pair, plus how many times it has been borrowed."""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.navigations = 0
+
+
+class BrowserPool:
+    """
+    Keeps one headless Chromium alive and hands out pages from a bounded pool.
+    Use `async with pool.page() as page:` instead of calling async_playwright() directly.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, max_navigations: int = MAX_NAVIGATIONS, lean: bool = LEAN_MODE):
+        self.size = size
+        self.max_navigations = max_navigations
+        self.lean = lean
+        self._playwright = None
+        self._browser = None
+        self._idle = []
+        self._semaphore = asyncio.Semaphore(size)
+        self._lock = asyncio.Lock()
+
+    async def _ensure_browser(self):
+        """Launches Chromium on first use, or relaunches it if it has crashed."""
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            if self._browser is not None:
+                logger.warning("Pooled Chromium is disconnected. Relaunching.")
+                self._idle.clear()
+
+            if self._playwright is None:
+                # Imported here: runs served from the schedule feed or the snapshot cache never need it
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+            with phase('fetch.browser_launch'):
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            logger.info(f"Launched pooled Chromium (size={self.size}, recycle after {self.max_navigations} navigations)")
+            return self._browser
+
+    def _is_healthy(self, slot: _PageSlot) -> bool:
+        return (
+            self._browser is not None
+            and self._browser.is_connected()
+            and not slot.page.is_closed()
+            and slot.navigations < self.max_navigations
+        )
+
+    async def _discard(self, slot: _PageSlot):
+        try:
+            await slot.context.close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing pooled context: {e}")
+
+    async def _checkout(self) -> _PageSlot:
+        browser = await self._ensure_browser()
+        while self._idle:
+            slot = self._idle.pop()
+            if self._is_healthy(slot):
+                return slot
+            await self._discard(slot)
+
+        context = await browser.new_context()
+        if self.lean:
+            await context.route('**/*', _lean_route)
+        page = await context.new_page()
+        return _PageSlot(context, page)
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrows a page from the pool. Pages that raise are discarded, not reused."""
+        async with self._semaphore:
+            with phase('fetch.acquire_page'):  # new context/page, plus a browser launch on first use
+                slot = await self._checkout()
+            reusable = False
+            try:
+                yield slot.page
+                reusable = True
+            finally:
+                slot.navigations += 1
+                if reusable and self._is_healthy(slot):
+                    self._idle.append(slot)
+                else:
+                    await self._discard(slot)
+
+    def resize(self, size: int):
+        """
+        Allows up to `size` pages at once. The pool only grows: shrinking would have to wait
+        for borrowed pages to come back, so a smaller size is logged and ignored.
+        """
+        if size > self.size:
+            for _ in range(size - self.size):
+                self._semaphore.release()
+            logger.info(f"Browser pool resized from {self.size} to {size} pages")
+            self.size = size
+        elif size < self.size:
+            logger.warning(f"Browser pool asked for {size} pages but already allows {self.size}; keeping {self.size}.")
+
+    async def close(self):
+        """Closes every pooled page, the browser and the Playwright driver."""
+        async with self._lock:
+            while self._idle:
+                await self._discard(self._idle.pop())
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception as e:
+                    logger.debug(f"Ignoring error while closing pooled browser: {e}")
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+@asynccontextmanager
+async def capture_json_response(page, url_pattern):
+    """
+    Listens for the first successful response whose URL matches `url_pattern` (a compiled regex)
+    and yields a future resolving to its decoded JSON body. Register it before page.goto().
+    """
+    future = asyncio.get_running_loop().create_future()
+
+    async def on_response(response):
+        if future.done() or not response.ok or not url_pattern.search(response.url):
+            return
+        try:
+            payload = await response.json()
+        except Exception as e:
+            logger.debug(f"Ignoring undecodable feed response from {response.url}: {e}")
+            return
+        if not future.done():
+            future.set_result(payload)
+
+    page.on('response', on_response)
+    try:
+        yield future
+    finally:
+        page.remove_listener('response', on_response)
+        if not future.done():
+            future.cancel()
+
+
+# --- Process-wide pool (one per running event loop) ---
+_pool = None
+_pool_loop = None
+
+
+def get_browser_pool(size: int | None = None) -> BrowserPool:
+    """
+    Returns the shared pool, creating it for the current event loop if needed.
+    A `size` larger than the existing pool grows it (e.g. a crawl asking for more tabs).
+    """
+    global _pool, _pool_loop
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool_loop is not loop:
+        _pool = BrowserPool(size or POOL_SIZE)
+        _pool_loop = loop
+    elif size:
+        _pool.resize(size)
+    return _pool
+
+
+async def close_browser_pool():
+    """Shuts down the shared pool. Safe to call when no pool was ever created."""
+    global _pool, _pool_loop
+    if _pool is not None:
+        await _pool.close()
+    _pool = None
+    _pool_loop = None
+
+
+async def run_with_browser_pool(coro):
+    """Awaits `coro` and always tears the shared browser down afterwards."""
+    try:
+        return await coro
+    finally:
+        await close_browser_pool()
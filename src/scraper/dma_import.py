@@ -0,0 +1,211 @@
+# src/scraper/dma_import.py
+# Bulk Layer 2 rule import: streams a CSV or JSONL file of DMA rules into dma_rules.
+# Rows are normalized exactly like a single /api/admin/map POST, written with unordered
+# bulk_write batches, and bad rows are reported individually without aborting the import.
+# Every import reports the diff (new / changed rules, per row); a dry run writes nothing.
+#
+# Usage: python -m src.scraper.dma_import rules.csv [--dry-run] [--format csv|jsonl]
+# CSV columns (JSONL keys): dma_code, team, sport, channel
+
+import argparse
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from pymongo import UpdateOne
+
+from .team_registry import canonical_team_name
+
+logger = logging.getLogger(__name__)
+
+RULES_COLLECTION = 'dma_rules'
+REQUIRED_FIELDS = ('dma_code', 'team', 'sport', 'channel')
+BULK_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 200  # the import keeps going; only the report is capped
+FORMATS = ('csv', 'jsonl')
+
+
+def normalize_rule(data) -> dict:
+    """Turns one rule payload into a dma_rules document. Raises ValueError if it is unusable."""
+    if not isinstance(data, dict):
+        raise ValueError("Rule must be an object")
+    missing = [k for k in REQUIRED_FIELDS if not str(data.get(k) or '').strip()]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+    sport = str(data['sport']).strip().upper()
+    return {
+        "dma_code": str(data['dma_code']).strip().upper(),
+        # Same canonical names the scrapers store, so "Los Angeles Lakers" matches "Lakers" games
+        "team_name": canonical_team_name(sport, str(data['team'])),
+        "sport": sport,
+        "local_channel": str(data['channel']).strip(),
+        "last_updated": datetime.utcnow().isoformat()
+    }
+
+
+def rule_key(rule: dict) -> tuple:
+    return rule['dma_code'], rule['team_name'], rule['sport']
+
+
+# --- Readers: yield (row_number, payload) without loading the whole file ---
+
+def detect_format(name: str | None, content_type: str | None = None) -> str:
+    name, content_type = (name or '').lower(), (content_type or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')) or 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'jsonl'
+    return 'csv'
+
+
+def iter_csv_rows(stream):
+    for row_number, row in enumerate(csv.DictReader(stream), start=2):  # row 1 is the header
+        yield row_number, row
+
+
+def iter_jsonl_rows(stream):
+    for row_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, ValueError(f"Invalid JSON: {e.msg}")
+
+
+def iter_rows(stream, fmt: str):
+    """`stream` is a text stream; binary streams (uploads) are decoded as UTF-8."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}' (expected one of {', '.join(FORMATS)})")
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    return iter_csv_rows(stream) if fmt == 'csv' else iter_jsonl_rows(stream)
+
+
+# --- Import ---
+
+def _apply_batch(collection, batch: list, dry_run: bool, report: dict, pending: dict):
+    """
+    batch: [(row_number, rule)]. Later rows for the same key win, as with repeated POSTs.
+    `pending` holds the channel each key was given by earlier batches of a dry run, which
+    never reach the collection; without it a key repeated across batches would count as
+    inserted every time.
+    """
+    latest = {}
+    for row_number, rule in batch:
+        latest[rule_key(rule)] = (row_number, rule)
+
+    dma_codes = list({key[0] for key in latest})
+    existing = {
+        rule_key(doc): doc.get('local_channel')
+        for doc in collection.find({'dma_code': {'$in': dma_codes}},
+                                   {'_id': 0, 'dma_code': 1, 'team_name': 1, 'sport': 1, 'local_channel': 1})
+    }
+    existing.update((key, pending[key]) for key in latest if key in pending)
+
+    operations = []
+    for key, (row_number, rule) in latest.items():
+        if key not in existing:
+            change = 'insert'
+        elif existing[key] != rule['local_channel']:
+            change = 'update'
+        else:
+            report['unchanged'] += 1
+            continue
+
+        report['inserted' if change == 'insert' else 'updated'] += 1
+        report['changed_rules'].append(rule)
+        report['diff'].append({'row': row_number, 'change': change, 'dma_code': key[0], 'team': key[1],
+                               'sport': key[2], 'old_channel': existing.get(key),
+                               'new_channel': rule['local_channel']})
+        if dry_run:
+            pending[key] = rule['local_channel']
+        else:
+            operations.append(UpdateOne(
+                {'dma_code': key[0], 'team_name': key[1], 'sport': key[2]}, {'$set': rule}, upsert=True
+            ))
+
+    if operations:
+        collection.bulk_write(operations, ordered=False)
+
+
+def import_rules(db, rows, dry_run: bool = False, batch_size: int = BULK_BATCH_SIZE) -> dict:
+    """
+    Imports (row_number, payload) pairs from iter_rows. Returns a report with counts, per-row
+    errors, `changed_rules` (for view refreshes) and the `diff`, identical for a dry run and
+    the real import of the same rows.
+    """
+    collection = db[RULES_COLLECTION]
+    report = {'dry_run': dry_run, 'rows': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0,
+              'failed': 0, 'errors': [], 'diff': [], 'changed_rules': []}
+
+    def record_error(row_number, error):
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': row_number, 'error': str(error)})
+
+    batch, pending = [], {}
+    for row_number, payload in rows:
+        report['rows'] += 1
+        try:
+            if isinstance(payload, Exception):
+                raise payload
+            batch.append((row_number, normalize_rule(payload)))
+        except ValueError as e:
+            record_error(row_number, e)
+            continue
+
+        if len(batch) >= batch_size:
+            _apply_batch(collection, batch, dry_run, report, pending)
+            batch = []
+    if batch:
+        _apply_batch(collection, batch, dry_run, report, pending)
+
+    logger.info(f"DMA rule import{' (dry run)' if dry_run else ''}: {report['rows']} rows, "
+                f"{report['inserted']} new, {report['updated']} changed, {report['unchanged']} unchanged, "
+                f"{report['failed']} failed.")
+    return report
+
+
+def refresh_views_after_import(db, report: dict):
+    """Rebuilds the materialized views touched by an import (no-op for dry runs)."""
+    if report['dry_run'] or not report['changed_rules']:
+        return None
+    from ..api.schedule_views import refresh_views_for_rules
+    return refresh_views_for_rules(db, report['changed_rules'])
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Bulk import Layer 2 DMA rules from CSV or JSONL.")
+    parser.add_argument('path', help="CSV (dma_code, team, sport, channel columns) or JSONL file")
+    parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension")
+    parser.add_argument('--dry-run', action='store_true', help="Report the diff without writing")
+    args = parser.parse_args(argv)
+
+    from .scraper_config import get_mongo_client
+    db = get_mongo_client()
+    if db is None:
+        logger.error("Could not connect to MongoDB. Exiting.")
+        return 1
+
+    with open(args.path, encoding='utf-8-sig', newline='') as f:
+        report = import_rules(db, iter_rows(f, args.format or detect_format(args.path)), dry_run=args.dry_run)
+    refresh_views_after_import(db, report)
+    if report['changed_rules'] and not args.dry_run:
+        # Same follow-up as the admin import endpoint: tell live subscribers, then drop cached responses
+        from ..api.cache_generation import bump_generation
+        from ..api.change_feed import record_rule_changes
+        record_rule_changes(db, "rule import (cli)", report['changed_rules'])
+        bump_generation(db, "rule import (cli)")
+
+    for change in report['diff']:
+        print(f"row {change['row']}: {change['change']} {change['dma_code']}/{change['sport']}/{change['team']}: "
+              f"{change['old_channel']!r} -> {change['new_channel']!r}")
+    for error in report['errors']:
+        print(f"row {error['row']}: {error['error']}")
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,14 +1,15 @@
 # src/scraper/epl_scraper.py
 # IMPORTANT: Requires Playwright to be installed and browsers downloaded.
 
-import requests
-from bs4 import BeautifulSoup
-from .scraper_config import get_mongo_client
+from . import html_select
+from .base_scraper import LeagueScraper, run_league
 import re
 from datetime import datetime, timezone
 import logging
 import asyncio
-from playwright.async_api import async_playwright
+from .browser_pool import get_browser_pool, run_with_browser_pool
+from .scrape_metrics import count, phase
+from .team_registry import canonical_team_name, team_code
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,51 +19,169 @@ logger = logging.getLogger(__name__)
 EPL_SCHEDULE_URL = "https://worldsoccertalk.com/premier-league-tv-schedule/"
 
 async def fetch_schedule_page(url: str) -> str | None:
-    """Fetches the fully rendered HTML content using Playwright."""
+    """Fetches the fully rendered HTML content using a page from the shared browser pool."""
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
-            # Navigate and wait for the page to settle
-            await page.goto(url)
+        async with get_browser_pool().page() as page:
+            # Navigate; images, fonts and trackers are blocked by the pool's lean mode.
+            # worldsoccertalk.com has no schedule feed, so the rendered DOM is still scraped.
+            with phase('fetch.goto'):
+                await page.goto(url, wait_until='domcontentloaded')
 
             # Wait for the specific H4 element that contains the game title to appear
             # This ensures the JavaScript has run and loaded the schedule data
-            await page.wait_for_selector('h4.text-stvsMatchTitle', timeout=20000) 
+            with phase('fetch.wait_for_selector'):
+                await page.wait_for_selector('h4.text-stvsMatchTitle', timeout=20000)
 
-            html_content = await page.content()
-            await browser.close()
+            with phase('fetch.content'):
+                html_content = await page.content()
+            count('bytes_fetched', len(html_content.encode('utf-8')))
             logger.info(f"Successfully fetched and rendered EPL schedule from {url}")
             return html_content
     except Exception as e:
         logger.error(f"Playwright failed to load or find EPL schedule content: {e}")
+        count('errors')
         return None
 
 def normalize_team_name(name: str) -> str:
-    """Standardize common team name variations."""
-    name = name.strip()
-    replacements = {
-        'Spurs': 'Tottenham Hotspur', 'Man Utd': 'Manchester United', 'Man United': 'Manchester United',
-        'Man City': 'Manchester City', 'Chelsea FC': 'Chelsea', 'Liverpool FC': 'Liverpool',
-        'Arsenal FC': 'Arsenal', 'Brighton & Hove Albion': 'Brighton', 'Newcastle Utd': 'Newcastle United',
-        'Wolves': 'Wolverhampton Wanderers', 'West Ham Utd': 'West Ham United', 'Crystal Palace FC': 'Crystal Palace',
-        'AFC Bournemouth': 'Bournemouth', 'Nottingham Forest FC': 'Nottingham Forest',
-    }
-    # Remove common suffixes first
-    name = re.sub(r'\s*(AFC|FC|United|City|Town)\b', '', name, flags=re.IGNORECASE).strip()
-    return replacements.get(name, name)
+    """Standardize common team name variations (see team_registry for the alias table)."""
+    return canonical_team_name('EPL', name)
+
+
+# Filter out known streaming services that aren't the primary network
+FILTERED_PROVIDERS = {'DirecTV Stream', 'Sling', 'fubo', 'YouTube TV', 'Hulu', 'Paramount+'}
+
+# Extract teams using regex: "Team A vs. Team B (..."
+_MATCHUP_RE = re.compile(r'(.+?)\s+vs?\.?\s+(.+?)\s+\(', re.IGNORECASE)
+_DATE_KEY_RE = re.compile(r'\W+')
+
+# --- Precompiled selectors for the lxml engine (mirror the BeautifulSoup lookups below) ---
+if html_select.HAS_LXML:
+    _X_DATE_HEADERS = html_select.compile_xpath(f"//h3[{html_select.has_class('text-stvsDate')}]")
+    _X_NEXT_UL = html_select.compile_xpath("following-sibling::ul[1]")
+    _X_ITEMS = html_select.compile_xpath("li")
+    _X_TIME = html_select.compile_xpath(f"(.//span[{html_select.has_class('text-stvsMatchHour')}])[1]")
+    _X_TITLE = html_select.compile_xpath(f"(.//h4[{html_select.has_class('text-stvsMatchTitle')}])[1]")
+    # BeautifulSoup matches a multi-class string against the whole (whitespace-normalized) attribute
+    _X_BROADCAST_CONTAINER = html_select.compile_xpath(
+        "(.//div[normalize-space(@class)='flex flex-wrap gap-[3px_5px]'])[1]"
+    )
+    _X_PROVIDER_DIVS = html_select.compile_xpath(f".//div[{html_select.has_class('text-stvsProviderLink')}]")
+    _X_LINKS = html_select.compile_xpath(".//a")
+
+
+def _first(xpath, element):
+    found = xpath(element)
+    return found[0] if found else None
+
+
+def epl_game_id(raw_date: str, away_team: str, home_team: str) -> str:
+    """Unique game ID from the date header and the teams' registry codes."""
+    date_key = _DATE_KEY_RE.sub('', raw_date.lower())
+    return f"EPL_{team_code('EPL', away_team)}_vs_{team_code('EPL', home_team)}_{date_key}"
 
 
-def parse_epl_schedule(html_content: str | None):
+def stored_game_identity(doc: dict) -> tuple | None:
+    """(game ID, team fields) the scraper builds today for a stored game."""
+    if not doc.get('date_str') or not doc.get('away_team') or not doc.get('home_team'):
+        return None
+    away_team = normalize_team_name(doc['away_team'])
+    home_team = normalize_team_name(doc['home_team'])
+    fields = {'away_team': away_team, 'home_team': home_team, 'matchup': f"{away_team} vs {home_team}"}
+    return epl_game_id(doc['date_str'], away_team, home_team), fields
+
+
+def _build_epl_game(raw_date: str, time_str: str, title_text: str, broadcasts: list) -> dict | None:
     """
-    Parse the World Soccer Talk EPL TV schedule page using Playwright's rendered HTML.
-    Uses the stable selectors confirmed from the user's HTML snippet.
+    Turns the raw strings pulled from one <li> into a game dict: the time, the match title and
+    the text of every provider link. Shared by both parser engines, which only differ in how
+    they find the nodes.
     """
-    if not html_content:
-        logger.warning("No HTML content provided to parser.")
+    match = _MATCHUP_RE.search(title_text)
+    if not match:
+        logger.debug(f"Could not parse matchup from: {title_text}")
+        return None
+
+    away_team = normalize_team_name(match.group(1))
+    home_team = normalize_team_name(match.group(2))
+
+    # --- Cleaning and Deduplication ---
+    # The same provider is often linked more than once, hence the set below
+    national_broadcasts = []
+    for b in broadcasts:
+        if b and b not in FILTERED_PROVIDERS:
+            provider_name = b.replace('Online', '').replace('streaming', '').strip()
+            if provider_name:
+                national_broadcasts.append(provider_name)
+
+    national_broadcasts = sorted(set(national_broadcasts))
+
+    return {
+        'game_id': epl_game_id(raw_date, away_team, home_team),
+        'sport': 'EPL',
+        'league': 'Premier League',
+        'date_str': raw_date,
+        'time_str_et': time_str,
+        'away_team': away_team,
+        'home_team': home_team,
+        'matchup': f"{away_team} vs {home_team}",
+        'national_broadcasts': national_broadcasts,
+        'regional_broadcast_placeholder': '',
+        'regional_map': {},
+        'is_validated': False,
+        'last_updated': datetime.now(timezone.utc).isoformat()
+    }
+
+
+def _parse_epl_schedule_lxml(root) -> list:
+    """lxml engine for parse_epl_schedule: finds the nodes, _build_epl_game does the rest."""
+    stripped_text = html_select.stripped_text
+    games_data = []
+
+    date_headers = _X_DATE_HEADERS(root)
+    if not date_headers:
+        logger.warning("No date headers found (class='text-stvsDate'). Check page structure.")
         return []
 
+    for date_header in date_headers:
+        raw_date = stripped_text(date_header)
+        if not raw_date:
+            continue
+
+        game_list = _first(_X_NEXT_UL, date_header)
+        if game_list is None:
+            logger.debug(f"No game list found after date: {raw_date}")
+            continue
+
+        for item in _X_ITEMS(game_list):
+            try:
+                time_elem = _first(_X_TIME, item)
+                time_str = stripped_text(time_elem) if time_elem is not None else "TBD"
+
+                title_elem = _first(_X_TITLE, item)
+                if title_elem is None:
+                    continue
+
+                broadcasts = []
+                broadcast_container = _first(_X_BROADCAST_CONTAINER, item)
+                if broadcast_container is not None:
+                    broadcasts = [stripped_text(link) for provider_div in _X_PROVIDER_DIVS(broadcast_container)
+                                  for link in _X_LINKS(provider_div)]
+
+                game = _build_epl_game(raw_date, time_str, stripped_text(title_elem), broadcasts)
+                if game:
+                    games_data.append(game)
+
+            except Exception as e:
+                logger.error(f"Error parsing game item: {e}")
+                count('errors')
+                continue
+
+    return games_data
+
+
+def _parse_epl_schedule_soup(html_content: str) -> list:
+    """BeautifulSoup engine for parse_epl_schedule."""
+    from bs4 import BeautifulSoup  # fallback engine only; lxml deployments never load bs4
     soup = BeautifulSoup(html_content, 'html.parser')
     games_data = []
 
@@ -95,119 +214,72 @@ def parse_epl_schedule(html_content: str | None):
                 title_elem = item.find('h4', class_='text-stvsMatchTitle')
                 if not title_elem:
                     continue
-                title_text = title_elem.get_text(strip=True)
-
-                # Extract teams using regex: "Team A vs. Team B (..."
-                match = re.search(r'(.+?)\s+vs?\.?\s+(.+?)\s+\(', title_text, re.IGNORECASE)
-                if not match:
-                    logger.debug(f"Could not parse matchup from: {title_text}")
-                    continue
-
-                away_team = normalize_team_name(match.group(1))
-                home_team = normalize_team_name(match.group(2))
 
-                # --- Broadcasters (Robust Logic using <a> tags) ---
+                # --- Broadcasters: the text of every provider link ---
                 broadcasts = []
                 # Find the container for provider links (using the known fragile class as a starting point)
-                broadcast_container = item.find('div', class_='flex flex-wrap gap-[3px_5px]') 
-                
+                broadcast_container = item.find('div', class_='flex flex-wrap gap-[3px_5px]')
                 if broadcast_container:
-                    # Target the specific inner container for provider text
-                    for provider_div in broadcast_container.find_all('div', class_='text-stvsProviderLink'):
-                        unique_providers = set()
-                        # Scrape the text from all <a> tags inside, handling duplicates
-                        for link in provider_div.find_all('a'):
-                            provider_name = link.get_text(strip=True)
-                            if provider_name:
-                                unique_providers.add(provider_name)
-                        
-                        broadcasts.extend(list(unique_providers))
-                
-                # --- Cleaning and Deduplication ---
-                national_broadcasts = []
-                # Filter out known streaming services that aren't the primary network
-                FILTERED_PROVIDERS = {'DirecTV Stream', 'Sling', 'fubo', 'YouTube TV', 'Hulu', 'Paramount+'}
-                
-                for b in broadcasts:
-                    if b not in FILTERED_PROVIDERS:
-                        provider_name = b.replace('Online', '').replace('streaming', '').strip()
-                        if provider_name:
-                            national_broadcasts.append(provider_name)
-
-                national_broadcasts = sorted(set(national_broadcasts))
-                
-                # --- Generate unique game ID ---
-                date_key = re.sub(r'\W+', '', raw_date.lower())
-                game_id = f"EPL_{away_team.replace(' ', '')}_vs_{home_team.replace(' ', '')}_{date_key}"
-
-                games_data.append({
-                    'game_id': game_id,
-                    'sport': 'EPL',
-                    'league': 'Premier League',
-                    'date_str': raw_date,
-                    'time_str_et': time_str,
-                    'away_team': away_team,
-                    'home_team': home_team,
-                    'matchup': f"{away_team} vs {home_team}",
-                    'national_broadcasts': national_broadcasts,
-                    'regional_broadcast_placeholder': '',
-                    'regional_map': {},
-                    'is_validated': False,
-                    'last_updated': datetime.now(timezone.utc).isoformat()
-                })
+                    broadcasts = [link.get_text(strip=True)
+                                  for provider_div in broadcast_container.find_all('div', class_='text-stvsProviderLink')
+                                  for link in provider_div.find_all('a')]
+
+                game = _build_epl_game(raw_date, time_str, title_elem.get_text(strip=True), broadcasts)
+                if game:
+                    games_data.append(game)
 
             except Exception as e:
                 logger.error(f"Error parsing game item: {e}")
+                count('errors')
                 continue
 
+    return games_data
+
+
+def parse_epl_schedule(html_content: str | None, engine: str | None = None):
+    """
+    Parse the World Soccer Talk EPL TV schedule page using Playwright's rendered HTML.
+    Uses the stable selectors confirmed from the user's HTML snippet.
+    Uses the lxml engine when available, otherwise BeautifulSoup; engine='lxml' or 'soup'
+    picks one explicitly (e.g. to compare their output).
+    """
+    if not html_content:
+        logger.warning("No HTML content provided to parser.")
+        return []
+
+    games_data = None
+    if engine == 'lxml' or (engine is None and html_select.use_lxml()):
+        root = html_select.parse_document(html_content)
+        if root is not None:
+            games_data = _parse_epl_schedule_lxml(root)
+    if games_data is None:
+        games_data = _parse_epl_schedule_soup(html_content)
+
     logger.info(f"Successfully parsed {len(games_data)} EPL games.")
     return games_data
 
 
+# Plug-in description used by run_scrape's orchestrator and by main_async below
+SCRAPER = LeagueScraper(
+    name='EPL',
+    url=EPL_SCHEDULE_URL,
+    fetch=fetch_schedule_page,
+    parse=parse_epl_schedule,
+    collection='epl_schedules',
+    key='game_id',
+    section_pattern=re.compile(r'<h3\b[^>]*\bclass="[^"]*\btext-stvsDate\b'),
+)
+
+
 async def main_async():
     """Asynchronous main function to run the scraper logic."""
     logger.info("=== Starting EPL Schedule Scraper ===")
-
-    # Connect to MongoDB
-    client = get_mongo_client()
-    # FIX: Use 'is None' check
-    if client is None: 
-        logger.error("Could not connect to MongoDB. Exiting.")
-        return
-
-    db = client['watchwherelive_db'] 
-    collection = db['schedules'] 
-
-    # Fetch page using the async function
-    html = await fetch_schedule_page(EPL_SCHEDULE_URL)
-    if not html:
-        logger.error("Failed to retrieve schedule page. Aborting.")
-        return
-
-    # Parse games (This part remains synchronous)
-    games = parse_epl_schedule(html)
-
-    if not games:
-        logger.warning("No games parsed. Aborting MongoDB update.")
-        return
-
-    # Upsert into MongoDB
-    upserted_count = 0
-    for game in games:
-        result = collection.update_one(
-            {'game_id': game['game_id']},
-            {'$set': game},
-            upsert=True
-        )
-        if result.upserted_id or result.modified_count:
-            upserted_count += 1
-
-    logger.info(f"Successfully upserted {upserted_count}/{len(games)} EPL games into MongoDB.")
-    logger.info("=== EPL Scraper Completed ===\n")
+    summary = await run_league(SCRAPER)
+    logger.info(f"=== EPL Scraper Completed: {summary} ===\n")
 
 def main():
     """Synchronous entry point."""
-    asyncio.run(main_async())
+    asyncio.run(run_with_browser_pool(main_async()))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+# src/scraper/html_select.py
+# Fast HTML selection helpers for the schedule parsers.
+# lxml is optional: when it is installed the parsers use precompiled XPath over an lxml tree,
+# otherwise they fall back to BeautifulSoup. Helpers here reproduce BeautifulSoup's text
+# semantics exactly so both engines produce identical game dicts.
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:  # pragma: no cover - depends on the deployment
+    HAS_LXML = False
+
+# 'auto' uses lxml when available; 'soup' forces the BeautifulSoup path (e.g. to compare output).
+PARSER_ENGINE = os.getenv("SCRAPER_PARSER_ENGINE", "auto").lower()
+
+# BeautifulSoup's .text / get_text() ignore strings inside these tags.
+_SKIPPED_TEXT_TAGS = frozenset({'script', 'style', 'template', 'rt', 'rp'})
+
+
+def use_lxml() -> bool:
+    return HAS_LXML and PARSER_ENGINE != 'soup'
+
+
+def has_class(cls: str) -> str:
+    """XPath predicate equivalent to BeautifulSoup's class_='cls' for a single class name."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+def compile_xpath(expression: str):
+    """Precompiles an XPath expression once at import time."""
+    return etree.XPath(expression)
+
+
+def parse_document(html: str):
+    """Parses HTML with lxml. Returns None if lxml cannot handle the input."""
+    try:
+        return lxml.html.fromstring(html)
+    except (ValueError, etree.ParserError) as e:
+        logger.debug(f"lxml could not parse document, falling back to BeautifulSoup: {e}")
+        return None
+
+
+def _strings(element):
+    """Yields text nodes under `element` in document order, as BeautifulSoup sees them."""
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in _SKIPPED_TEXT_TAGS:
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def text(element) -> str:
+    """Equivalent of BeautifulSoup's tag.text."""
+    return ''.join(_strings(element))
+
+
+def bs4_string(element):
+    """Equivalent of BeautifulSoup's tag.string: the single text child, looked up recursively."""
+    if len(element) == 0:
+        return element.text
+    if len(element) == 1 and not element.text and not element[0].tail and isinstance(element[0].tag, str):
+        return bs4_string(element[0])
+    return None
+
+
+def stripped_text(element) -> str:
+    """Equivalent of BeautifulSoup's tag.get_text(strip=True)."""
+    return ''.join(s.strip() for s in _strings(element) if s.strip())
@@ -0,0 +1,142 @@
+# src/scraper/nba_crawl.py
+# Season backfill for the NBA schedule.
+# nba.com/schedule only renders a window around today, so the crawl lists one URL per week
+# (or month) of the requested range and fetches them concurrently across a bounded pool of
+# browser tabs. The pages go through the same pipeline as a regular scrape (scrape_pipeline):
+# parsed in worker processes, deduplicated by _id across overlapping pages, and written in
+# batches as they arrive.
+# If the schedule feed (scheduleLeagueV2) is captured first, it already holds the whole
+# season and no page crawl is needed.
+#
+# Usage: python -m src.scraper.nba_crawl --season 2025-26 [--step week|month] [--tabs 6]
+#        python -m src.scraper.nba_crawl --start 2025-12-01 --end 2026-01-31 --no-feed
+
+import argparse
+import asyncio
+import logging
+import os
+from datetime import date, timedelta
+
+from .base_scraper import LeagueScraper
+from .browser_pool import get_browser_pool, run_with_browser_pool
+from .nba_scraper import NBA_SCHEDULE_URL, SCRAPER, fetch_schedule_page, parse_nba_content
+from .run_scrape import retrying_fetch
+from .scrape_pipeline import run_pipeline
+from .scraper_config import get_mongo_client
+
+logger = logging.getLogger(__name__)
+
+# {date} is the first day of the week/month (YYYY-MM-DD). Override if nba.com changes its URLs.
+CRAWL_URL_TEMPLATE = os.getenv("NBA_CRAWL_URL_TEMPLATE", NBA_SCHEDULE_URL + "?cal=all&pd=false&region=1&date={date}")
+CRAWL_TABS = int(os.getenv("NBA_CRAWL_TABS", "6"))
+STEPS = ('week', 'month')
+
+
+def season_bounds(season: str) -> tuple:
+    """'2025-26' -> (2025-10-01, 2026-06-30): preseason through the Finals."""
+    try:
+        first_year = int(season.split('-')[0])
+    except ValueError:
+        raise ValueError(f"Season must look like 2025-26, got {season!r}")
+    return date(first_year, 10, 1), date(first_year + 1, 6, 30)
+
+
+def crawl_urls(start: date, end: date, step: str = 'week', template: str = CRAWL_URL_TEMPLATE) -> list:
+    """One URL per week (weeks start on Monday) or per calendar month overlapping [start, end]."""
+    if step not in STEPS:
+        raise ValueError(f"step must be one of {', '.join(STEPS)}")
+    if step == 'week':
+        day = start - timedelta(days=start.weekday())
+    else:
+        day = start.replace(day=1)
+
+    urls = []
+    while day <= end:
+        urls.append(template.format(date=day.isoformat()))
+        if step == 'week':
+            day += timedelta(days=7)
+        else:
+            day = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return urls
+
+
+async def fetch_crawl_page(url: str) -> str | None:
+    # The feed is the same on every page, so crawl pages go straight to the rendered DOM
+    return await fetch_schedule_page(url, use_feed=False)
+
+
+# Same league and collection as nba_scraper.SCRAPER, fetching DOM pages only
+CRAWL_SCRAPER = LeagueScraper(
+    name='NBA',
+    url=NBA_SCHEDULE_URL,
+    fetch=fetch_crawl_page,
+    parse=parse_nba_content,
+    collection=SCRAPER.collection,
+    key=SCRAPER.key,
+    section_pattern=SCRAPER.section_pattern,
+)
+
+
+async def crawl(start: date, end: date, db, step: str = 'week', tabs: int = CRAWL_TABS, use_feed: bool = True) -> dict:
+    """Backfills [start, end] into the schedules collection. Returns the pipeline's league summary."""
+    urls = crawl_urls(start, end, step)
+    get_browser_pool(tabs)  # creates the shared pool with enough tabs, or grows an existing one
+    prefetched = {}
+
+    if use_feed:
+        content = await fetch_schedule_page(NBA_SCHEDULE_URL, use_feed=True)
+        if isinstance(content, dict):
+            logger.info("Captured the season schedule feed; no page crawl needed.")
+            urls, prefetched = [NBA_SCHEDULE_URL], {NBA_SCHEDULE_URL: content}
+
+    logger.info(f"Crawling {len(urls)} NBA schedule pages with {tabs} tabs.")
+    attempts = []
+    fetch = retrying_fetch(CRAWL_SCRAPER, {CRAWL_SCRAPER.host: asyncio.Semaphore(tabs)}, attempts)
+
+    async def fetch_page(url: str):
+        if url in prefetched:
+            return prefetched.pop(url)
+        return await fetch(url)
+
+    [summary] = await run_pipeline([CRAWL_SCRAPER], db, lambda scraper: fetch_page, urls={'NBA': urls})
+    summary['pages'] = len(urls)
+    summary['attempts'] = len(attempts)
+    return summary
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Backfill the NBA schedule for a season or date range.")
+    parser.add_argument('--season', help="e.g. 2025-26 (October through June)")
+    parser.add_argument('--start', type=date.fromisoformat, help="First day, YYYY-MM-DD")
+    parser.add_argument('--end', type=date.fromisoformat, help="Last day, YYYY-MM-DD")
+    parser.add_argument('--step', choices=STEPS, default='week', help="One page per week or per month")
+    parser.add_argument('--tabs', type=int, default=CRAWL_TABS, help="Browser tabs fetching in parallel")
+    parser.add_argument('--no-feed', action='store_true', help="Crawl the rendered pages even if the feed is available")
+    args = parser.parse_args(argv)
+
+    if args.season:
+        start, end = season_bounds(args.season)
+        start, end = args.start or start, args.end or end
+    elif args.start and args.end:
+        start, end = args.start, args.end
+    else:
+        parser.error("Give --season or both --start and --end")
+    if end < start:
+        parser.error("--end must not be before --start")
+
+    db = get_mongo_client()
+    if db is None:
+        logger.error("Could not connect to MongoDB. Exiting.")
+        return 1
+
+    summary = asyncio.run(run_with_browser_pool(
+        crawl(start, end, db, step=args.step, tabs=args.tabs, use_feed=not args.no_feed)
+    ))
+    details = {k: v for k, v in summary.items() if k != 'metrics'}
+    logger.info(f"NBA crawl finished: {details}")
+    return 0 if summary['status'] in ('ok', 'unchanged') else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
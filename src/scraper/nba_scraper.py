@@ -1,12 +1,16 @@
 # src/scraper/nba_scraper.py
 # IMPORTANT: Requires Playwright to be installed and browsers downloaded.
 
-import requests
-from bs4 import BeautifulSoup
-from .scraper_config import get_mongo_client
+from . import html_select
+from .base_scraper import LeagueScraper, run_league
 import asyncio
-from playwright.async_api import async_playwright
+import re
+from .browser_pool import capture_json_response, get_browser_pool, run_with_browser_pool
+from .scrape_metrics import count, phase
+from .team_registry import canonical_team_name, team_code
 import logging
+import os
+from datetime import datetime
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,45 +19,252 @@ logger = logging.getLogger(__name__)
 # Target URL for NBA Schedule
 NBA_SCHEDULE_URL = "https://www.nba.com/schedule"
 
-async def fetch_schedule_page(url: str) -> str | None:
-    """Fetches the fully rendered HTML content using Playwright."""
+# nba.com/schedule renders from this static JSON feed. When it is captured during page load
+# we parse it directly and skip waiting for / scraping the rendered DOM.
+NBA_SCHEDULE_FEED_PATTERN = re.compile(r'/staticData/scheduleLeagueV2[^/]*\.json')
+USE_SCHEDULE_FEED = os.getenv("NBA_USE_SCHEDULE_FEED", "1") != "0"
+FEED_TIMEOUT = 15  # seconds to wait for the feed before falling back to the DOM
+
+async def fetch_schedule_page(url: str, use_feed: bool = USE_SCHEDULE_FEED) -> str | dict | None:
+    """
+    Fetches the schedule using a page from the shared browser pool.
+    Returns the captured JSON feed (dict) when available, otherwise the rendered HTML.
+    """
     try:
-        async with async_playwright() as p:
-            # Launch a headless Chromium browser
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+        async with get_browser_pool().page() as page:
+            async with capture_json_response(page, NBA_SCHEDULE_FEED_PATTERN) as feed:
+                # Navigate to the URL; the DOM wait below replaces waiting for the full load event
+                with phase('fetch.goto'):
+                    await page.goto(url, wait_until='domcontentloaded')
 
-            # Navigate to the URL
-            await page.goto(url)
+                if use_feed:
+                    try:
+                        with phase('fetch.feed_wait'):
+                            feed_data = await asyncio.wait_for(asyncio.shield(feed), timeout=FEED_TIMEOUT)
+                        logger.info(f"Captured NBA schedule feed while loading {url}")
+                        return feed_data
+                    except asyncio.TimeoutError:
+                        logger.warning("NBA schedule feed not seen. Falling back to the rendered DOM.")
 
             # Wait for a key schedule element to ensure the page is fully rendered
             # 'ScheduleDay_sd__GFE_w' is the class from your parser logic
-            await page.wait_for_selector('div.ScheduleDay_sd__GFE_w', timeout=30000) 
+            with phase('fetch.wait_for_selector'):
+                await page.wait_for_selector('div.ScheduleDay_sd__GFE_w', timeout=30000)
 
             # Get the full, rendered HTML content
-            html_content = await page.content()
+            with phase('fetch.content'):
+                html_content = await page.content()
+            count('bytes_fetched', len(html_content.encode('utf-8')))
 
-            await browser.close()
             logger.info(f"Successfully fetched and rendered schedule from {url}")
             return html_content
     except Exception as e:
         logger.error(f"Playwright failed to load or find NBA schedule content: {e}")
+        count('errors')
         return None
 
-def parse_nba_schedule(html_content):
+
+def _broadcaster_names(entries) -> list:
+    names = []
+    for entry in entries or []:
+        name = (entry.get('broadcasterDisplay') or '').strip()
+        if name and name not in names and name != "LEAGUE PASS":
+            names.append(name)
+    return names
+
+
+def identify_game(date_key: str, away_team: str, home_team: str) -> tuple:
+    """Canonical team names and the game ID built from their stable registry codes."""
+    away_team = canonical_team_name('NBA', away_team)
+    home_team = canonical_team_name('NBA', home_team)
+    return away_team, home_team, f"{date_key}_{team_code('NBA', away_team)}_{team_code('NBA', home_team)}"
+
+
+def stored_game_identity(doc: dict) -> tuple | None:
+    """(game ID, team fields) the scraper builds today for a stored game; None for TBD games."""
+    if not doc.get('date_str') or 'TBD' in (doc.get('away_team'), doc.get('home_team')):
+        return None
+    away_team, home_team, game_id = identify_game(doc['date_str'].replace(',','').replace(' ', ''),
+                                                  doc['away_team'], doc['home_team'])
+    return game_id, {'away_team': away_team, 'home_team': home_team}
+
+
+def parse_nba_feed(feed: dict) -> list:
     """
-    Parses the NBA.com HTML content to extract core schedule data.
-    The selectors here rely on the dynamic content loaded by Playwright.
+    Parses the scheduleLeagueV2 JSON feed into the same game dicts as parse_nba_schedule.
+    Games whose teams are not decided yet are skipped, as on the HTML path.
     """
-    if not html_content:
+    games_data = []
+    game_dates = (feed or {}).get('leagueSchedule', {}).get('gameDates', [])
+
+    for game_date in game_dates:
+        for game in game_date.get('games', []):
+            away_team = (game.get('awayTeam') or {}).get('teamName', '').strip()
+            home_team = (game.get('homeTeam') or {}).get('teamName', '').strip()
+            if not away_team or not home_team:
+                continue
+
+            try:
+                game_day = datetime.strptime(game['gameDateEst'][:10], '%Y-%m-%d')
+            except (KeyError, ValueError):
+                logger.debug(f"Skipping feed game without a usable date: {game.get('gameId')}")
+                continue
+            # Same format as the day headers on the HTML page, e.g. "Saturday, December 6"
+            date_str = f"{game_day:%A}, {game_day:%B} {game_day.day}"
+            away_team, home_team, game_id = identify_game(date_str.replace(',','').replace(' ', ''), away_team, home_team)
+
+            broadcasters = game.get('broadcasters') or {}
+            national = broadcasters.get('nationalTvBroadcasters') or broadcasters.get('nationalBroadcasters')
+            regional = _broadcaster_names(broadcasters.get('homeTvBroadcasters')) or \
+                _broadcaster_names(broadcasters.get('awayTvBroadcasters'))
+
+            games_data.append({
+                '_id': game_id,
+                'sport': 'NBA',
+                'date_str': date_str,
+                'time_status': (game.get('gameStatusText') or '').strip() or 'Final/TBD',
+                'away_team': away_team,
+                'home_team': home_team,
+                'national_broadcasts': _broadcaster_names(national),
+                'regional_broadcast_placeholder': regional[0] if regional else "",
+                'regional_map': {},
+                'is_validated': False
+            })
+
+    logger.info(f"Successfully parsed {len(games_data)} NBA games from the schedule feed.")
+    return games_data
+
+
+def parse_nba_content(content) -> list:
+    """Parses whatever fetch_schedule_page returned: the JSON feed or the rendered HTML."""
+    if isinstance(content, dict):
+        return parse_nba_feed(content)
+    return parse_nba_schedule(content)
+
+# --- Precompiled selectors for the lxml engine (mirror the BeautifulSoup lookups below) ---
+if html_select.HAS_LXML:
+    _X_DAYS = html_select.compile_xpath(f"//div[{html_select.has_class('ScheduleDay_sd__GFE_w')}]")
+    _X_DAY_HEADER = html_select.compile_xpath(f"(.//h4[{html_select.has_class('ScheduleDay_sdDay__3s2Xt')}])[1]")
+    _X_GAMES = html_select.compile_xpath(f".//div[{html_select.has_class('ScheduleGame_sg__RmD9I')}]")
+    _X_TEAM_LINKS = html_select.compile_xpath(f".//a[{html_select.has_class('Link_styled__okbXW')}]")
+    _X_LABEL = html_select.compile_xpath(f"(.//p[{html_select.has_class('ScheduleGame_sgLabel__wkprj')}])[1]")
+    _X_FIGURES = html_select.compile_xpath(f".//p[{html_select.has_class('ScheduleGame_sgFigtext__gYud6')}]")
+    _X_STATUS = html_select.compile_xpath(f"(.//span[{html_select.has_class('ScheduleStatusText_base__Jgvjb')}])[1]")
+    _X_BROADCASTERS = html_select.compile_xpath(f"(.//div[{html_select.has_class('Broadcasters_base__Wet1u')}])[1]")
+    _X_ICONS = html_select.compile_xpath(f".//img[{html_select.has_class('Broadcasters_icon__82MTV')}]")
+    _X_TITLES = html_select.compile_xpath(f".//p[{html_select.has_class('Broadcasters_title__B1dGd')}]")
+    _X_NEXT_P = html_select.compile_xpath("following-sibling::p[1]")
+    _X_REGIONAL = html_select.compile_xpath(
+        f"(.//*[self::a or self::span][{html_select.has_class('Broadcasters_tv__AIeZb')}])[1]"
+    )
+
+# Only the day containers are needed when falling back to BeautifulSoup.
+# Strainers see the raw class attribute string, so match the class as a whole word.
+_NBA_DAY_CLASS = re.compile(r'(?:^|\s)ScheduleDay_sd__GFE_w(?:\s|$)')
+
+
+def _first(xpath, element):
+    found = xpath(element)
+    return found[0] if found else None
+
+
+def _build_nba_game(date_str: str, team_names: list, cup_label: str | None, figures: list,
+                    time_status: str | None, icon_titles: list, regional_tv: str) -> dict | None:
+    """
+    Turns the raw strings pulled from one game block into a game dict. Shared by both parser
+    engines, which only differ in how they find the nodes. `cup_label` (None when the block has
+    no label) and `figures` are only read for blocks without two team links.
+    """
+    date_key = date_str.replace(',','').replace(' ', '')
+
+    if len(team_names) < 2:
+        # TBD games are skipped, except NBA Cup games, whose teams are listed as figures once known
+        if cup_label is None or "NBA Cup" not in cup_label:
+            return None
+        away_team, home_team = "TBD", "TBD"
+        game_id = f"{date_key}_TBD_Game"
+        if len(figures) >= 2:
+            home_team = figures[-1].strip().replace(':', '')
+            away_team = figures[-2].strip().replace(':', '')
+            away_team, home_team, game_id = identify_game(date_key, away_team, home_team)
+    else:
+        away_team, home_team, game_id = identify_game(date_key, team_names[0].strip(), team_names[1].strip())
+
+    # National logos (NBA TV, ESPN, etc.)
+    tier1_broadcasts = []
+    for title in icon_titles:
+        if title and title not in tier1_broadcasts and title != "LEAGUE PASS":
+            tier1_broadcasts.append(title)
+
+    return {
+        '_id': game_id,
+        'sport': 'NBA',
+        'date_str': date_str,
+        'time_status': time_status.strip() if time_status is not None else 'Final/TBD',
+        'away_team': away_team,
+        'home_team': home_team,
+        'national_broadcasts': tier1_broadcasts,
+        'regional_broadcast_placeholder': regional_tv.strip(),
+        'regional_map': {},
+        'is_validated': False
+    }
+
+
+def _parse_nba_schedule_lxml(root):
+    """lxml engine for parse_nba_schedule: finds the nodes, _build_nba_game does the rest."""
+    text = html_select.text
+    games_data = []
+
+    day_containers = _X_DAYS(root)
+    if not day_containers:
+        logger.warning("Could not find NBA schedule day containers (class='ScheduleDay_sd__GFE_w').")
         return []
 
-    soup = BeautifulSoup(html_content, 'html.parser')
+    for day_container in day_containers:
+        date_header = _first(_X_DAY_HEADER, day_container)
+        if date_header is None:
+            continue
+        date_str = text(date_header).strip()
+
+        for game_block in _X_GAMES(day_container):
+            team_names = [text(link) for link in _X_TEAM_LINKS(game_block)]
+            cup_label, figures = None, []
+            if len(team_names) < 2:
+                label = _first(_X_LABEL, game_block)
+                cup_label = text(label) if label is not None else None
+                figures = [text(figure) for figure in _X_FIGURES(game_block)]
+
+            status_span = _first(_X_STATUS, game_block)
+
+            broadcasters_div = _first(_X_BROADCASTERS, game_block)
+            icon_titles, regional_tv = [], ""
+            if broadcasters_div is not None:
+                icon_titles = [img.get('title') for img in _X_ICONS(broadcasters_div)]
+                tv_p = next((p for p in _X_TITLES(broadcasters_div) if html_select.bs4_string(p) == 'TV'), None)
+                if tv_p is not None:
+                    regional_link_container = _first(_X_NEXT_P, tv_p)
+                    if regional_link_container is not None:
+                        regional_elem = _first(_X_REGIONAL, regional_link_container)
+                        if regional_elem is not None:
+                            regional_tv = text(regional_elem)
+
+            game = _build_nba_game(date_str, team_names, cup_label, figures,
+                                   text(status_span) if status_span is not None else None, icon_titles, regional_tv)
+            if game:
+                games_data.append(game)
+
+    return games_data
+
+
+def _parse_nba_schedule_soup(html_content) -> list:
+    """BeautifulSoup engine for parse_nba_schedule, restricted to the day containers."""
+    from bs4 import BeautifulSoup, SoupStrainer  # fallback engine only; lxml deployments never load bs4
+    soup = BeautifulSoup(html_content, 'html.parser', parse_only=SoupStrainer('div', class_=_NBA_DAY_CLASS))
     games_data = []
 
     # 1. Find all Schedule Day containers
     day_containers = soup.find_all('div', class_='ScheduleDay_sd__GFE_w')
-    
+
     if not day_containers:
         logger.warning("Could not find NBA schedule day containers (class='ScheduleDay_sd__GFE_w').")
         return []
@@ -64,51 +275,26 @@ def parse_nba_schedule(html_content):
         if not date_header:
             continue
         date_str = date_header.text.strip()
-        
+
         # 2. Find all Game Containers within that day
-        game_blocks = day_container.find_all('div', class_='ScheduleGame_sg__RmD9I')
-        
-        for game_block in game_blocks:
-            # --- Extract Teams ---
-            team_links = game_block.find_all('a', class_='Link_styled__okbXW')
-            
-            if len(team_links) < 2:
-                # Handle TBD games (simplified handling)
-                away_team, home_team = "TBD", "TBD"
-                game_id = f"{date_str.replace(',','').replace(' ', '')}_TBD_Game"
-                
-                # Attempt to find teams in non-standard NBA Cup games
+        for game_block in day_container.find_all('div', class_='ScheduleGame_sg__RmD9I'):
+            # --- Teams (NBA Cup games without links list the teams as figures) ---
+            team_names = [link.text for link in game_block.find_all('a', class_='Link_styled__okbXW')]
+            cup_label, figures = None, []
+            if len(team_names) < 2:
                 label = game_block.find('p', class_='ScheduleGame_sgLabel__wkprj')
-                if label and "NBA Cup" in label.text:
-                    # Logic to find cup teams
-                    figures = game_block.find_all('p', class_='ScheduleGame_sgFigtext__gYud6')
-                    if len(figures) >= 2:
-                        home_team = figures[-1].text.strip().replace(':', '')
-                        away_team = figures[-2].text.strip().replace(':', '')
-                        game_id = f"{date_str.replace(',','').replace(' ', '')}_{away_team.replace(' ', '')}_{home_team.replace(' ', '')}"
-                elif away_team == "TBD":
-                    continue # Skip general TBD games
-            else:
-                away_team = team_links[0].text.strip()
-                home_team = team_links[1].text.strip()
-                game_id = f"{date_str.replace(',','').replace(' ', '')}_{away_team.replace(' ', '')}_{home_team.replace(' ', '')}"
-            
-            # --- Extract Time & Status ---
+                cup_label = label.text if label else None
+                figures = [figure.text for figure in game_block.find_all('p', class_='ScheduleGame_sgFigtext__gYud6')]
+
+            # --- Time & Status ---
             status_span = game_block.find('span', class_='ScheduleStatusText_base__Jgvjb')
-            time_status = status_span.text.strip() if status_span else 'Final/TBD'
-            
-            # --- Extract Broadcasts ---
+
+            # --- Broadcasts ---
             broadcasters_div = game_block.find('div', class_='Broadcasters_base__Wet1u')
-            tier1_broadcasts = []
-            regional_tv = ""
-            
+            icon_titles, regional_tv = [], ""
             if broadcasters_div:
-                # Extract National Logos (NBA TV, ESPN, etc.)
-                for img in broadcasters_div.find_all('img', class_='Broadcasters_icon__82MTV'):
-                    title = img.get('title')
-                    if title and title not in tier1_broadcasts and title != "LEAGUE PASS":
-                        tier1_broadcasts.append(title)
-                
+                icon_titles = [img.get('title') for img in broadcasters_div.find_all('img', class_='Broadcasters_icon__82MTV')]
+
                 # Extract Regional TV Text
                 tv_p = broadcasters_div.find('p', class_='Broadcasters_title__B1dGd', string='TV')
                 if tv_p:
@@ -116,58 +302,57 @@ def parse_nba_schedule(html_content):
                     if regional_link_container:
                         regional_elem = regional_link_container.find(['a', 'span'], class_='Broadcasters_tv__AIeZb')
                         if regional_elem:
-                            regional_tv = regional_elem.text.strip()
+                            regional_tv = regional_elem.text
+
+            game = _build_nba_game(date_str, team_names, cup_label, figures,
+                                   status_span.text if status_span else None, icon_titles, regional_tv)
+            if game:
+                games_data.append(game)
+
+    return games_data
 
-            games_data.append({
-                '_id': game_id,
-                'sport': 'NBA',
-                'date_str': date_str,
-                'time_status': time_status,
-                'away_team': away_team,
-                'home_team': home_team,
-                'national_broadcasts': tier1_broadcasts,
-                'regional_broadcast_placeholder': regional_tv,
-                'regional_map': {},
-                'is_validated': False
-            })
+
+def parse_nba_schedule(html_content, engine: str | None = None):
+    """
+    Parses the NBA.com HTML content to extract core schedule data.
+    The selectors here rely on the dynamic content loaded by Playwright.
+    Uses the lxml engine when available, otherwise BeautifulSoup restricted to the day containers;
+    engine='lxml' or 'soup' picks one explicitly (e.g. to compare their output).
+    """
+    if not html_content:
+        return []
+
+    games_data = None
+    if engine == 'lxml' or (engine is None and html_select.use_lxml()):
+        root = html_select.parse_document(html_content)
+        if root is not None:
+            games_data = _parse_nba_schedule_lxml(root)
+    if games_data is None:
+        games_data = _parse_nba_schedule_soup(html_content)
 
     logger.info(f"Successfully parsed {len(games_data)} NBA games.")
     return games_data
- 
+
+# Plug-in description used by run_scrape's orchestrator and by main_async below
+SCRAPER = LeagueScraper(
+    name='NBA',
+    url=NBA_SCHEDULE_URL,
+    fetch=fetch_schedule_page,
+    parse=parse_nba_content,
+    collection='schedules',
+    key='_id',
+    section_pattern=re.compile(r'<div\b[^>]*\bclass="[^"]*\bScheduleDay_sd__GFE_w\b'),
+)
+
 async def main_async():
     """Asynchronous main function to run the scraper logic."""
     logger.info("--- Starting NBA Tier 1 Scraper ---")
-    
-    db = get_mongo_client()
-    # FIX: Use 'is None' check
-    if db is None:
-        logger.error("Could not connect to MongoDB. Exiting.")
-        return
-        
-    html = await fetch_schedule_page(NBA_SCHEDULE_URL)
-    if not html:
-        logger.error("Failed to retrieve schedule page. Aborting.")
-        return
-
-    games = parse_nba_schedule(html)
-    
-    if games:
-        schedule_collection = db['schedules']
-        
-        # Insert or Update (Upsert) Logic
-        for game in games:
-            schedule_collection.update_one(
-                {'game_id': game['game_id']}, # Query to find existing game
-                {'$set': game},               # Data to set/update
-                upsert=True                   # Insert if not found
-            )
-        logger.info(f"Successfully processed {len(games)} NBA games in MongoDB.")
-    
-    logger.info("--- NBA Scraper Finished ---")
+    summary = await run_league(SCRAPER)
+    logger.info(f"--- NBA Scraper Finished: {summary} ---")
 
 def main():
     """Synchronous entry point."""
-    asyncio.run(main_async())
+    asyncio.run(run_with_browser_pool(main_async()))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
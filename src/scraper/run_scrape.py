@@ -1,101 +1,135 @@
-import requests
-from bs4 import BeautifulSoup
-from pymongo import MongoClient # For connecting to MongoDB
-
-# --- Configuration ---
-# IMPORTANT: Replace with your actual MongoDB connection string
-MONGO_URI = "mongodb+srv://<user>:<password>@<cluster>.mongodb.net/"
-DB_NAME = "watchwherelive_db"
-
-# Target URL for NBA Schedule (Example - may need adjustment)
-# We choose a page that renders the data in standard HTML
-NBA_SCHEDULE_URL = "https://www.basketball-reference.com/leagues/NBA_2026_games.html" 
-# Note: Use the current/next season year
-
-def get_mongo_client():
-    """Returns a MongoDB client connection."""
-    client = MongoClient(MONGO_URI)
-    return client[DB_NAME]
-
-def fetch_schedule_page(url):
-    """Fetches the HTML content from the target URL."""
+# src/scraper/run_scrape.py
+# Tier 1 scrape orchestrator: runs every registered league scraper concurrently.
+# Usage: python -m src.scraper.run_scrape [NBA EPL ...]
+
+import asyncio
+import logging
+import os
+import sys
+import time
+
+from ..api.static_export import EXPORT_ENABLED, export_static
+from ..db_indexes import ensure_indexes
+from .base_scraper import run_league
+from .browser_pool import run_with_browser_pool
+from .scrape_metrics import count
+from .scrape_pipeline import PIPELINE_ENABLED, run_pipeline
+from .scraper_config import get_mongo_client
+from . import epl_scraper, nba_scraper
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# --- Registry: new leagues only need to expose a LeagueScraper as SCRAPER ---
+SCRAPERS = [
+    nba_scraper.SCRAPER,
+    epl_scraper.SCRAPER,
+]
+
+# --- Orchestrator settings (overridable via environment) ---
+SOURCE_TIMEOUT = float(os.getenv("SCRAPE_SOURCE_TIMEOUT", "90"))   # seconds per fetch attempt
+MAX_RETRIES = int(os.getenv("SCRAPE_MAX_RETRIES", "2"))             # retries after the first attempt
+BACKOFF_BASE = float(os.getenv("SCRAPE_BACKOFF_BASE", "2"))         # seconds, doubled per retry
+PER_HOST_CONCURRENCY = int(os.getenv("SCRAPE_PER_HOST_CONCURRENCY", "1"))
+
+
+def retrying_fetch(scraper, host_limits: dict, attempts_log: list):
+    """Wraps scraper.fetch with the per-host limit, a per-attempt timeout and exponential backoff."""
+    limit = host_limits.setdefault(scraper.host, asyncio.Semaphore(PER_HOST_CONCURRENCY))
+
+    async def fetch(url: str) -> str | None:
+        for attempt in range(MAX_RETRIES + 1):
+            attempts_log.append(attempt + 1)
+            try:
+                async with limit:
+                    html = await asyncio.wait_for(scraper.fetch(url), timeout=SOURCE_TIMEOUT)
+                if html:
+                    return html
+                logger.warning(f"[{scraper.name}] Attempt {attempt + 1} returned no content.")
+            except asyncio.TimeoutError:
+                logger.warning(f"[{scraper.name}] Attempt {attempt + 1} timed out after {SOURCE_TIMEOUT}s.")
+                count('errors')
+            except Exception as e:
+                logger.warning(f"[{scraper.name}] Attempt {attempt + 1} failed: {e}")
+                count('errors')
+
+            if attempt < MAX_RETRIES:
+                await asyncio.sleep(BACKOFF_BASE * (2 ** attempt))
+        return None
+
+    return fetch
+
+
+async def _run_one(scraper, db, host_limits: dict) -> dict:
+    attempts = []
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
-        print(f"Successfully fetched {url}")
-        return response.text
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching page: {e}")
+        summary = await run_league(scraper, db=db, fetch=retrying_fetch(scraper, host_limits, attempts))
+    except Exception as e:
+        logger.error(f"[{scraper.name}] Scrape failed: {e}")
+        summary = {'league': scraper.name, 'status': 'failed', 'games': 0, 'error': str(e)}
+    summary['attempts'] = len(attempts)
+    return summary
+
+
+async def _run_pipelined(scrapers, db, host_limits: dict) -> list:
+    """All leagues through the staged fetch -> parse (worker processes) -> write pipeline."""
+    attempts = {scraper.name: [] for scraper in scrapers}
+    results = await run_pipeline(
+        scrapers, db, lambda scraper: retrying_fetch(scraper, host_limits, attempts[scraper.name])
+    )
+    for result in results:
+        result['attempts'] = len(attempts[result['league']])
+    return results
+
+
+async def run_all(scrapers=None) -> dict:
+    """Runs the given scrapers (default: all registered) concurrently and returns one run summary."""
+    scrapers = scrapers or SCRAPERS
+    started = time.perf_counter()
+    logger.info(f"--- Starting scrape run for {', '.join(s.name for s in scrapers)} ---")
+
+    db = get_mongo_client()
+    if db is not None:
+        # Idempotent: existing indexes are left as they are
+        try:
+            ensure_indexes(db)
+        except Exception as e:
+            logger.error(f"Index bootstrap failed: {e}")
+    host_limits = {}
+    if PIPELINE_ENABLED and db is not None:
+        results = await _run_pipelined(scrapers, db, host_limits)
+    else:
+        results = await asyncio.gather(*(_run_one(s, db, host_limits) for s in scrapers))
+
+    if db is not None and EXPORT_ENABLED and any(r['status'] in ('ok', 'unchanged') for r in results):
+        # Rewrites only the static files whose content changed (rule edits included)
+        try:
+            await asyncio.to_thread(export_static, db)
+        except Exception as e:
+            logger.error(f"Static schedule export failed: {e}")
+
+    summary = {
+        'seconds': round(time.perf_counter() - started, 3),
+        'ok': sum(1 for r in results if r['status'] == 'ok'),
+        'failed': sum(1 for r in results if r['status'] == 'failed'),
+        'leagues': results,
+    }
+    for result in results:
+        logger.info(f"  {result['league']}: {result}")
+    logger.info(f"--- Scrape run finished in {summary['seconds']}s "
+                f"({summary['ok']} ok, {summary['failed']} failed) ---")
+    return summary
+
+
+def main(argv=None):
+    """Synchronous entry point. Optional arguments restrict the run to the named leagues."""
+    names = {name.upper() for name in (argv if argv is not None else sys.argv[1:])}
+    scrapers = [s for s in SCRAPERS if not names or s.name in names]
+    if not scrapers:
+        logger.error(f"No registered scraper matches {sorted(names)}.")
         return None
+    return asyncio.run(run_with_browser_pool(run_all(scrapers)))
 
-def parse_nba_schedule(html_content):
-    """
-    Parses the HTML to extract core schedule data.
-    THIS IS THE PRIMARY CODE YOU WILL NEED TO CUSTOMIZE.
-    """
-    if not html_content:
-        return []
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # --- Custom Parsing Logic Starts Here ---
-    # We will look for the main table (often with an id like 'schedule')
-    schedule_table = soup.find('table', id='schedule') 
-    
-    if not schedule_table:
-        print("Could not find the schedule table. Check the target URL's HTML.")
-        return []
-
-    games_data = []
-    # Find all rows (tr) in the table body (tbody)
-    for row in schedule_table.find('tbody').find_all('tr'):
-        # Skip header/separator rows
-        if 'class' in row.attrs and 'thead' in row.attrs['class']:
-            continue
-            
-        cols = row.find_all(['td', 'th']) # Find all cells in the row
-        if len(cols) < 7: # Ensure we have enough columns for a game
-            continue
-            
-        # Example extraction based on common table structure:
-        game = {
-            'date_utc': cols[0].text.strip(),
-            'time_local': cols[1].text.strip(), # We'll standardize this later
-            'away_team': cols[2].text.strip(),
-            'home_team': cols[4].text.strip(),
-            'national_broadcasts': cols[6].text.strip() if len(cols) > 6 else 'N/A',
-            'sport': 'NBA',
-            # Set initial Layer 2 data placeholders:
-            'regional_broadcast_map': {},
-            'is_validated': False
-        }
-        games_data.append(game)
-
-    return games_data
-
-def main():
-    """Main function to run the scraper and insert data."""
-    print("--- Starting NBA Tier 1 Scraper ---")
-    
-    # 1. Fetch
-    html = fetch_schedule_page(NBA_SCHEDULE_URL)
-    
-    # 2. Parse
-    games = parse_nba_schedule(html)
-    print(f"Parsed {len(games)} games.")
-    
-    if games:
-        # 3. Load (To MongoDB)
-        # Note: We skip the actual MongoDB connection for now to test parsing first.
-        # db = get_mongo_client()
-        # schedule_collection = db['schedules']
-        # result = schedule_collection.insert_many(games)
-        
-        print(f"First 5 parsed games (pre-MongoDB):")
-        for game in games[:5]:
-            print(game)
-    
-    print("--- Scraper Finished ---")
 
 if __name__ == "__main__":
     main()
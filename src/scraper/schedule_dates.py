@@ -0,0 +1,141 @@
+# src/scraper/schedule_dates.py
+# Turns the free-text day headers and times the sources print ("Saturday, December 6",
+# "7:30 pm ET") into real dates and UTC datetimes.
+# The pages omit the year, so it is inferred: the candidate year whose weekday matches the
+# header and that lies closest to today wins. Times are US Eastern; zoneinfo applies EST/EDT.
+
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+EASTERN = ZoneInfo('America/New_York')
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [('jan', 'january'), ('feb', 'february'), ('mar', 'march'), ('apr', 'april'), ('may',),
+         ('jun', 'june'), ('jul', 'july'), ('aug', 'august'), ('sep', 'sept', 'september'),
+         ('oct', 'october'), ('nov', 'november'), ('dec', 'december')],
+        start=1,
+    )
+    for name in names
+}
+_WEEKDAYS = {
+    name: number
+    for number, names in enumerate(
+        [('mon', 'monday'), ('tue', 'tues', 'tuesday'), ('wed', 'wednesday'), ('thu', 'thur', 'thurs', 'thursday'),
+         ('fri', 'friday'), ('sat', 'saturday'), ('sun', 'sunday')]
+    )
+    for name in names
+}
+
+# "Saturday, December 6", "Sat Dec 6th, 2025" (US order) or "Saturday 6 December 2025" (UK order)
+_US_ORDER = re.compile(
+    r'^(?:(?P<weekday>[a-z]+)\.?,?\s+)?(?P<month>[a-z]+)\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(?P<year>\d{4}))?',
+    re.IGNORECASE,
+)
+_UK_ORDER = re.compile(
+    r'^(?:(?P<weekday>[a-z]+)\.?,?\s+)?(?P<day>\d{1,2})(?:st|nd|rd|th)?\s+(?P<month>[a-z]+)\.?(?:,?\s+(?P<year>\d{4}))?',
+    re.IGNORECASE,
+)
+
+
+# "7:30 pm ET", "7:30PMET", "10 a.m." or a bare 24h "19:30" (not a live game clock like "Q3 5:32")
+_TIME_12H = re.compile(r'(?<!\d)(\d{1,2})(?::(\d{2}))?\s*([ap])\.?\s*m\.?(?=[^a-z]|$|e[sd]?t)', re.IGNORECASE)
+_TIME_24H = re.compile(r'^\s*([01]?\d|2[0-3]):([0-5]\d)\s*(?:e[sd]?t)?\s*$', re.IGNORECASE)
+
+
+def today_eastern() -> date:
+    return datetime.now(EASTERN).date()
+
+
+def infer_game_date(date_str: str | None, today: date | None = None) -> date | None:
+    """Parses a schedule day header into a date, inferring the year. Returns None if unparseable."""
+    if not date_str:
+        return None
+    text = date_str.strip()
+    for pattern in (_US_ORDER, _UK_ORDER):
+        match = pattern.match(text)
+        month = _MONTHS.get(match.group('month').lower()) if match else None
+        if month:
+            break
+    else:
+        return None
+
+    day = int(match.group('day'))
+    weekday = _WEEKDAYS.get((match.group('weekday') or '').lower())
+
+    if match.group('year'):
+        try:
+            return date(int(match.group('year')), month, day)
+        except ValueError:
+            return None
+
+    today = today or today_eastern()
+    candidates = []
+    for year in (today.year - 1, today.year, today.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:  # e.g. February 29 in a non-leap year
+            continue
+    if weekday is not None:
+        candidates = [c for c in candidates if c.weekday() == weekday] or candidates
+    if not candidates:
+        return None
+    return min(candidates, key=lambda c: abs((c - today).days))
+
+
+def game_date_key(date_str: str | None, today: date | None = None) -> str | None:
+    """ISO 'YYYY-MM-DD' form of infer_game_date, stored on games as the sortable `game_date`."""
+    game_day = infer_game_date(date_str, today)
+    return game_day.isoformat() if game_day else None
+
+
+def parse_game_time(time_text: str | None) -> time | None:
+    """Eastern wall-clock time from a time/status string. None for TBD, Final, live scores etc."""
+    if not time_text:
+        return None
+    match = _TIME_12H.search(time_text)
+    if match:
+        hour, minute = int(match.group(1)), int(match.group(2) or 0)
+        if not 1 <= hour <= 12 or minute > 59:
+            return None
+        hour = hour % 12 + (12 if match.group(3).lower() == 'p' else 0)
+        return time(hour, minute)
+    match = _TIME_24H.match(time_text)
+    return time(int(match.group(1)), int(match.group(2))) if match else None
+
+
+def to_naive_utc(moment: datetime) -> datetime:
+    """BSON datetimes are naive UTC; pymongo reads them back the same way."""
+    return moment.astimezone(timezone.utc).replace(tzinfo=None) if moment.tzinfo else moment
+
+
+def eastern_day_bounds(start_day: date, end_day: date) -> tuple:
+    """Naive UTC [start, end) covering the Eastern calendar days start_day..end_day (DST-aware)."""
+    start = datetime.combine(start_day, time(0), tzinfo=EASTERN)
+    end = datetime.combine(end_day + timedelta(days=1), time(0), tzinfo=EASTERN)
+    return to_naive_utc(start), to_naive_utc(end)
+
+
+def schedule_fields(date_str: str | None, time_text: str | None, today: date | None = None) -> dict:
+    """
+    The normalized date/time fields stored on a game:
+      game_date  Eastern calendar day, 'YYYY-MM-DD'
+      start_utc  UTC datetime of the start; Eastern midnight of game_date when the time is unknown
+      date_utc / time_utc  'YYYY-MM-DD' / 'HH:MM:SS' of start_utc (time_utc None when unknown)
+      time_tbd   True when no start time could be parsed
+    Returns {} when the day itself cannot be parsed.
+    """
+    game_day = infer_game_date(date_str, today)
+    if game_day is None:
+        return {}
+    start_time = parse_game_time(time_text)
+    start_utc = to_naive_utc(datetime.combine(game_day, start_time or time(0), tzinfo=EASTERN))
+    return {
+        'game_date': game_day.isoformat(),
+        'start_utc': start_utc,
+        'date_utc': start_utc.date().isoformat(),
+        'time_utc': start_utc.strftime('%H:%M:%S') if start_time else None,
+        'time_tbd': start_time is None,
+    }
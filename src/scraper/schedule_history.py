@@ -0,0 +1,264 @@
+# src/scraper/schedule_history.py
+# Append-only history of the scraped fields of each game (e.g. a game moving from ESPN to TNT).
+# upsert_games overwrites fields in place; the write stage hands the field-level deltas it
+# computed to record_history. History lives in its own collection, grouped by game into
+# segments of up to SEGMENT_SIZE entries, stored as one zlib-compressed JSON blob:
+#
+#   {'game': 'schedules/<key>', 'collection', 'game_id', 'sport', 'seg': 0, 'open': True,
+#    'count', 'first_at', 'last_at', 'broadcast_at', 'data': <zlib(JSON list of entries)>}
+#
+# An entry is {'at', 'kind', 'set': {field: new value}, 'old': {field: previous value}}, kind:
+#   insert      first scrape of the game ('set' holds every field)
+#   update      fields that changed
+#   base        full state found when history began for a game that already existed
+#   checkpoint  full state at the start of each later segment
+# Every segment starts from a full state, so a game as of any time is rebuilt from a single
+# segment. broadcast_at (indexed) is the segment's latest broadcast change, so listing recent
+# broadcast changes only decompresses segments that have some.
+# Admin-owned fields (regional_map, is_validated) are not part of the history.
+#
+# Usage: python -m src.scraper.schedule_history [--hours 24] [--sport NBA]
+#        python -m src.scraper.schedule_history --game <key> [--collection schedules] [--at 2025-12-06T20:00:00Z]
+
+import argparse
+import json
+import logging
+import os
+import zlib
+from datetime import datetime, timedelta, timezone
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from .schedule_store import HASH_FIELD, INSERT_ONLY_FIELDS, VOLATILE_FIELDS
+
+logger = logging.getLogger(__name__)
+
+HISTORY_ENABLED = os.getenv("SCHEDULE_HISTORY", "1") != "0"
+SEGMENT_SIZE = int(os.getenv("SCHEDULE_HISTORY_SEGMENT_SIZE", "64"))
+HISTORY_COLLECTION = 'schedule_history'
+BROADCAST_FIELDS = ('national_broadcasts', 'regional_broadcast_placeholder')
+FULL_STATE_KINDS = ('insert', 'base', 'checkpoint')
+
+_UNTRACKED_FIELDS = {'_id', HASH_FIELD, *INSERT_ONLY_FIELDS, *VOLATILE_FIELDS}
+
+
+def _utcnow() -> datetime:
+    # Naive UTC, as stored in BSON
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def tracked_fields(doc: dict, key: str = 'game_id') -> dict:
+    return {k: v for k, v in doc.items() if k != key and k not in _UNTRACKED_FIELDS}
+
+
+# --- Encoding ---
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'$date': value.isoformat()}
+    raise TypeError(f"Cannot store {type(value).__name__} in the schedule history")
+
+
+def _decode_value(obj: dict):
+    if len(obj) == 1 and '$date' in obj:
+        return datetime.fromisoformat(obj['$date'])
+    return obj
+
+
+def _pack(entries: list) -> bytes:
+    data = json.dumps(entries, default=_encode_value, separators=(',', ':'), ensure_ascii=False)
+    return zlib.compress(data.encode('utf-8'), 6)
+
+
+def _unpack(data: bytes) -> list:
+    return json.loads(zlib.decompress(data), object_hook=_decode_value)
+
+
+def _replay(entries: list, until: datetime | None = None) -> dict | None:
+    """State after the entries up to `until`; None if the first full state is later."""
+    state = None
+    for entry in entries:
+        if until is not None and entry['at'] > until:
+            break
+        if entry['kind'] in FULL_STATE_KINDS:
+            state = dict(entry['set'])
+        elif state is not None:
+            state.update(entry['set'])
+    return state
+
+
+# --- Writing ---
+
+def _game_ref(collection_name: str, game_id) -> str:
+    return f"{collection_name}/{game_id}"
+
+
+def _segment_fields(entries: list) -> dict:
+    broadcast_times = [entry['at'] for entry in entries
+                       if entry['kind'] == 'update' and any(field in entry['set'] for field in BROADCAST_FIELDS)]
+    return {
+        'count': len(entries),
+        'first_at': entries[0]['at'],
+        'last_at': entries[-1]['at'],
+        'broadcast_at': max(broadcast_times) if broadcast_times else None,
+        'data': _pack(entries),
+    }
+
+
+def _new_segment(ref: str, collection_name: str, change: dict, seg: int, entries: list) -> dict:
+    return {
+        'game': ref, 'collection': collection_name, 'game_id': change['game_id'], 'sport': change.get('sport'),
+        'seg': seg, 'open': True, **_segment_fields(entries),
+    }
+
+
+def _entry(change: dict, at: datetime) -> dict:
+    before = change.get('before')
+    if before is None:
+        return {'at': at, 'kind': 'insert', 'set': change['set'], 'old': {}}
+    old = {field: before[field] for field in change['set'] if field in before}
+    return {'at': at, 'kind': 'update', 'set': change['set'], 'old': old}
+
+
+def record_history(db, collection_name: str, field_changes: list, key: str = 'game_id', at=None) -> int:
+    """
+    Appends the field changes of one write batch (upsert_games' 'field_changes') to each game's
+    open segment. Returns the number of entries written.
+    """
+    if not HISTORY_ENABLED or not field_changes:
+        return 0
+    at = at or _utcnow()
+    history = db[HISTORY_COLLECTION]
+    changes = {_game_ref(collection_name, change['game_id']): change for change in field_changes}
+    open_segments = {doc['game']: doc for doc in history.find({'game': {'$in': list(changes)}, 'open': True})}
+
+    operations, appended = [], 0
+    for ref, change in changes.items():
+        entry = _entry(change, at)
+        segment = open_segments.get(ref)
+        if segment is None:
+            entries = [entry]
+            if entry['kind'] == 'update':
+                # The game predates its history: keep the state it had until now
+                entries.insert(0, {'at': at, 'kind': 'base', 'set': tracked_fields(change['before'], key), 'old': {}})
+            operations.append(InsertOne(_new_segment(ref, collection_name, change, 0, entries)))
+        else:
+            entries = _unpack(segment['data'])
+            if len(entries) < SEGMENT_SIZE:
+                entries.append(entry)
+                # Guarded on count: an entry appended meanwhile by another writer is never overwritten
+                operations.append(UpdateOne({'_id': segment['_id'], 'count': segment['count']},
+                                            {'$set': _segment_fields(entries)}))
+            else:
+                checkpoint = {'at': segment['last_at'], 'kind': 'checkpoint', 'set': _replay(entries) or {}, 'old': {}}
+                operations.append(UpdateOne({'_id': segment['_id'], 'open': True}, {'$set': {'open': False}}))
+                operations.append(InsertOne(_new_segment(ref, collection_name, change, segment['seg'] + 1,
+                                                         [checkpoint, entry])))
+        appended += 1
+
+    try:
+        result = history.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        # Duplicate (game, seg): another writer opened the same segment first
+        logger.warning(f"{collection_name}: {len(e.details.get('writeErrors', []))} history writes conflicted and were skipped.")
+        return appended - len(e.details.get('writeErrors', []))
+    expected_updates = sum(isinstance(op, UpdateOne) for op in operations)
+    if result.matched_count < expected_updates:
+        logger.warning(f"{collection_name}: {expected_updates - result.matched_count} history segments changed "
+                       f"concurrently; those entries were skipped.")
+    return appended
+
+
+# --- Reading ---
+
+def game_as_of(db, collection_name: str, game_id, at: datetime | None = None) -> dict | None:
+    """
+    The game's scraped fields as they were at `at` (naive UTC; default: latest), or None if
+    the history does not reach back that far.
+    """
+    query = {'game': _game_ref(collection_name, game_id)}
+    if at is not None:
+        query['first_at'] = {'$lte': at}
+    segment = db[HISTORY_COLLECTION].find_one(query, sort=[('seg', -1)])
+    if segment is None:
+        return None
+    state = _replay(_unpack(segment['data']), at)
+    return {'game_id': game_id, **state} if state is not None else None
+
+
+def _field_changes(entry: dict, fields=None) -> dict:
+    return {
+        field: {'from': entry['old'].get(field), 'to': value}
+        for field, value in entry['set'].items() if fields is None or field in fields
+    }
+
+
+def game_changes(db, collection_name: str, game_id, since: datetime | None = None) -> list:
+    """Every insert/update of one game (oldest first) as {'at', 'kind', 'changes': {field: {'from', 'to'}}}."""
+    query = {'game': _game_ref(collection_name, game_id)}
+    if since is not None:
+        query['last_at'] = {'$gte': since}
+    changes = []
+    for segment in db[HISTORY_COLLECTION].find(query).sort('seg', 1):
+        for entry in _unpack(segment['data']):
+            if entry['kind'] == 'checkpoint' or (since is not None and entry['at'] < since):
+                continue
+            changes.append({'at': entry['at'], 'kind': entry['kind'], 'changes': _field_changes(entry)})
+    return changes
+
+
+def recent_broadcast_changes(db, since: datetime, sport: str | None = None, limit: int = 100) -> list:
+    """
+    Broadcast changes (national_broadcasts / regional_broadcast_placeholder) since `since`,
+    newest first: {'collection', 'game_id', 'sport', 'at', 'changes': {field: {'from', 'to'}}}.
+    """
+    query = {'broadcast_at': {'$gte': since}}
+    if sport:
+        query['sport'] = sport
+    changes = []
+    for segment in db[HISTORY_COLLECTION].find(query, {'data': 1, 'collection': 1, 'game_id': 1, 'sport': 1}):
+        for entry in _unpack(segment['data']):
+            if entry['kind'] != 'update' or entry['at'] < since:
+                continue
+            fields = _field_changes(entry, BROADCAST_FIELDS)
+            if fields:
+                changes.append({'collection': segment['collection'], 'game_id': segment['game_id'],
+                                'sport': segment.get('sport'), 'at': entry['at'], 'changes': fields})
+    changes.sort(key=lambda change: change['at'], reverse=True)
+    return changes[:limit]
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Show broadcast changes, or a game as of a point in time.")
+    parser.add_argument('--hours', type=float, default=24, help="Broadcast changes from the last N hours")
+    parser.add_argument('--sport', help="Only this sport (e.g. NBA)")
+    parser.add_argument('--game', help="Show one game instead: its key (_id for NBA, game_id for EPL)")
+    parser.add_argument('--collection', default='schedules', help="Collection of --game")
+    parser.add_argument('--at', help="Point in time for --game, ISO-8601 UTC (default: latest)")
+    args = parser.parse_args(argv)
+
+    from .scraper_config import get_mongo_client
+    db = get_mongo_client()
+    if db is None:
+        logger.error("Could not connect to MongoDB. Exiting.")
+        return 1
+
+    if args.game:
+        at = datetime.fromisoformat(args.at.replace('Z', '+00:00')).astimezone(timezone.utc).replace(tzinfo=None) \
+            if args.at else None
+        print(json.dumps({
+            'as_of': game_as_of(db, args.collection, args.game, at),
+            'changes': game_changes(db, args.collection, args.game),
+        }, indent=2, default=str))
+        return 0
+
+    since = _utcnow() - timedelta(hours=args.hours)
+    for change in recent_broadcast_changes(db, since, (args.sport or '').upper() or None):
+        fields = '; '.join(f"{field}: {value['from']} -> {value['to']}" for field, value in change['changes'].items())
+        print(f"{change['at']:%Y-%m-%d %H:%M} {change['sport'] or '':4} {change['game_id']}  {fields}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
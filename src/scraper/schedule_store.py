@@ -0,0 +1,279 @@
+# src/scraper/schedule_store.py
+# Change-aware persistence for parsed games.
+# Games are written with unordered bulk_write batches; unchanged documents are skipped
+# by comparing a content hash, and changed documents only $set the fields that differ.
+#
+# Backfill derived date/time fields: python -m src.scraper.schedule_store [--all]
+# Move games stored under pre-registry IDs to their current ID (once): add --rekey
+
+import argparse
+import hashlib
+import json
+import logging
+from pymongo import UpdateOne
+
+from .schedule_dates import schedule_fields
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 500
+
+# Fields the scraper seeds on first insert only. Afterwards they belong to the admin
+# workflow (Layer 2 validation), so a re-scrape must not reset them.
+INSERT_ONLY_FIELDS = ('regional_map', 'is_validated')
+
+# Fields that change on every parse without the game itself changing.
+VOLATILE_FIELDS = ('last_updated',)
+
+HASH_FIELD = 'content_hash'
+
+# Derived at ingest from the free-text date/time strings (see schedule_dates.schedule_fields).
+TIME_FIELDS = ('start_utc', 'date_utc', 'time_utc', 'time_tbd')
+
+
+def compute_content_hash(game: dict, key: str = 'game_id') -> str:
+    """Stable hash of the scraped content of a game (key, seed and volatile fields excluded)."""
+    ignored = {key, HASH_FIELD, *INSERT_ONLY_FIELDS, *VOLATILE_FIELDS}
+    content = {k: v for k, v in game.items() if k not in ignored}
+    encoded = json.dumps(content, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def _build_update(game: dict, existing: dict | None, key: str, content_hash: str):
+    """Returns the update document for one game, or None if nothing changed."""
+    seed = {k: game[k] for k in INSERT_ONLY_FIELDS if k in game}
+    scraped = {
+        k: v for k, v in game.items()
+        if k != key and k not in INSERT_ONLY_FIELDS and k not in VOLATILE_FIELDS
+    }
+
+    if existing is None:
+        fields = dict(scraped)
+        fields.update({k: game[k] for k in VOLATILE_FIELDS if k in game})
+        fields[HASH_FIELD] = content_hash
+        update = {'$set': fields}
+        if seed:
+            update['$setOnInsert'] = seed
+        return update
+
+    if existing.get(HASH_FIELD) == content_hash:
+        return None
+
+    if scraped.get('time_tbd') and existing.get('time_tbd') is False and existing.get('game_date') == scraped.get('game_date'):
+        # Started/finished games show "Final" or a live clock instead of the start time;
+        # keep the start time parsed earlier rather than resetting it to midnight.
+        scraped = {k: v for k, v in scraped.items() if k not in TIME_FIELDS}
+
+    changed = {k: v for k, v in scraped.items() if existing.get(k) != v}
+    changed[HASH_FIELD] = content_hash
+    if len(changed) > 1:
+        changed.update({k: game[k] for k in VOLATILE_FIELDS if k in game})
+    return {'$set': changed}
+
+
+def game_time_text(game: dict) -> str | None:
+    # NBA stores the start time (or status) in time_status, EPL in time_str_et
+    return game.get('time_status') or game.get('time_str_et')
+
+
+def _with_schedule_fields(game: dict) -> dict:
+    """Ingest stage: adds game_date / start_utc / date_utc / time_utc / time_tbd (schedule_dates)."""
+    fields = schedule_fields(game.get('date_str'), game_time_text(game))
+    return {**game, **fields} if fields else game
+
+
+def upsert_games(collection, games: list, key: str = 'game_id', batch_size: int = BULK_BATCH_SIZE) -> dict:
+    """
+    Writes parsed games into `collection`, keyed on `key` ('game_id' or '_id').
+    Returns counts: {'inserted', 'modified', 'unchanged', 'total'}, plus 'changed_games':
+    the games whose stored fields actually changed, for downstream refreshes (materialized views), and
+    'field_changes': what was written per game, {'game_id', 'sport', 'before', 'set'} with
+    'before' the stored document (None for an insert), for the history (schedule_history).
+    """
+    # Later duplicates win, matching the old one-update_one-per-game behaviour.
+    games = list({game[key]: _with_schedule_fields(game) for game in games}.values())
+    counts = {'inserted': 0, 'modified': 0, 'unchanged': 0, 'total': len(games)}
+    changed_games, field_changes = [], []
+
+    for start in range(0, len(games), batch_size):
+        batch = games[start:start + batch_size]
+        ids = [game[key] for game in batch]
+        existing_docs = {doc[key]: doc for doc in collection.find({key: {'$in': ids}})}
+
+        operations, hash_only = [], 0
+        for game in batch:
+            content_hash = compute_content_hash(game, key)
+            update = _build_update(game, existing_docs.get(game[key]), key, content_hash)
+            if update is None:
+                counts['unchanged'] += 1
+                continue
+            operations.append(UpdateOne({key: game[key]}, update, upsert=True))
+            written = {k: v for k, v in update['$set'].items() if k != HASH_FIELD and k not in VOLATILE_FIELDS}
+            if not written:
+                # Only the stored hash differed (e.g. after backfill_schedule_fields): the game
+                # itself is unchanged, so no view refresh, change-log entry or history.
+                hash_only += 1
+                continue
+            changed_games.append(game)
+            field_changes.append({'game_id': game[key], 'sport': game.get('sport'),
+                                  'before': existing_docs.get(game[key]), 'set': written})
+
+        if not operations:
+            continue
+
+        result = collection.bulk_write(operations, ordered=False)
+        # Hash-only updates modify the document but count as unchanged.
+        modified = max(result.modified_count - hash_only, 0)
+        counts['inserted'] += result.upserted_count
+        counts['modified'] += modified
+        counts['unchanged'] += result.matched_count - modified
+
+    logger.info(
+        f"{collection.name}: {counts['inserted']} inserted, {counts['modified']} modified, "
+        f"{counts['unchanged']} unchanged ({counts['total']} total)."
+    )
+    counts['changed_games'] = changed_games
+    counts['field_changes'] = field_changes
+    return counts
+
+
+def backfill_schedule_fields(collection, only_missing: bool = True, batch_size: int = BULK_BATCH_SIZE) -> int:
+    """
+    Fills the ingest-derived date/time fields on documents written before they existed.
+    Returns the number of documents updated. content_hash is left alone on purpose: the next
+    scrape notices the mismatch and only rewrites fields that really differ.
+    """
+    query = {'start_utc': {'$exists': False}} if only_missing else {}
+    projection = {'date_str': 1, 'time_status': 1, 'time_str_et': 1, 'time_tbd': 1, 'game_date': 1}
+    operations, updated = [], 0
+
+    for doc in collection.find(query, projection):
+        fields = schedule_fields(doc.get('date_str'), game_time_text(doc))
+        if not fields:
+            continue
+        if fields['time_tbd'] and doc.get('time_tbd') is False and doc.get('game_date') == fields['game_date']:
+            continue
+        operations.append(UpdateOne({'_id': doc['_id']}, {'$set': fields}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+
+    logger.info(f"{collection.name}: backfilled date/time fields on {updated} documents.")
+    return updated
+
+
+def _merge_admin_fields(old: dict, current: dict) -> dict:
+    """Admin work on two copies of one game: regional channels from both (current wins), validated if either was."""
+    return {
+        'regional_map': {**(old.get('regional_map') or {}), **(current.get('regional_map') or {})},
+        'is_validated': bool(old.get('is_validated') or current.get('is_validated')),
+    }
+
+
+def _same_game(collection, doc: dict, identity: tuple, key: str, resolved: tuple) -> dict | None:
+    """
+    For an old document with a team the registry cannot resolve (e.g. EPL's former 'Manchester'
+    for both United and City): the current-ID document on the same date with the same known team
+    on the same side. A team plays at most once a day, so there is at most one.
+    """
+    game_id, fields = identity
+    side = {'away_team': fields['away_team']} if resolved[0] else \
+        {'home_team': fields['home_team']} if resolved[1] else None
+    if side is None:
+        return None
+    candidates = [candidate for candidate in collection.find({'date_str': doc.get('date_str'), **side})
+                  if candidate[key] != doc[key]]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def rekey_games(collection, key: str, identity, is_known_team) -> dict:
+    """
+    One-time migration of documents stored under an outdated game ID (from before IDs were
+    built from team registry codes) to the ID the scraper builds now.
+    `identity(doc)` returns (game ID, team fields) as the scraper would build them today, or
+    None for games it does not key on teams (TBD); `is_known_team(name)` tells whether the
+    registry resolves a team. When the current ID is already stored (the game was re-scraped),
+    the admin fields are merged into it and the old document is deleted; otherwise the old
+    document is moved to the new ID. Returns counts plus 'game_ids' (old and new) and 'games'
+    (for view refreshes / the change log).
+    """
+    report = {'moved': 0, 'merged': 0, 'unresolved': 0, 'game_ids': [], 'games': []}
+
+    for doc in list(collection.find({})):
+        identity_ = identity(doc)
+        if identity_ is None or identity_[0] == doc[key]:
+            continue
+        game_id, fields = identity_
+        resolved = (is_known_team(doc.get('away_team')), is_known_team(doc.get('home_team')))
+
+        current = collection.find_one({key: game_id}) if all(resolved) else _same_game(collection, doc, identity_, key, resolved)
+        if current is not None:
+            collection.update_one({'_id': current['_id']}, {'$set': _merge_admin_fields(doc, current)})
+            collection.delete_one({'_id': doc['_id']})
+            report['merged'] += 1
+            report['game_ids'] += [doc[key], current[key]]
+            report['games'].append(current)
+        elif all(resolved):
+            moved = {**doc, **fields, key: game_id}
+            if key == '_id':
+                collection.insert_one(moved)
+                collection.delete_one({'_id': doc['_id']})
+            else:
+                collection.replace_one({'_id': doc['_id']}, moved)
+            report['moved'] += 1
+            report['game_ids'] += [doc[key], game_id]
+            report['games'].append(moved)
+        else:
+            # Cannot tell which team this was; left for the next scrape / an admin to resolve
+            logger.warning(f"{collection.name}: could not rekey {doc[key]} (unknown team); left as is.")
+            report['unresolved'] += 1
+
+    logger.info(f"{collection.name}: rekeyed game IDs: {report['moved']} moved, {report['merged']} merged "
+                f"into re-scraped games, {report['unresolved']} unresolved.")
+    return report
+
+
+def _publish_rekeys(db, name: str, report: dict):
+    """Rekeyed games change resolved schedules like a scrape does: views, change log, cached responses."""
+    from ..api.cache_generation import bump_generation
+    from ..api.change_feed import record_change
+    from ..api.schedule_views import refresh_views_for_games
+
+    refresh_views_for_games(db, report['games'])
+    record_change(db, f"{name} game ID rekey", report['game_ids'])
+    bump_generation(db, f"{name} game ID rekey")
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Backfill UTC date/time fields on stored games.")
+    parser.add_argument('--all', action='store_true', help="Recompute every document, not only those missing start_utc")
+    parser.add_argument('--rekey', action='store_true',
+                        help="Also move games stored under pre-registry IDs (raw team names) to their current ID")
+    args = parser.parse_args(argv)
+
+    from .scraper_config import get_mongo_client
+    db = get_mongo_client()
+    if db is None:
+        logger.error("Could not connect to MongoDB. Exiting.")
+        return 1
+
+    if args.rekey:
+        from .epl_scraper import stored_game_identity as epl_identity
+        from .nba_scraper import stored_game_identity as nba_identity
+        from .team_registry import resolve_team
+        for name, key, identity, sport in (('schedules', '_id', nba_identity, 'NBA'),
+                                           ('epl_schedules', 'game_id', epl_identity, 'EPL')):
+            report = rekey_games(db[name], key, identity, lambda team, sport=sport: resolve_team(sport, team) is not None)
+            if report['game_ids']:
+                _publish_rekeys(db, name, report)
+
+    for name in ('schedules', 'epl_schedules'):
+        backfill_schedule_fields(db[name], only_missing=not args.all)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
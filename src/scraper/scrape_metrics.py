@@ -0,0 +1,216 @@
+# src/scraper/scrape_metrics.py
+# Per-phase instrumentation for scrape runs.
+# run_league opens one ScrapeMetrics per league and makes it current for its asyncio task
+# (contextvars), so the fetch/parse code records phases and counters without passing it around:
+#
+#     with phase('fetch.goto'):
+#         await page.goto(url)
+#     count('bytes_fetched', len(html))
+#
+# Outside a run, phase() and count() are no-ops. Finished runs are emitted as one JSON log
+# record (logger 'src.scraper.scrape_metrics') and, when SCRAPE_METRICS_FILE is set, written
+# to a Prometheus text file (node_exporter textfile collector format), which the admin API
+# also serves at /api/admin/metrics.
+# SCRAPE_PROFILE_PARSE=1 runs the parse phase under cProfile and saves the stats per league.
+
+import cProfile
+import contextvars
+import io
+import json
+import logging
+import os
+import pstats
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILE = os.getenv("SCRAPE_METRICS_FILE", "")
+PROFILE_PARSE = os.getenv("SCRAPE_PROFILE_PARSE", "0") == "1"
+PROFILE_DIR = os.getenv("SCRAPE_PROFILE_DIR", os.path.join(tempfile.gettempdir(), 'watchwherelive_profiles'))
+PROFILE_TOP = int(os.getenv("SCRAPE_PROFILE_TOP", "15"))  # functions logged from each profile
+
+METRIC_PREFIX = 'wwl_scrape'
+
+_current = contextvars.ContextVar('scrape_metrics', default=None)
+_latest = {}  # league -> last finished ScrapeMetrics, for the Prometheus export
+_latest_lock = threading.Lock()
+
+
+class ScrapeMetrics:
+    """Phase timings (seconds, summed over retries) and counters for one league run."""
+
+    def __init__(self, league: str):
+        self.league = league
+        self.started_at = time.time()
+        self.phases = {}
+        self.counters = {'bytes_fetched': 0, 'games_parsed': 0, 'writes': 0, 'errors': 0}
+        self.status = None
+
+    def add_phase(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other: 'ScrapeMetrics'):
+        """Adds the phases and counters recorded elsewhere (e.g. in a parse worker process)."""
+        for name, seconds in other.phases.items():
+            self.add_phase(name, seconds)
+        for name, value in other.counters.items():
+            self.add(name, value)
+
+    @property
+    def writes_per_second(self) -> float:
+        seconds = self.phases.get('write', 0.0)
+        return self.counters['writes'] / seconds if seconds > 0 else 0.0
+
+    def as_record(self) -> dict:
+        return {
+            'event': 'scrape_run',
+            'league': self.league,
+            'status': self.status,
+            'started_at': round(self.started_at, 3),
+            'phases': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            **self.counters,
+            'writes_per_second': round(self.writes_per_second, 1),
+        }
+
+
+# --- Recording helpers (no-ops outside a run) ---
+
+def current_metrics() -> ScrapeMetrics | None:
+    return _current.get()
+
+
+@contextmanager
+def phase(name: str):
+    metrics = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.add_phase(name, time.perf_counter() - started)
+
+
+def count(name: str, value: int = 1):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.add(name, value)
+
+
+@contextmanager
+def league_run(league: str):
+    """Makes a fresh ScrapeMetrics current for the enclosed block and publishes it afterwards."""
+    metrics = ScrapeMetrics(league)
+    token = _current.set(metrics)
+    try:
+        with phase('total'):
+            yield metrics
+    finally:
+        _current.reset(token)
+        publish(metrics)
+
+
+@contextmanager
+def use_metrics(metrics: ScrapeMetrics | None):
+    """Makes an existing league's metrics current, for pipeline stages running in other tasks."""
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def collect(league: str):
+    """A fresh, unpublished ScrapeMetrics for work done away from the league's task (merge it back)."""
+    with use_metrics(ScrapeMetrics(league)) as metrics:
+        yield metrics
+
+
+@contextmanager
+def profiled(label: str):
+    """cProfile the enclosed block when SCRAPE_PROFILE_PARSE=1; otherwise does nothing."""
+    if not PROFILE_PARSE:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{label}.prof")
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        logger.info(f"Saved {label} profile to {path}\n{summary.getvalue()}")
+
+
+# --- Export ---
+
+def publish(metrics: ScrapeMetrics):
+    logger.info(json.dumps(metrics.as_record(), sort_keys=True))
+    with _latest_lock:
+        _latest[metrics.league] = metrics
+    if METRICS_FILE:
+        try:
+            write_prometheus(METRICS_FILE)
+        except OSError as e:
+            logger.error(f"Could not write scrape metrics to {METRICS_FILE}: {e}")
+
+
+def _sample(name: str, labels: dict, value) -> str:
+    rendered = ','.join(f'{k}="{v}"' for k, v in labels.items())
+    return f"{METRIC_PREFIX}_{name}{{{rendered}}} {float(value)!r}"
+
+
+def render_prometheus(runs=None) -> str:
+    """Prometheus text exposition of the last run of every league."""
+    if runs is None:
+        with _latest_lock:
+            runs = list(_latest.values())
+
+    families = {
+        'phase_seconds': ('gauge', "Seconds spent in each phase of the last scrape run"),
+        'bytes_fetched': ('gauge', "Bytes of page content fetched in the last run"),
+        'games_parsed': ('gauge', "Games parsed in the last run"),
+        'writes': ('gauge', "Documents inserted or modified in the last run"),
+        'writes_per_second': ('gauge', "Write throughput of the last run's upsert phase"),
+        'errors': ('gauge', "Errors (failed fetch attempts, unparseable items) in the last run"),
+        'last_run_success': ('gauge', "1 if the last run finished with status ok/unchanged"),
+        'last_run_timestamp_seconds': ('gauge', "Unix time the last run started"),
+    }
+    samples = {name: [] for name in families}
+    for run in sorted(runs, key=lambda r: r.league):
+        league = {'league': run.league}
+        for name, seconds in sorted(run.phases.items()):
+            samples['phase_seconds'].append(_sample('phase_seconds', {**league, 'phase': name}, seconds))
+        for name in ('bytes_fetched', 'games_parsed', 'writes', 'errors'):
+            samples[name].append(_sample(name, league, run.counters.get(name, 0)))
+        samples['writes_per_second'].append(_sample('writes_per_second', league, run.writes_per_second))
+        samples['last_run_success'].append(
+            _sample('last_run_success', league, 1 if run.status in ('ok', 'unchanged') else 0))
+        samples['last_run_timestamp_seconds'].append(_sample('last_run_timestamp_seconds', league, run.started_at))
+
+    lines = []
+    for name, (kind, help_text) in families.items():
+        if samples[name]:
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            lines.extend(samples[name])
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path: str):
+    """Atomic write, so a collector never reads a half-written file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)
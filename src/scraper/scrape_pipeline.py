@@ -0,0 +1,235 @@
+# src/scraper/scrape_pipeline.py
+# Staged scrape pipeline: fetch -> parse -> write, connected by bounded asyncio queues.
+# - fetch: one task per league with the orchestrator's retrying fetch. Fetched pages go onto
+#   the parse queue; when it is full the fetchers wait (backpressure) instead of piling up pages.
+# - parse: parse_with_snapshot runs in a ProcessPoolExecutor, so CPU-bound parsing uses every
+#   core and never blocks the event loop while other leagues' pages are still loading.
+# - write: one writer drains the write queue, merges pages of the same league into a single
+#   upsert_games call (write_games) and runs it in a thread, since pymongo blocks.
+# Each league keeps its own ScrapeMetrics and summary, exactly as with run_league; phases
+# recorded in the parse workers are merged back into it.
+# A league may be fetched from several URLs (e.g. nba_crawl's week pages): its pages are
+# fetched concurrently and games seen on an earlier page of the same run are dropped.
+#
+# Disable with SCRAPE_PIPELINE=0 (run_scrape then runs run_league per league).
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .base_scraper import record_parse_result, write_games
+from .scrape_metrics import collect, league_run, phase, profiled, use_metrics
+from .snapshot_cache import commit_snapshot, parse_with_snapshot
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_ENABLED = os.getenv("SCRAPE_PIPELINE", "1") != "0"
+PARSE_WORKERS = int(os.getenv("SCRAPE_PARSE_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+QUEUE_SIZE = int(os.getenv("SCRAPE_PIPELINE_QUEUE", "4"))
+# spawn, not fork: the parent runs Playwright's threads, which a forked child would inherit broken
+START_METHOD = os.getenv("SCRAPE_PARSE_START_METHOD", "spawn")
+
+_DONE = None  # queue sentinel
+
+
+class LeagueJob:
+    """One league moving through the pipeline: its metrics, summary and pages still in flight."""
+
+    def __init__(self, scraper, metrics):
+        self.scraper = scraper
+        self.metrics = metrics
+        self.summary = {'league': scraper.name, 'status': 'failed', 'games': 0}
+        self.pending_pages = 0
+        self.finished = asyncio.get_running_loop().create_future()
+        self.seen = set()
+
+    def new_games(self, games: list) -> list:
+        """Drops games an earlier page of this run already produced (overlapping pages)."""
+        fresh = []
+        for game in games:
+            game_key = game.get(self.scraper.key)
+            if game_key not in self.seen:
+                self.seen.add(game_key)
+                fresh.append(game)
+        if len(fresh) < len(games):
+            self.summary['duplicates'] = self.summary.get('duplicates', 0) + len(games) - len(fresh)
+        return fresh
+
+    def page_finished(self):
+        self.pending_pages -= 1
+        if self.pending_pages <= 0 and not self.finished.done():
+            self.finished.set_result(None)
+
+    def fail(self, error: str):
+        logger.error(f"[{self.scraper.name}] {error}")
+        self.metrics.add('errors')
+        self.summary['status'] = 'failed'
+        self.summary['error'] = error
+
+
+# --- Parse stage (worker processes) ---
+
+def _init_worker(log_level: int):
+    logging.basicConfig(level=log_level)
+
+
+def parse_page(scraper, content, url: str | None = None):
+    """
+    Runs in a parse worker. Returns (games, snapshot, metrics) like parse_with_snapshot, with the
+    page left out of the snapshot (the parent still has it) and the metrics recorded here.
+    """
+    with collect(scraper.name) as metrics:
+        with phase('parse'), profiled(f"{scraper.name.lower()}-parse"):
+            games, snapshot = parse_with_snapshot(scraper, content, url)
+    if snapshot:
+        snapshot = {**snapshot, 'content': None}
+    return games, snapshot, metrics
+
+
+def create_parse_pool(workers: int = PARSE_WORKERS):
+    """A process pool, or a single thread where processes are unavailable (e.g. AWS Lambda has no /dev/shm)."""
+    try:
+        context = multiprocessing.get_context(START_METHOD)
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                   initializer=_init_worker, initargs=(logging.getLogger().level,))
+    except (OSError, NotImplementedError, ValueError) as e:
+        logger.warning(f"Parse worker processes unavailable ({e}); parsing in a background thread.")
+        return ThreadPoolExecutor(max_workers=1)
+
+
+async def _parse_stage(parse_queue: asyncio.Queue, write_queue: asyncio.Queue, pool):
+    loop = asyncio.get_running_loop()
+    while (item := await parse_queue.get()) is not _DONE:
+        job, url, content = item
+        try:
+            # Includes the hand-off to the worker; the worker's own 'parse' phase is merged below
+            with use_metrics(job.metrics), phase('parse.dispatch'):
+                games, snapshot, worker_metrics = await loop.run_in_executor(
+                    pool, parse_page, job.scraper, content, url)
+        except Exception as e:
+            job.fail(f"Parse failed: {e}")
+            job.page_finished()
+            continue
+
+        job.metrics.merge(worker_metrics)
+        if snapshot:
+            snapshot['content'] = content
+        if games:
+            games = job.new_games(games)
+            if not games:
+                # Everything on this page was already seen on another page
+                await asyncio.to_thread(commit_snapshot, job.scraper, snapshot)
+                job.page_finished()
+                continue
+        with use_metrics(job.metrics):
+            to_write = record_parse_result(job.scraper, games, job.summary)
+        if to_write:
+            await write_queue.put((job, games, snapshot))
+        else:
+            job.page_finished()
+
+
+# --- Write stage ---
+
+async def _write_stage(write_queue: asyncio.Queue, db):
+    finished = False
+    while not finished:
+        batch = [await write_queue.get()]
+        # Whatever else is ready goes into the same round: pages of one league become one upsert
+        while not write_queue.empty():
+            batch.append(write_queue.get_nowait())
+
+        groups = {}
+        for item in batch:
+            if item is _DONE:
+                finished = True
+                continue
+            job, games, snapshot = item
+            group = groups.setdefault(id(job), {'job': job, 'games': [], 'snapshots': [], 'pages': 0})
+            group['games'].extend(games)
+            group['snapshots'].append(snapshot)
+            group['pages'] += 1
+
+        for group in groups.values():
+            job = group['job']
+            try:
+                with use_metrics(job.metrics):
+                    # to_thread copies the context, so phases and counters land on this league
+                    await asyncio.to_thread(write_games, job.scraper, db, group['games'],
+                                            group['snapshots'], job.summary)
+            except Exception as e:
+                job.fail(f"Write failed: {e}")
+            for _ in range(group['pages']):
+                job.page_finished()
+
+
+# --- Fetch stage and driver ---
+
+async def _run_league(scraper, fetch, parse_queue: asyncio.Queue, urls=None) -> dict:
+    started = time.perf_counter()
+    urls = urls or [scraper.url]
+    with league_run(scraper.name) as metrics:
+        job = LeagueJob(scraper, metrics)
+        failed = []
+
+        async def fetch_page(url: str):
+            with phase('fetch'):
+                content = await fetch(url)
+            if content:
+                job.pending_pages += 1
+                await parse_queue.put((job, url, content))  # waits while the parsers are behind
+            else:
+                failed.append(url)
+
+        try:
+            job.pending_pages += 1  # held until every page is fetched, so the job can't finish early
+            await asyncio.gather(*(fetch_page(url) for url in urls))
+            if failed:
+                logger.error(f"[{scraper.name}] Failed to retrieve {len(failed)}/{len(urls)} schedule pages.")
+                job.summary['error'] = 'fetch failed'
+                if len(urls) > 1:
+                    job.summary['failed_pages'] = failed
+            job.page_finished()
+            await job.finished
+        except Exception as e:
+            job.fail(f"Scrape failed: {e}")
+        if failed and job.summary['status'] == 'ok':
+            job.summary['status'] = 'partial'
+        metrics.status = job.summary['status']
+
+    summary = job.summary
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+    summary['metrics'] = metrics.as_record()
+    return summary
+
+
+async def run_pipeline(scrapers, db, make_fetch, pool=None, urls=None) -> list:
+    """
+    Runs the leagues through the staged pipeline and returns one summary per league, in order.
+    `make_fetch(scraper)` returns the fetch callable to use for that league; `urls` optionally
+    maps a league name to the pages to fetch for it (default: scraper.url).
+    """
+    urls = urls or {}
+    parse_queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    write_queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    own_pool = pool is None
+    pool = pool or create_parse_pool()
+    workers = PARSE_WORKERS if isinstance(pool, ProcessPoolExecutor) else 1
+
+    parsers = [asyncio.create_task(_parse_stage(parse_queue, write_queue, pool)) for _ in range(workers)]
+    writer = asyncio.create_task(_write_stage(write_queue, db))
+    try:
+        return await asyncio.gather(
+            *(_run_league(s, make_fetch(s), parse_queue, urls.get(s.name)) for s in scrapers)
+        )
+    finally:
+        for _ in parsers:
+            await parse_queue.put(_DONE)
+        await asyncio.gather(*parsers)
+        await write_queue.put(_DONE)
+        await writer
+        if own_pool:
+            pool.shutdown()
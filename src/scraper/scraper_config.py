@@ -1,31 +1,92 @@
 # src/scraper/scraper_config.py
-from pymongo import MongoClient
-from dotenv import load_dotenv
 import os
+import threading
+
+# AWS Lambda (and Netlify Functions, which run on it) sets this. Cold starts there skip
+# everything only needed locally: no .env lookup, no python-dotenv import.
+SERVERLESS = bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
 
 # Load environment variables from .env file
-load_dotenv()
+if not SERVERLESS and os.getenv("LOAD_DOTENV", "1") != "0":
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # The script now securely retrieves the URI from the environment.
-# Note: When deploying to AWS Lambda/Netlify Functions, you set this variable 
+# Note: When deploying to AWS Lambda/Netlify Functions, you set this variable
 # in the cloud console, NOT via a .env file.
-MONGO_URI = os.getenv("MONGO_URI") 
+MONGO_URI = os.getenv("MONGO_URI")
 DB_NAME = "watchwherelive_db" # We will use this as the database name
 
+# Connection pool settings (all optional). Serverless functions usually want a small pool.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "10"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+# Ping on connect so CLIs fail fast with a clear message. Serverless functions skip the extra
+# round trip: the first query connects anyway, and a failure there resets the client.
+MONGO_PING_ON_CONNECT = os.getenv("MONGO_PING_ON_CONNECT", "0" if SERVERLESS else "1") != "0"
+
+# One MongoClient per process. It is created (and pinged) on first use and then shared by
+# every caller, including warm serverless invocations that reuse the module.
+_client = None
+_client_lock = threading.Lock()
+
+
+def _create_client():
+    from pymongo import MongoClient  # imported on first use, not when a handler module loads
+    client = MongoClient(
+        MONGO_URI,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+        socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+        readPreference=MONGO_READ_PREFERENCE,
+    )
+    if not MONGO_PING_ON_CONNECT:
+        return client
+    try:
+        # Ping once to confirm a successful connection; later calls reuse the client as-is
+        client.admin.command('ping')
+    except Exception:
+        client.close()
+        raise
+    return client
+
+
 def get_mongo_client():
-    """Returns a MongoDB database object for the WatchWhereLive DB."""
+    """Returns a MongoDB database object for the WatchWhereLive DB, backed by the shared client."""
+    global _client
     if not MONGO_URI:
         print("Error: MONGO_URI not found. Check your .env file or environment variables.")
         return None
-        
-    try:
-        # Use the connection string to create the MongoClient
-        client = MongoClient(MONGO_URI)
-        
-        # Ping the server to confirm a successful connection
-        client.admin.command('ping') 
-        print("MongoDB connection successful. Using database: 'watchwherelive_db'")
-        return client[DB_NAME]
-    except Exception as e:
-        print(f"Error connecting to MongoDB: {e}")
-        return None
\ No newline at end of file
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                try:
+                    _client = _create_client()
+                    print("MongoDB connection successful. Using database: 'watchwherelive_db'")
+                except Exception as e:
+                    # Nothing is cached, so the next call retries the connection.
+                    print(f"Error connecting to MongoDB: {e}")
+                    return None
+
+    return _client[DB_NAME]
+
+
+def reset_mongo_client():
+    """
+    Closes and forgets the shared client. Call this after a ConnectionFailure so the
+    next get_mongo_client() reconnects and pings again.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            try:
+                _client.close()
+            except Exception as e:
+                print(f"Error closing MongoDB client: {e}")
+            _client = None
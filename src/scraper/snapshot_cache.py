@@ -0,0 +1,135 @@
+# src/scraper/snapshot_cache.py
+# On-disk snapshots of fetched schedule pages, keyed by source URL.
+# Each snapshot keeps the compressed page, its content hash and a digest of every day section
+# (with the games parsed from it), so an identical page is not parsed at all and a changed page
+# only has its changed day sections re-parsed.
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# Lambda/Netlify only allow writes under /tmp, so default to the system temp directory.
+SNAPSHOT_DIR = os.getenv(
+    "SCRAPER_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "watchwherelive_snapshots")
+)
+SNAPSHOTS_ENABLED = os.getenv("SCRAPER_SNAPSHOTS", "1") != "0"
+
+
+def content_hash(content) -> str:
+    """sha256 of fetched content: rendered HTML (str) or a captured JSON feed (dict)."""
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def split_sections(html: str, section_pattern) -> list:
+    """
+    Splits the page at every match of `section_pattern` (the opening tag of a day section).
+    Each section runs up to the next one; anything before the first section is dropped.
+    """
+    starts = [m.start() for m in section_pattern.finditer(html)]
+    return [html[start:end] for start, end in zip(starts, starts[1:] + [len(html)])]
+
+
+def _paths(url: str):
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(SNAPSHOT_DIR, f"{key}.json"), os.path.join(SNAPSHOT_DIR, f"{key}.html.gz")
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(url: str) -> dict | None:
+    """Returns the stored metadata for `url` (hash + section digests/games), or None."""
+    meta_path, _ = _paths(url)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable snapshot for {url}: {e}")
+        return None
+
+
+def load_snapshot_content(url: str) -> str | None:
+    """Returns the stored (decompressed) page for `url`, e.g. for replaying a run offline."""
+    _, content_path = _paths(url)
+    try:
+        with gzip.open(content_path, 'rt', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def save_snapshot(url: str, content, digest: str, sections: list):
+    """Stores the compressed page plus its hash and per-section digests/games."""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    meta_path, content_path = _paths(url)
+    raw = content if isinstance(content, str) else json.dumps(content)
+    _atomic_write(content_path, gzip.compress(raw.encode('utf-8')))
+    meta = {'url': url, 'content_hash': digest, 'saved_at': time.time(), 'sections': sections}
+    _atomic_write(meta_path, json.dumps(meta, separators=(',', ':')).encode('utf-8'))
+
+
+def parse_with_snapshot(scraper, content, url: str | None = None):
+    """
+    Parses `content` fetched from `url` (default scraper.url), reusing the previous snapshot
+    of that URL where possible.
+    Returns (games, pending):
+    - games is None when the content is identical to the last snapshot (nothing to parse or write),
+      otherwise the full list of games in page order;
+    - pending is the new snapshot, to be stored with commit_snapshot() once the games are written.
+    """
+    if not SNAPSHOTS_ENABLED:
+        return scraper.parse(content), None
+
+    url = url or scraper.url
+    digest = content_hash(content)
+    snapshot = load_snapshot(url)
+    if snapshot and snapshot.get('content_hash') == digest:
+        logger.info(f"[{scraper.name}] Page unchanged since last snapshot. Skipping parse.")
+        return None, None
+
+    chunks = split_sections(content, scraper.section_pattern) \
+        if isinstance(content, str) and scraper.section_pattern is not None else []
+
+    if not chunks:
+        # Feeds and pages without recognizable day sections are cached as one whole section.
+        games = scraper.parse(content)
+        sections = [{'digest': digest, 'games': games}]
+    else:
+        previous = {s['digest']: s['games'] for s in (snapshot or {}).get('sections', [])}
+        sections, reparsed = [], 0
+        for chunk in chunks:
+            chunk_digest = content_hash(chunk)
+            if chunk_digest in previous:
+                section_games = previous[chunk_digest]
+            else:
+                section_games = scraper.parse(chunk)
+                reparsed += 1
+            sections.append({'digest': chunk_digest, 'games': section_games})
+        games = [game for section in sections for game in section['games']]
+        logger.info(f"[{scraper.name}] Re-parsed {reparsed}/{len(chunks)} changed day sections.")
+
+    return games, {'url': url, 'content': content, 'digest': digest, 'sections': sections}
+
+
+def commit_snapshot(scraper, pending: dict | None):
+    """Stores a snapshot returned by parse_with_snapshot. Failures only cost a re-parse next run."""
+    if not pending:
+        return
+    try:
+        save_snapshot(pending.get('url') or scraper.url, pending['content'], pending['digest'], pending['sections'])
+    except OSError as e:
+        logger.warning(f"[{scraper.name}] Could not save snapshot: {e}")
@@ -0,0 +1,144 @@
+# src/scraper/team_registry.py
+# Cross-sport team identity registry.
+# Every source spells teams differently ("Man Utd", "Manchester United FC", "LA Lakers"), so
+# names are resolved here once into a canonical Team with a stable code. Scrapers build game
+# IDs from the codes, which keeps one document per game however a source spells the teams.
+#
+# The alias table is compiled once at import into {normalized alias: Team}, so a lookup is a
+# few precompiled regex substitutions and one dict read. Results are memoized and canonical
+# names are interned. Matching is exact on the normalized key on purpose: a fuzzy match would
+# fold e.g. "Arsenal Women" into "Arsenal" and merge two different teams' games.
+
+import re
+import sys
+from functools import lru_cache
+from typing import NamedTuple
+
+
+class Team(NamedTuple):
+    sport: str
+    name: str   # canonical display name, as stored on games and dma_rules
+    code: str   # stable short code used in game IDs
+
+
+# --- Registry data: sport -> [(code, canonical name, aliases...)] ---
+# NBA canonical names are the nicknames nba.com prints and dma_rules are keyed on.
+TEAM_DATA = {
+    'NBA': [
+        ('ATL', 'Hawks', 'Atlanta Hawks', 'Atlanta'),
+        ('BOS', 'Celtics', 'Boston Celtics', 'Boston'),
+        ('BKN', 'Nets', 'Brooklyn Nets', 'Brooklyn'),
+        ('CHA', 'Hornets', 'Charlotte Hornets', 'Charlotte'),
+        ('CHI', 'Bulls', 'Chicago Bulls', 'Chicago'),
+        ('CLE', 'Cavaliers', 'Cleveland Cavaliers', 'Cleveland', 'Cavs'),
+        ('DAL', 'Mavericks', 'Dallas Mavericks', 'Dallas', 'Mavs'),
+        ('DEN', 'Nuggets', 'Denver Nuggets', 'Denver'),
+        ('DET', 'Pistons', 'Detroit Pistons', 'Detroit'),
+        ('GSW', 'Warriors', 'Golden State Warriors', 'Golden State'),
+        ('HOU', 'Rockets', 'Houston Rockets', 'Houston'),
+        ('IND', 'Pacers', 'Indiana Pacers', 'Indiana'),
+        ('LAC', 'Clippers', 'LA Clippers', 'Los Angeles Clippers'),
+        ('LAL', 'Lakers', 'Los Angeles Lakers', 'LA Lakers'),
+        ('MEM', 'Grizzlies', 'Memphis Grizzlies', 'Memphis'),
+        ('MIA', 'Heat', 'Miami Heat', 'Miami'),
+        ('MIL', 'Bucks', 'Milwaukee Bucks', 'Milwaukee'),
+        ('MIN', 'Timberwolves', 'Minnesota Timberwolves', 'Minnesota', 'Wolves'),
+        ('NOP', 'Pelicans', 'New Orleans Pelicans', 'New Orleans'),
+        ('NYK', 'Knicks', 'New York Knicks', 'New York'),
+        ('OKC', 'Thunder', 'Oklahoma City Thunder', 'Oklahoma City'),
+        ('ORL', 'Magic', 'Orlando Magic', 'Orlando'),
+        ('PHI', '76ers', 'Philadelphia 76ers', 'Philadelphia', 'Sixers'),
+        ('PHX', 'Suns', 'Phoenix Suns', 'Phoenix'),
+        ('POR', 'Trail Blazers', 'Portland Trail Blazers', 'Portland', 'Blazers'),
+        ('SAC', 'Kings', 'Sacramento Kings', 'Sacramento'),
+        ('SAS', 'Spurs', 'San Antonio Spurs', 'San Antonio'),
+        ('TOR', 'Raptors', 'Toronto Raptors', 'Toronto'),
+        ('UTA', 'Jazz', 'Utah Jazz', 'Utah'),
+        ('WAS', 'Wizards', 'Washington Wizards', 'Washington'),
+    ],
+    'EPL': [
+        ('ARS', 'Arsenal', 'Arsenal FC'),
+        ('AVL', 'Aston Villa', 'Villa'),
+        ('BOU', 'Bournemouth', 'AFC Bournemouth'),
+        ('BRE', 'Brentford', 'Brentford FC'),
+        ('BHA', 'Brighton', 'Brighton & Hove Albion', 'Brighton and Hove Albion', 'Brighton Hove Albion'),
+        ('BUR', 'Burnley', 'Burnley FC'),
+        ('CHE', 'Chelsea', 'Chelsea FC'),
+        ('CRY', 'Crystal Palace', 'Palace'),
+        ('EVE', 'Everton', 'Everton FC'),
+        ('FUL', 'Fulham', 'Fulham FC'),
+        ('IPS', 'Ipswich Town', 'Ipswich'),
+        ('LEE', 'Leeds United', 'Leeds', 'Leeds Utd'),
+        ('LEI', 'Leicester City', 'Leicester'),
+        ('LIV', 'Liverpool', 'Liverpool FC'),
+        ('LUT', 'Luton Town', 'Luton'),
+        ('MCI', 'Manchester City', 'Man City', 'Man. City'),
+        ('MUN', 'Manchester United', 'Man Utd', 'Man United', 'Man. United', 'Manchester Utd'),
+        ('NEW', 'Newcastle United', 'Newcastle', 'Newcastle Utd'),
+        ('NFO', 'Nottingham Forest', "Nott'm Forest", 'Nottm Forest', 'Forest'),
+        ('SHU', 'Sheffield United', 'Sheffield Utd', 'Sheff Utd'),
+        ('SOU', 'Southampton', 'Southampton FC'),
+        ('SUN', 'Sunderland', 'Sunderland AFC'),
+        ('TOT', 'Tottenham Hotspur', 'Tottenham', 'Spurs'),
+        ('WHU', 'West Ham United', 'West Ham', 'West Ham Utd'),
+        ('WOL', 'Wolverhampton Wanderers', 'Wolves', 'Wolverhampton'),
+    ],
+}
+
+# Normalized keys: lower case, '&' -> 'and', punctuation dropped, club suffixes removed.
+# Only suffixes that never distinguish two clubs are dropped ("United"/"City" do).
+_AMPERSAND = re.compile(r'\s*&\s*')
+_NON_WORD = re.compile(r"[^\w\s]+")
+_CLUB_SUFFIX = re.compile(r'(?:^|\s)(?:a?fc|cf|sc)(?=\s|$)')
+_SPACES = re.compile(r'\s+')
+
+
+def _key(name: str) -> str:
+    key = _AMPERSAND.sub(' and ', name.lower())
+    key = _NON_WORD.sub('', key)
+    key = _CLUB_SUFFIX.sub(' ', key)
+    return _SPACES.sub(' ', key).strip()
+
+
+def _compile(data: dict):
+    by_key, by_code = {}, {}
+    for sport, teams in data.items():
+        sport_keys = by_key.setdefault(sport, {})
+        for code, name, *aliases in teams:
+            team = Team(sys.intern(sport), sys.intern(name), sys.intern(code))
+            by_code[(sport, code)] = team
+            for alias in (name, code, *aliases):
+                key = _key(alias)
+                if sport_keys.get(key, team) is not team:
+                    raise ValueError(f"Alias '{alias}' is ambiguous for {sport}")
+                sport_keys[key] = team
+    return by_key, by_code
+
+
+_BY_KEY, _BY_CODE = _compile(TEAM_DATA)
+
+
+@lru_cache(maxsize=4096)
+def resolve_team(sport: str, name: str) -> Team | None:
+    """Resolves a raw team name for a sport. Returns None for teams the registry doesn't know."""
+    sport = (sport or '').upper()
+    keys = _BY_KEY.get(sport)
+    if not keys or not name:
+        return None
+    return keys.get(_key(name))
+
+
+def team_by_code(sport: str, code: str) -> Team | None:
+    return _BY_CODE.get(((sport or '').upper(), (code or '').upper()))
+
+
+def canonical_team_name(sport: str, name: str) -> str:
+    """Canonical name for known teams; unknown names are returned cleaned up but otherwise as-is."""
+    team = resolve_team(sport, name)
+    return team.name if team else _SPACES.sub(' ', (name or '')).strip()
+
+
+def team_code(sport: str, name: str) -> str:
+    """Stable code for game IDs. Unknown teams get a code derived from their name."""
+    team = resolve_team(sport, name)
+    return team.code if team else _key(name).replace(' ', '').upper()
@@ -0,0 +1,47 @@
+# tests/conftest.py
+# Makes the repository root importable (`src.*`) when the suite runs as plain `pytest`, and
+# provides a mongomock database for the tests that exercise the MongoDB code paths.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _union_aggregate(aggregate):
+    """mongomock has no $unionWith: run the unioned pipelines separately, then the stages after them."""
+    def wrapper(collection, pipeline, *args, **kwargs):
+        unions = [i for i, stage in enumerate(pipeline) if '$unionWith' in stage]
+        if not unions:
+            return aggregate(collection, pipeline, *args, **kwargs)
+        docs = list(aggregate(collection, pipeline[:unions[0]] or [{'$match': {}}]))
+        for i in unions:
+            union = pipeline[i]['$unionWith']
+            docs += list(aggregate(collection.database[union['coll']], union.get('pipeline') or [{'$match': {}}]))
+        rest = pipeline[unions[-1] + 1:]
+        if not rest:
+            return iter(docs)
+        combined = collection.database['__union__']
+        combined.drop()
+        if docs:
+            combined.insert_many(docs)
+        result = list(aggregate(combined, rest))
+        combined.drop()
+        return iter(result)
+    return wrapper
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    """A fresh mongomock database, also returned by scraper_config.get_mongo_client()."""
+    mongomock = pytest.importorskip('mongomock')
+    from src.scraper import scraper_config
+
+    monkeypatch.setattr(mongomock.collection.Collection, 'aggregate',
+                        _union_aggregate(mongomock.collection.Collection.aggregate))
+    db = mongomock.MongoClient()[scraper_config.DB_NAME]
+    monkeypatch.setattr(scraper_config, 'MONGO_URI', scraper_config.MONGO_URI or 'mongodb://localhost')
+    monkeypatch.setattr(scraper_config, '_client', {scraper_config.DB_NAME: db})
+    return db
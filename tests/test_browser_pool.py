@@ -0,0 +1,90 @@
+# tests/test_browser_pool.py
+# The pooled browser against a local stub server: the schedule feed is captured during page
+# load and lean mode keeps images, media and fonts from being fetched.
+
+import asyncio
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from src.scraper.browser_pool import BrowserPool, _is_blocked, capture_json_response
+
+FEED_PATTERN = re.compile(r'/staticData/scheduleLeagueV2[^/]*\.json')
+FEED_BODY = b'{"leagueSchedule": {"gameDates": []}}'
+PAGE = b'''<html><head>
+<style>@font-face { font-family: Stub; src: url(/font.woff2); } body { font-family: Stub; }</style>
+</head><body>
+<img src="/logo.png"><video src="/clip.mp4" autoplay muted></video>
+<p>schedule</p>
+<script>fetch('/staticData/scheduleLeagueV2_1.json');</script>
+</body></html>'''
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.seen.append(self.path)
+        if self.path == '/':
+            body, content_type = PAGE, 'text/html'
+        elif FEED_PATTERN.search(self.path):
+            body, content_type = FEED_BODY, 'application/json'
+        else:
+            body, content_type = b'x' * 64, 'application/octet-stream'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.seen = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_blocks_heavy_resources_and_trackers():
+    request = lambda resource_type, url: SimpleNamespace(resource_type=resource_type, url=url)
+    assert _is_blocked(request('image', 'https://www.nba.com/logo.png'))
+    assert _is_blocked(request('font', 'https://www.nba.com/font.woff2'))
+    assert _is_blocked(request('script', 'https://securepubads.g.doubleclick.net/tag.js'))
+    assert not _is_blocked(request('document', 'https://www.nba.com/schedule'))
+    assert not _is_blocked(request('fetch', 'https://cdn.nba.com/static/json/staticData/scheduleLeagueV2_1.json'))
+
+
+async def _load_stub_page(url: str):
+    pool = BrowserPool(size=1, lean=True)
+    try:
+        async with pool.page() as page:
+            async with capture_json_response(page, FEED_PATTERN) as feed:
+                await page.goto(url, wait_until='domcontentloaded')
+                payload = await asyncio.wait_for(asyncio.shield(feed), timeout=10)
+            await page.wait_for_load_state('load')
+            return payload
+    finally:
+        await pool.close()
+
+
+def test_captures_feed_and_skips_heavy_resources(stub_server):
+    url = f"http://127.0.0.1:{stub_server.server_address[1]}/"
+    try:
+        payload = asyncio.run(_load_stub_page(url))
+    except Exception as e:
+        if "Executable doesn't exist" in str(e) or 'playwright install' in str(e):
+            pytest.skip("Chromium is not installed for Playwright")
+        raise
+
+    assert payload == {'leagueSchedule': {'gameDates': []}}
+    assert '/' in stub_server.seen
+    assert any(FEED_PATTERN.search(path) for path in stub_server.seen)
+    assert not {'/logo.png', '/clip.mp4', '/font.woff2'} & set(stub_server.seen)
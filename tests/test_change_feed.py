@@ -0,0 +1,90 @@
+# tests/test_change_feed.py
+# market_delta against a mongomock change log: when a client must reload everything, and
+# what a market sees of scrape and rule changes.
+
+from datetime import date, datetime
+
+import pytest
+
+from src.api import change_feed
+from src.api.change_feed import CHANGES_COLLECTION, market_delta, record_change
+
+START, END = date(2025, 12, 1), date(2025, 12, 7)
+
+
+def _game(game_id, game_date, **fields):
+    day = date.fromisoformat(game_date)
+    return {'_id': game_id, 'sport': 'NBA', 'date_str': game_date, 'game_date': game_date,
+            'start_utc': datetime(day.year, day.month, day.day, 23, 30), 'time_tbd': False,
+            'away_team': 'Celtics', 'home_team': 'Lakers', 'national_broadcasts': [], 'regional_map': {}, **fields}
+
+
+@pytest.fixture
+def db(mongo_db, monkeypatch):
+    monkeypatch.setattr(change_feed, 'CHANGE_LOG_FILE', '')
+    monkeypatch.setattr(change_feed, 'CHANGE_LOG_ENABLED', True)
+    mongo_db.schedules.insert_many([_game('g1', '2025-12-02'), _game('g2', '2025-12-03', home_team='Knicks'),
+                                    _game('g3', '2025-12-05')])
+    mongo_db.dma_rules.insert_many([
+        {'dma_code': '501', 'sport': 'NBA', 'team_name': 'Knicks', 'local_channel': 'MSG'},
+        {'dma_code': '803', 'sport': 'NBA', 'team_name': 'Lakers', 'local_channel': 'Spectrum SportsNet'},
+    ])
+    return mongo_db
+
+
+def _ids(delta):
+    return [game['game_id'] for game in delta['changed']]
+
+
+def test_up_to_date_and_reset_log(db):
+    assert market_delta(db, '803', 0, START, END) == {'version': 0, 'changed': [], 'removed': []}
+    record_change(db, 'NBA scrape', ['g1'])
+    assert market_delta(db, '803', 1, START, END) == {'version': 1, 'changed': [], 'removed': []}
+    # The client synced against a log that has since been reset
+    assert market_delta(db, '803', 5, START, END) is None
+
+
+def test_expired_entries_force_a_reload(db):
+    for game_id in ('g1', 'g2', 'g3'):
+        record_change(db, 'NBA scrape', [game_id])
+    db[CHANGES_COLLECTION].delete_many({'seq': {'$lte': 2}})  # TTL-expired
+    assert market_delta(db, '803', 0, START, END) is None
+    assert market_delta(db, '803', 1, START, END) is None
+    assert _ids(market_delta(db, '803', 2, START, END)) == ['g3']
+
+
+def test_too_many_entries_force_a_reload(db, monkeypatch):
+    monkeypatch.setattr(change_feed, 'MAX_DELTA_ENTRIES', change_feed.READ_LIMIT)
+    for _ in range(change_feed.READ_LIMIT):
+        record_change(db, 'NBA scrape', ['g1'])
+    delta = market_delta(db, '803', 0, START, END)
+    assert delta['version'] == change_feed.READ_LIMIT and _ids(delta) == ['g1']
+
+    record_change(db, 'NBA scrape', ['g2'])
+    assert market_delta(db, '803', 0, START, END) is None
+    assert _ids(market_delta(db, '803', 1, START, END)) == ['g1', 'g2']
+
+
+def test_rescheduled_and_deleted_games_are_removed(db):
+    record_change(db, 'NBA scrape', ['g1', 'g2'])
+    db.schedules.update_one({'_id': 'g1'}, {'$set': {'game_date': '2025-12-09', 'start_utc': datetime(2025, 12, 9, 23, 30)}})
+    record_change(db, 'NBA scrape', ['g3'])
+    db.schedules.delete_one({'_id': 'g3'})
+
+    delta = market_delta(db, '501', 0, START, END)
+    assert delta['version'] == 2
+    assert _ids(delta) == ['g2'] and delta['changed'][0]['local_channel'] == 'MSG'
+    assert delta['removed'] == ['g1', 'g3']
+
+
+def test_rule_changes_only_reach_their_market(db):
+    record_change(db, 'rule save', ['g2'], dma_codes=['501'])
+    record_change(db, 'rule save', ['g1', 'g3'], dma_codes=['803'])
+
+    delta = market_delta(db, '501', 0, START, END)
+    assert (delta['version'], _ids(delta), delta['removed']) == (2, ['g2'], [])
+    delta = market_delta(db, '803', 0, START, END)
+    assert _ids(delta) == ['g1', 'g3'] and {game['local_channel'] for game in delta['changed']} == {'Spectrum SportsNet'}
+    # National-only clients and other markets are unaffected by rule changes
+    assert market_delta(db, None, 0, START, END) == {'version': 2, 'changed': [], 'removed': []}
+    assert market_delta(db, '602', 0, START, END) == {'version': 2, 'changed': [], 'removed': []}
@@ -0,0 +1,88 @@
+# tests/test_dma_import.py
+# A dry run and the real import of the same file must report the same changes (mongomock).
+
+import io
+
+import mongomock
+import pytest
+
+from src.scraper.dma_import import import_rules, iter_rows
+
+CSV = """dma_code,team,sport,channel
+803,Los Angeles Lakers,nba,Spectrum SportsNet
+803,Lakers,NBA,Spectrum SportsNet LA
+506,Boston Celtics,NBA,NBC Sports Boston
+506,Celtics,NBA,NBCSB
+501,Knicks,NBA,
+,Nets,NBA,YES
+501,Nets,NBA,YES Network
+803,LAL,NBA,Spectrum SportsNet LA
+501,Man Utd,epl,USA Network
+501,Manchester United,EPL,Peacock
+602,Bulls,NBA,CHSN
+"""
+
+
+def _seeded_db():
+    db = mongomock.MongoClient().watchwherelive_db
+    db.dma_rules.insert_many([
+        {'dma_code': '506', 'team_name': 'Celtics', 'sport': 'NBA', 'local_channel': 'NBC Sports Boston'},
+        {'dma_code': '602', 'team_name': 'Bulls', 'sport': 'NBA', 'local_channel': 'CHSN'},
+    ])
+    return db
+
+
+def _run(db, dry_run, batch_size=3):
+    report = import_rules(db, iter_rows(io.StringIO(CSV, newline=''), 'csv'), dry_run=dry_run, batch_size=batch_size)
+    rules = [{k: v for k, v in rule.items() if k != 'last_updated'} for rule in report.pop('changed_rules')]
+    return report, rules
+
+
+def _rules(db):
+    return sorted((r['dma_code'], r['team_name'], r['sport'], r['local_channel']) for r in db.dma_rules.find())
+
+
+@pytest.mark.parametrize('batch_size', [1, 3, 100])
+def test_dry_run_reports_what_the_import_does(batch_size):
+    db = _seeded_db()
+    before = _rules(db)
+    dry, dry_rules = _run(db, dry_run=True, batch_size=batch_size)
+    assert _rules(db) == before
+
+    real, real_rules = _run(db, dry_run=False, batch_size=batch_size)
+    assert dry.pop('dry_run') is True and real.pop('dry_run') is False
+    assert dry == real
+    assert dry_rules == real_rules
+
+    assert (real['rows'], real['failed']) == (11, 2)
+    assert [error['row'] for error in real['errors']] == [6, 7]
+    assert 'channel' in real['errors'][0]['error'] and 'dma_code' in real['errors'][1]['error']
+    assert _rules(db) == [
+        ('501', 'Manchester United', 'EPL', 'Peacock'),
+        ('501', 'Nets', 'NBA', 'YES Network'),
+        ('506', 'Celtics', 'NBA', 'NBCSB'),
+        ('602', 'Bulls', 'NBA', 'CHSN'),
+        ('803', 'Lakers', 'NBA', 'Spectrum SportsNet LA'),
+    ]
+    # Nothing is left to change (one batch, so rows repeating a key do not replay intermediate channels)
+    again, _ = _run(db, dry_run=True, batch_size=100)
+    assert (again['inserted'], again['updated'], again['diff']) == (0, 0, [])
+
+
+def test_rows_colliding_on_the_canonical_name():
+    # In one batch the last row per canonical key wins and is the only change reported
+    dry, _ = _run(_seeded_db(), dry_run=True, batch_size=100)
+    assert (dry['inserted'], dry['updated'], dry['unchanged']) == (3, 1, 1)
+    assert [(change['row'], change['change'], change['team'], change['old_channel'], change['new_channel'])
+            for change in dry['diff']] == [
+        (9, 'insert', 'Lakers', None, 'Spectrum SportsNet LA'),
+        (5, 'update', 'Celtics', 'NBC Sports Boston', 'NBCSB'),
+        (8, 'insert', 'Nets', None, 'YES Network'),
+        (11, 'insert', 'Manchester United', None, 'Peacock'),
+    ]
+
+    # Split across batches, a key seen in an earlier batch of the dry run is an update, not a second insert
+    dry, _ = _run(_seeded_db(), dry_run=True, batch_size=1)
+    lakers = [(change['row'], change['change'], change['old_channel']) for change in dry['diff'] if change['team'] == 'Lakers']
+    assert lakers == [(2, 'insert', None), (3, 'update', 'Spectrum SportsNet')]
+    assert (dry['inserted'], dry['updated'], dry['unchanged']) == (3, 3, 3)
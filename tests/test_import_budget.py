@@ -0,0 +1,19 @@
+# tests/test_import_budget.py
+# Cold-start gate for the serverless entry points: fails when a module goes over its import-time
+# budget or loads a package that must stay lazy. Slower runners scale budgets with
+# IMPORT_BUDGET_SCALE (e.g. 2), as for the CLI: python -m src.bench.import_budget
+
+import pytest
+
+from src.bench.import_budget import BUDGET_SCALE, BUDGETS, check
+
+
+@pytest.mark.parametrize('module', sorted(BUDGETS))
+def test_import_within_budget(module):
+    budget_ms, forbidden = BUDGETS[module]
+    report = check(module, budget_ms * BUDGET_SCALE, forbidden, runs=3)
+
+    assert not report['forbidden_loaded'], f"{module} loads {', '.join(report['forbidden_loaded'])}"
+    heaviest = ', '.join(f"{name} {ms:.0f} ms" for ms, name in report['children'][:5])
+    assert report['ms'] <= report['budget_ms'], \
+        f"{module} imports in {report['ms']} ms, over its {report['budget_ms']:.0f} ms budget ({heaviest})"
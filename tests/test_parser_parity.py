@@ -0,0 +1,125 @@
+# tests/test_parser_parity.py
+# The lxml and BeautifulSoup engines must produce identical game dicts from the same page, and
+# both must match the output of the original BeautifulSoup parser on a fixed page.
+
+import pytest
+
+pytest.importorskip('lxml')
+pytest.importorskip('bs4')
+
+from src.bench.synthetic_pages import epl_schedule_page, nba_schedule_page
+from src.scraper.epl_scraper import parse_epl_schedule
+from src.scraper.nba_scraper import parse_nba_schedule
+
+
+def _without_timestamps(games: list) -> list:
+    # last_updated is the parse time, so it differs between the two runs
+    return [{k: v for k, v in game.items() if k != 'last_updated'} for game in games]
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_nba_engines_match(seed):
+    page = nba_schedule_page(days=20, games=12, seed=seed)
+    lxml_games = parse_nba_schedule(page, engine='lxml')
+    soup_games = parse_nba_schedule(page, engine='soup')
+    assert lxml_games
+    assert lxml_games == soup_games
+
+
+def test_nba_engines_match_on_cup_and_tbd_games():
+    page = (
+        '<div class="ScheduleDay_sd__GFE_w"><h4 class="ScheduleDay_sdDay__3s2Xt">Tuesday, December 9</h4>'
+        # NBA Cup game with known teams, NBA Cup game still TBD, and a plain TBD game (skipped)
+        '<div class="ScheduleGame_sg__RmD9I"><p class="ScheduleGame_sgLabel__wkprj">Emirates NBA Cup</p>'
+        '<p class="ScheduleGame_sgFigtext__gYud6">Knicks:</p><p class="ScheduleGame_sgFigtext__gYud6">Magic</p>'
+        '<div class="Broadcasters_base__Wet1u"><img class="Broadcasters_icon__82MTV" title="ESPN"></div></div>'
+        '<div class="ScheduleGame_sg__RmD9I"><p class="ScheduleGame_sgLabel__wkprj">Emirates NBA Cup</p></div>'
+        '<div class="ScheduleGame_sg__RmD9I"><span class="ScheduleStatusText_base__Jgvjb">TBD</span></div>'
+        '</div>'
+    )
+    lxml_games = parse_nba_schedule(page, engine='lxml')
+    assert [game['_id'] for game in lxml_games] == ['TuesdayDecember9_NYK_ORL', 'TuesdayDecember9_TBD_Game']
+    assert lxml_games == parse_nba_schedule(page, engine='soup')
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_epl_engines_match(seed):
+    page = epl_schedule_page(days=15, games=8, seed=seed)
+    lxml_games = parse_epl_schedule(page, engine='lxml')
+    soup_games = parse_epl_schedule(page, engine='soup')
+    assert lxml_games
+    assert _without_timestamps(lxml_games) == _without_timestamps(soup_games)
+
+
+# A fixed page per source and the games the original parser returned for it. Only the game IDs
+# and the EPL team names differ from that output: they now come from the team registry.
+NBA_PAGE = (
+    '<div class="ScheduleDay_sd__GFE_w"><h4 class="ScheduleDay_sdDay__3s2Xt">Saturday, December 6</h4>'
+    '<div class="ScheduleGame_sg__RmD9I"><span class="ScheduleStatusText_base__Jgvjb">7:30 pm ET</span>'
+    '<a class="Anchor_anchor__cSc3P Link_styled__okbXW" href="/team/celtics">Celtics</a><span> @ </span>'
+    '<a class="Anchor_anchor__cSc3P Link_styled__okbXW" href="/team/lakers">Lakers</a>'
+    '<div class="Broadcasters_base__Wet1u"><img class="Broadcasters_icon__82MTV" title="ESPN">'
+    '<img class="Broadcasters_icon__82MTV" title="ESPN"><img class="Broadcasters_icon__82MTV" title="LEAGUE PASS">'
+    '<p class="Broadcasters_title__B1dGd">TV</p><p><a class="Broadcasters_tv__AIeZb" href="#">Spectrum SportsNet</a></p>'
+    '</div></div>'
+    '<div class="ScheduleGame_sg__RmD9I">'
+    '<a class="Anchor_anchor__cSc3P Link_styled__okbXW" href="/team/trail-blazers">Trail Blazers</a><span> @ </span>'
+    '<a class="Anchor_anchor__cSc3P Link_styled__okbXW" href="/team/heat">Heat</a>'
+    '<div class="Broadcasters_base__Wet1u"></div></div>'
+    '</div>'
+    '<div class="ScheduleDay_sd__GFE_w"><h4 class="ScheduleDay_sdDay__3s2Xt">Tuesday, December 9</h4>'
+    '<div class="ScheduleGame_sg__RmD9I"><p class="ScheduleGame_sgLabel__wkprj">Emirates NBA Cup</p>'
+    '<span class="ScheduleStatusText_base__Jgvjb">TBD</span>'
+    '<p class="ScheduleGame_sgFigtext__gYud6">Knicks:</p><p class="ScheduleGame_sgFigtext__gYud6">Magic</p>'
+    '<div class="Broadcasters_base__Wet1u"><img class="Broadcasters_icon__82MTV" title="Prime Video">'
+    '<p class="Broadcasters_title__B1dGd">TV</p><p><span class="Broadcasters_tv__AIeZb">MSG</span></p></div></div>'
+    '<div class="ScheduleGame_sg__RmD9I"><span class="ScheduleStatusText_base__Jgvjb">TBD</span></div>'
+    '</div>'
+)
+
+EPL_PAGE = (
+    '<div class="schedule"><h3 class="text-stvsDate font-bold">Saturday, December 6</h3><ul>'
+    '<li><div class="flex"><span class="text-stvsMatchHour">10:00 AM ET</span>'
+    '<h4 class="text-stvsMatchTitle">Arsenal vs. Chelsea (Premier League)</h4>'
+    '<div class="flex flex-wrap gap-[3px_5px]">'
+    '<div class="text-stvsProviderLink"><a href="#">USA Network</a><a href="#">USA Network</a></div>'
+    '<div class="text-stvsProviderLink"><a href="#">Peacock Online</a></div>'
+    '<div class="text-stvsProviderLink"><a href="#">fubo</a></div></div></div></li>'
+    '<li><div class="flex"><h4 class="text-stvsMatchTitle">Man. United vs. Palace (Premier League)</h4>'
+    '<div class="flex flex-wrap gap-[3px_5px]"><div class="text-stvsProviderLink"><a href="#">NBC</a></div></div></div></li>'
+    '<li><div class="flex"><h4 class="text-stvsMatchTitle">Highlights show</h4></div></li>'
+    '</ul></div>'
+)
+
+NBA_EXPECTED = [
+    {'_id': 'SaturdayDecember6_BOS_LAL', 'sport': 'NBA', 'date_str': 'Saturday, December 6',
+     'time_status': '7:30 pm ET', 'away_team': 'Celtics', 'home_team': 'Lakers', 'national_broadcasts': ['ESPN'],
+     'regional_broadcast_placeholder': 'Spectrum SportsNet', 'regional_map': {}, 'is_validated': False},
+    {'_id': 'SaturdayDecember6_POR_MIA', 'sport': 'NBA', 'date_str': 'Saturday, December 6',
+     'time_status': 'Final/TBD', 'away_team': 'Trail Blazers', 'home_team': 'Heat', 'national_broadcasts': [],
+     'regional_broadcast_placeholder': '', 'regional_map': {}, 'is_validated': False},
+    {'_id': 'TuesdayDecember9_NYK_ORL', 'sport': 'NBA', 'date_str': 'Tuesday, December 9',
+     'time_status': 'TBD', 'away_team': 'Knicks', 'home_team': 'Magic', 'national_broadcasts': ['Prime Video'],
+     'regional_broadcast_placeholder': 'MSG', 'regional_map': {}, 'is_validated': False},
+]
+
+EPL_EXPECTED = [
+    {'game_id': 'EPL_ARS_vs_CHE_saturdaydecember6', 'sport': 'EPL', 'league': 'Premier League',
+     'date_str': 'Saturday, December 6', 'time_str_et': '10:00 AM ET', 'away_team': 'Arsenal', 'home_team': 'Chelsea',
+     'matchup': 'Arsenal vs Chelsea', 'national_broadcasts': ['Peacock', 'USA Network'],
+     'regional_broadcast_placeholder': '', 'regional_map': {}, 'is_validated': False},
+    {'game_id': 'EPL_MUN_vs_CRY_saturdaydecember6', 'sport': 'EPL', 'league': 'Premier League',
+     'date_str': 'Saturday, December 6', 'time_str_et': 'TBD', 'away_team': 'Manchester United',
+     'home_team': 'Crystal Palace', 'matchup': 'Manchester United vs Crystal Palace', 'national_broadcasts': ['NBC'],
+     'regional_broadcast_placeholder': '', 'regional_map': {}, 'is_validated': False},
+]
+
+
+@pytest.mark.parametrize('engine', ['lxml', 'soup'])
+def test_nba_engines_match_the_original_output(engine):
+    assert parse_nba_schedule(NBA_PAGE, engine=engine) == NBA_EXPECTED
+
+
+@pytest.mark.parametrize('engine', ['lxml', 'soup'])
+def test_epl_engines_match_the_original_output(engine):
+    assert _without_timestamps(parse_epl_schedule(EPL_PAGE, engine=engine)) == EPL_EXPECTED
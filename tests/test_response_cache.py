@@ -0,0 +1,116 @@
+# tests/test_response_cache.py
+# The response cache against mongomock: ETag revalidation, generation-based invalidation of
+# both layers, and the JSON-only disk backend.
+
+import os
+import pickle
+import time
+
+import mongomock
+import pytest
+from flask import Flask, jsonify
+
+from src.api import cache_generation, response_cache
+from src.api.cache_generation import bump_generation
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock.MongoClient().watchwherelive_db
+    monkeypatch.setattr(response_cache, 'get_mongo_client', lambda: database)
+    monkeypatch.setattr(response_cache, 'CACHE_ENABLED', True)
+    monkeypatch.setattr(response_cache, '_memory', response_cache.MemoryBackend())
+    monkeypatch.setattr(response_cache, '_shared', None)
+    monkeypatch.setattr(cache_generation, '_generation', {'value': None, 'checked_at': 0.0})
+    return database
+
+
+@pytest.fixture
+def app(db):
+    app = Flask(__name__)
+    app.calls = 0
+
+    @app.route('/games')
+    @response_cache.cached_response(public=True)
+    def games():
+        app.calls += 1
+        return jsonify({'call': app.calls})
+
+    return app
+
+
+def test_etag_revalidation_returns_304(app):
+    client = app.test_client()
+    first = client.get('/games')
+    assert first.status_code == 200 and first.json == {'call': 1}
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == f"public, max-age={response_cache.CACHE_MAX_AGE}"
+
+    revalidated = client.get('/games', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304 and revalidated.data == b''
+    assert revalidated.headers['ETag'] == etag
+    assert client.get('/games', headers={'If-None-Match': f'"other", W/{etag}'}).status_code == 304
+
+    stale = client.get('/games', headers={'If-None-Match': '"other"'})
+    assert stale.status_code == 200 and stale.json == {'call': 1}
+    assert app.calls == 1
+
+
+def test_generation_bump_invalidates_both_layers(app, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, '_shared', response_cache.DiskBackend(str(tmp_path / 'responses')))
+    client = app.test_client()
+    etag = client.get('/games').headers['ETag']
+
+    # A fresh process (empty L1) is served from L2
+    response_cache._memory.clear()
+    assert client.get('/games').json == {'call': 1}
+
+    bump_generation(db, 'test')
+    response = client.get('/games', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.json == {'call': 2}
+    response_cache._memory.clear()
+    assert client.get('/games').json == {'call': 2}
+    assert app.calls == 2
+
+
+def test_cache_key_reads_the_generation(db, monkeypatch):
+    key = response_cache.cache_key('GET', '/games', [('zip', '10001'), ('sport', 'NBA')])
+    assert key == '0|GET|/games|sport=NBA&zip=10001'
+    assert response_cache.cache_key('GET', '/games', [('sport', 'NBA'), ('zip', '10001')]) == key
+
+    post_key = response_cache.cache_key('POST', '/games', [], b'{"a": 1}')
+    assert post_key != response_cache.cache_key('POST', '/games', [], b'{"a": 2}')
+
+    # A bump from another process is picked up once the local read is older than the check interval
+    db[cache_generation.GENERATION_COLLECTION].update_one(
+        {'_id': cache_generation.GENERATION_ID}, {'$set': {'value': 7}}, upsert=True)
+    monkeypatch.setattr(cache_generation, 'GENERATION_CHECK_INTERVAL', 0.0)
+    assert response_cache.cache_key('GET', '/games', []).startswith('7|')
+
+    monkeypatch.setattr(response_cache, 'get_mongo_client', lambda: None)
+    assert response_cache.cache_key('GET', '/games', []) is None
+
+
+def test_disk_backend_stores_json_in_a_private_directory(tmp_path):
+    directory = tmp_path / 'responses'
+    backend = response_cache.DiskBackend(str(directory))
+    assert directory.stat().st_mode & 0o777 == 0o700
+
+    entry = {'body': b'\x00{"games": []}', 'status': 200, 'mimetype': 'application/json', 'etag': '"abc"'}
+    backend.set('k', entry, 60)
+    assert backend.get('k') == entry
+    backend.set('expired', entry, -1)
+    assert backend.get('expired') is None
+
+    # Anything that is not our JSON (e.g. a planted pickle) is a miss, never unpickled
+    with open(backend._path('k'), 'wb') as f:
+        pickle.dump((time.time() + 60, entry), f)
+    assert backend.get('k') is None
+
+
+def test_disk_backend_refuses_a_shared_directory(tmp_path):
+    directory = tmp_path / 'shared'
+    directory.mkdir()
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        response_cache.DiskBackend(str(directory))
@@ -0,0 +1,101 @@
+# tests/test_schedule_dates.py
+# Year inference for yearless day headers, time parsing, and EST/EDT in the stored UTC fields.
+
+from datetime import date, datetime, time
+
+import mongomock
+import pytest
+
+from src.scraper.schedule_dates import eastern_day_bounds, infer_game_date, parse_game_time, schedule_fields
+from src.scraper.schedule_store import upsert_games
+
+
+@pytest.mark.parametrize('date_str, today, expected', [
+    # December header seen in early January belongs to the year before, and vice versa
+    ('Thursday, December 31', date(2027, 1, 2), date(2026, 12, 31)),
+    ('Friday, January 1', date(2026, 12, 28), date(2027, 1, 1)),
+    ('Fri Jan 1st', date(2026, 12, 28), date(2027, 1, 1)),
+    ('Saturday 2 January', date(2026, 12, 28), date(2027, 1, 2)),
+    # An explicit year wins over inference
+    ('Saturday, December 6, 2025', date(2027, 6, 1), date(2025, 12, 6)),
+])
+def test_infers_year_across_rollover(date_str, today, expected):
+    assert infer_game_date(date_str, today) == expected
+
+
+def test_weekday_picks_the_matching_year():
+    today = date(2026, 10, 17)
+    # December 6 is a Saturday in 2025 only; without a weekday the nearest year wins
+    assert infer_game_date('Saturday, December 6', today) == date(2025, 12, 6)
+    assert infer_game_date('December 6', today) == date(2026, 12, 6)
+    # October 20 is a Monday in 2025, a Tuesday in 2026 and a Wednesday in 2027
+    assert infer_game_date('Monday, October 20', today) == date(2025, 10, 20)
+    assert infer_game_date('Wednesday, October 20', today) == date(2027, 10, 20)
+    # No candidate year matches the weekday (a misprinted header): fall back to the nearest date
+    assert infer_game_date('Friday, October 20', today) == date(2026, 10, 20)
+
+
+def test_unparseable_headers():
+    assert infer_game_date('', date(2026, 1, 1)) is None
+    assert infer_game_date('Tomorrow', date(2026, 1, 1)) is None
+    assert infer_game_date('Monday, February 30, 2026', date(2026, 1, 1)) is None
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('7:30 pm ET', time(19, 30)),
+    ('7:30PMET', time(19, 30)),
+    ('10 a.m.', time(10, 0)),
+    ('12:00 pm ET', time(12, 0)),
+    ('12:15 am', time(0, 15)),
+    ('19:30', time(19, 30)),
+    ('TBD', None),
+    ('Final', None),
+    ('Final/OT', None),
+    ('Q3 5:32', None),
+    (None, None),
+])
+def test_parse_game_time(text, expected):
+    assert parse_game_time(text) == expected
+
+
+def test_dst_transitions():
+    # Spring forward (Sunday, March 8 2026): 7:30 pm is EST the day before, EDT on the day
+    before = schedule_fields('Saturday, March 7', '7:30 pm ET', date(2026, 3, 1))
+    after = schedule_fields('Sunday, March 8', '7:30 pm ET', date(2026, 3, 1))
+    assert before['start_utc'] == datetime(2026, 3, 8, 0, 30)
+    assert before['date_utc'] == '2026-03-08' and before['game_date'] == '2026-03-07'
+    assert after['start_utc'] == datetime(2026, 3, 8, 23, 30)
+    assert eastern_day_bounds(date(2026, 3, 8), date(2026, 3, 8)) == (datetime(2026, 3, 8, 5), datetime(2026, 3, 9, 4))
+
+    # Fall back (Sunday, November 1 2026): EDT before, EST from the day on
+    before = schedule_fields('Saturday, October 31', '1:00 pm ET', date(2026, 10, 17))
+    after = schedule_fields('Sunday, November 1', '1:00 pm ET', date(2026, 10, 17))
+    assert before['start_utc'] == datetime(2026, 10, 31, 17, 0)
+    assert after['start_utc'] == datetime(2026, 11, 1, 18, 0)
+    assert eastern_day_bounds(date(2026, 11, 1), date(2026, 11, 1)) == (datetime(2026, 11, 1, 4), datetime(2026, 11, 2, 5))
+
+
+def test_tbd_start_is_eastern_midnight():
+    fields = schedule_fields('Saturday, March 7', 'TBD', date(2026, 3, 1))
+    assert fields == {'game_date': '2026-03-07', 'start_utc': datetime(2026, 3, 7, 5), 'date_utc': '2026-03-07',
+                      'time_utc': None, 'time_tbd': True}
+    assert schedule_fields('Someday', '7:30 pm ET') == {}
+
+
+@pytest.mark.parametrize('status', ['Final', 'TBD', 'Q3 5:32'])
+def test_status_without_time_keeps_the_earlier_start(status):
+    collection = mongomock.MongoClient().db.schedules
+    game = {'_id': 'g1', 'sport': 'NBA', 'date_str': 'Saturday, December 6, 2025', 'time_status': '7:30 pm ET',
+            'away_team': 'Celtics', 'home_team': 'Lakers', 'regional_map': {}, 'is_validated': False}
+    upsert_games(collection, [game], key='_id')
+
+    upsert_games(collection, [{**game, 'time_status': status}], key='_id')
+    stored = collection.find_one({'_id': 'g1'})
+    assert stored['time_status'] == status
+    assert stored['start_utc'] == datetime(2025, 12, 7, 0, 30)
+    assert stored['time_tbd'] is False
+
+    # A new day does reset the time
+    upsert_games(collection, [{**game, 'date_str': 'Sunday, December 7, 2025', 'time_status': status}], key='_id')
+    stored = collection.find_one({'_id': 'g1'})
+    assert stored['game_date'] == '2025-12-07' and stored['time_tbd'] is True
@@ -0,0 +1,84 @@
+# tests/test_schedule_history.py
+# Rebuilding a game as of a point in time from its history segments (mongomock), including
+# across the checkpoint that starts each new segment.
+
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from src.scraper.schedule_history import HISTORY_COLLECTION, SEGMENT_SIZE, game_as_of, game_changes, record_history
+from src.scraper.schedule_store import upsert_games
+
+T0 = datetime(2025, 12, 1, 12, 0)
+UPDATES = SEGMENT_SIZE * 2 + 5
+
+
+def _game(i):
+    return {'_id': 'SaturdayDecember6_BOS_LAL', 'sport': 'NBA', 'date_str': 'Saturday, December 6, 2025',
+            'time_status': '7:30 pm ET', 'away_team': 'Celtics', 'home_team': 'Lakers',
+            'national_broadcasts': [f'NET{i}'], 'regional_broadcast_placeholder': 'NBCSB' if i % 2 else 'Spectrum',
+            'regional_map': {}, 'is_validated': False}
+
+
+def _at(i):
+    return T0 + timedelta(minutes=i)
+
+
+@pytest.fixture(scope='module')
+def db():
+    db = mongomock.MongoClient().watchwherelive_db
+    for i in range(UPDATES + 1):  # one insert, then UPDATES updates
+        counts = upsert_games(db.schedules, [_game(i)], key='_id')
+        assert record_history(db, 'schedules', counts['field_changes'], key='_id', at=_at(i)) == 1
+    return db
+
+
+def test_segments_roll_over(db):
+    segments = list(db[HISTORY_COLLECTION].find({}).sort('seg', 1))
+    assert [segment['seg'] for segment in segments] == [0, 1, 2]
+    assert [segment['open'] for segment in segments] == [False, False, True]
+    assert segments[0]['count'] == SEGMENT_SIZE
+    # Each later segment starts with a checkpoint at the previous segment's last entry
+    assert segments[1]['first_at'] == segments[0]['last_at'] == _at(SEGMENT_SIZE - 1)
+
+
+@pytest.mark.parametrize('i', [0, 1, SEGMENT_SIZE // 2, SEGMENT_SIZE - 1, SEGMENT_SIZE, SEGMENT_SIZE + 1,
+                               2 * SEGMENT_SIZE - 2, 2 * SEGMENT_SIZE - 1, UPDATES])
+def test_game_as_of(db, i):
+    expected = _game(i)
+    state = game_as_of(db, 'schedules', expected['_id'], _at(i))
+    assert state['national_broadcasts'] == expected['national_broadcasts']
+    assert state['regional_broadcast_placeholder'] == expected['regional_broadcast_placeholder']
+    assert state['start_utc'] == datetime(2025, 12, 7, 0, 30)
+    # Just before the next write the game is still in the same state
+    assert game_as_of(db, 'schedules', expected['_id'], _at(i) + timedelta(seconds=59)) == state
+    assert 'regional_map' not in state and 'is_validated' not in state
+
+
+def test_game_as_of_before_the_insert_and_latest(db):
+    game_id = _game(0)['_id']
+    assert game_as_of(db, 'schedules', game_id, T0 - timedelta(seconds=1)) is None
+    assert game_as_of(db, 'schedules', game_id)['national_broadcasts'] == [f'NET{UPDATES}']
+    assert game_as_of(db, 'schedules', 'unknown') is None
+
+
+def test_game_changes_skip_checkpoints(db):
+    changes = game_changes(db, 'schedules', _game(0)['_id'])
+    assert [change['kind'] for change in changes] == ['insert'] + ['update'] * UPDATES
+    assert [change['at'] for change in changes] == [_at(i) for i in range(UPDATES + 1)]
+    assert changes[SEGMENT_SIZE]['changes']['national_broadcasts'] == {
+        'from': [f'NET{SEGMENT_SIZE - 1}'], 'to': [f'NET{SEGMENT_SIZE}']}
+
+    recent = game_changes(db, 'schedules', _game(0)['_id'], since=_at(UPDATES - 1))
+    assert [change['at'] for change in recent] == [_at(UPDATES - 1), _at(UPDATES)]
+
+
+def test_history_of_a_game_that_predates_it():
+    db = mongomock.MongoClient().watchwherelive_db
+    upsert_games(db.schedules, [_game(0)], key='_id')  # written before history was recorded
+    counts = upsert_games(db.schedules, [_game(1)], key='_id')
+    record_history(db, 'schedules', counts['field_changes'], key='_id', at=_at(1))
+
+    assert game_as_of(db, 'schedules', _game(0)['_id'], _at(1))['national_broadcasts'] == ['NET1']
+    assert [change['kind'] for change in game_changes(db, 'schedules', _game(0)['_id'])] == ['base', 'update']
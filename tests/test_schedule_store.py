@@ -0,0 +1,82 @@
+# tests/test_schedule_store.py
+# upsert_games against mongomock: what counts as a change, and which fields a re-scrape may touch.
+
+from datetime import datetime
+
+import mongomock
+
+from src.scraper.schedule_store import HASH_FIELD, backfill_schedule_fields, compute_content_hash, upsert_games
+
+
+def _game(game_id, **fields):
+    game = {'game_id': game_id, 'sport': 'NBA', 'date_str': 'Saturday, December 6, 2025', 'time_status': '7:30 pm ET',
+            'away_team': 'Celtics', 'home_team': 'Lakers', 'national_channels': ['ESPN'],
+            'regional_map': {}, 'is_validated': False, 'last_updated': datetime(2025, 12, 1)}
+    game.update(fields)
+    return game
+
+
+def _collection():
+    return mongomock.MongoClient().db.nba_schedule
+
+
+def test_inserted_modified_unchanged_counts():
+    collection = _collection()
+    counts = upsert_games(collection, [_game('a'), _game('b'), _game('c')])
+    assert (counts['inserted'], counts['modified'], counts['unchanged'], counts['total']) == (3, 0, 0, 3)
+    assert [game['game_id'] for game in counts['changed_games']] == ['a', 'b', 'c']
+    assert all(change['before'] is None for change in counts['field_changes'])
+
+    counts = upsert_games(collection, [_game('a'), _game('b', national_channels=['TNT']), _game('d')])
+    assert (counts['inserted'], counts['modified'], counts['unchanged'], counts['total']) == (1, 1, 1, 3)
+    assert [game['game_id'] for game in counts['changed_games']] == ['b', 'd']
+    change = counts['field_changes'][0]
+    assert change['game_id'] == 'b' and change['set'] == {'national_channels': ['TNT']}
+    assert change['before']['national_channels'] == ['ESPN']
+
+    # Duplicates within one call: the later one wins
+    counts = upsert_games(collection, [_game('e', away_team='Knicks'), _game('e', away_team='Nets')])
+    assert counts['total'] == 1 and collection.find_one({'game_id': 'e'})['away_team'] == 'Nets'
+
+
+def test_hash_only_update_counts_as_unchanged():
+    collection = _collection()
+    # Stored before the derived date/time fields existed: its hash does not cover them
+    legacy = _game('a')
+    collection.insert_one({**legacy, HASH_FIELD: compute_content_hash(legacy)})
+    assert backfill_schedule_fields(collection) == 1
+
+    counts = upsert_games(collection, [_game('a')])
+    assert (counts['inserted'], counts['modified'], counts['unchanged']) == (0, 0, 1)
+    assert counts['changed_games'] == [] and counts['field_changes'] == []
+    # The hash was still brought up to date, so the next scrape skips the game outright
+    stored = collection.find_one({'game_id': 'a'})
+    assert stored[HASH_FIELD] != compute_content_hash(legacy)
+    assert upsert_games(collection, [_game('a')])['unchanged'] == 1
+
+
+def test_insert_only_fields_are_never_overwritten():
+    collection = _collection()
+    upsert_games(collection, [_game('a')])
+    collection.update_one({'game_id': 'a'}, {'$set': {'regional_map': {'501': 'MSG'}, 'is_validated': True}})
+
+    counts = upsert_games(collection, [_game('a', national_channels=['TNT'])])
+    assert counts['modified'] == 1
+    assert 'regional_map' not in counts['field_changes'][0]['set']
+    stored = collection.find_one({'game_id': 'a'})
+    assert stored['regional_map'] == {'501': 'MSG'} and stored['is_validated'] is True
+    assert stored['national_channels'] == ['TNT']
+
+
+def test_volatile_fields_are_ignored():
+    collection = _collection()
+    upsert_games(collection, [_game('a')])
+
+    counts = upsert_games(collection, [_game('a', last_updated=datetime(2025, 12, 2))])
+    assert (counts['modified'], counts['unchanged'], counts['changed_games']) == (0, 1, [])
+    assert collection.find_one({'game_id': 'a'})['last_updated'] == datetime(2025, 12, 1)
+
+    # ...but are refreshed alongside a real change
+    counts = upsert_games(collection, [_game('a', home_team='Clippers', last_updated=datetime(2025, 12, 3))])
+    assert counts['field_changes'][0]['set'] == {'home_team': 'Clippers'}
+    assert collection.find_one({'game_id': 'a'})['last_updated'] == datetime(2025, 12, 3)
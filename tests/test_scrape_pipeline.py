@@ -0,0 +1,78 @@
+# tests/test_scrape_pipeline.py
+# The staged pipeline with stub fetchers, an in-process parse executor and mongomock: every
+# page is parsed once and every game written once, with overlapping pages and a one-slot queue.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from src.bench.synthetic_pages import epl_schedule_page, nba_schedule_page
+from src.scraper import base_scraper, scrape_pipeline, snapshot_cache
+from src.scraper.epl_scraper import SCRAPER as EPL
+from src.scraper.nba_scraper import SCRAPER as NBA
+from src.scraper.scrape_pipeline import run_pipeline
+from src.scraper.snapshot_cache import split_sections
+
+# Week pages of a crawl overlap: days 0-3, 2-5 and 4-7 of one 8-day schedule
+NBA_SECTIONS = split_sections(nba_schedule_page(days=8, games=2, start=date(2025, 12, 6), seed=4), NBA.section_pattern)
+NBA_PAGES = {f'{NBA.url}/week/{i}': ''.join(NBA_SECTIONS[2 * i:2 * i + 4]) for i in range(3)}
+EPL_PAGES = {EPL.url: epl_schedule_page(days=4, games=3, seed=4)}
+
+
+@pytest.fixture
+def pipeline(mongo_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_cache, 'SNAPSHOT_DIR', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(scrape_pipeline, 'QUEUE_SIZE', 1)
+    parsed, written = [], []
+
+    parse_page = scrape_pipeline.parse_page
+    monkeypatch.setattr(scrape_pipeline, 'parse_page',
+                        lambda scraper, content, url=None: parsed.append(url) or parse_page(scraper, content, url))
+    upsert_games = base_scraper.upsert_games
+    monkeypatch.setattr(base_scraper, 'upsert_games', lambda collection, games, key: written.extend(
+        (collection.name, game[key]) for game in games) or upsert_games(collection, games, key=key))
+
+    def make_fetch(scraper):
+        pages = NBA_PAGES if scraper is NBA else EPL_PAGES
+
+        async def fetch(url):
+            await asyncio.sleep(0)
+            return pages.get(url)
+        return fetch
+
+    def run(urls=None):
+        parsed.clear()
+        written.clear()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return asyncio.run(run_pipeline([NBA, EPL], mongo_db, make_fetch, pool=pool, urls=urls))
+
+    return run, mongo_db, parsed, written
+
+
+def test_each_page_parsed_and_each_game_written_once(pipeline):
+    run, db, parsed, written = pipeline
+    nba, epl = run({'NBA': list(NBA_PAGES)})
+
+    assert sorted(parsed) == sorted([*NBA_PAGES, *EPL_PAGES])
+    assert len(written) == len(set(written))
+    nba_ids = {game_id for collection, game_id in written if collection == NBA.collection}
+    assert len(nba_ids) == 16 and db[NBA.collection].count_documents({}) == 16
+    assert db[EPL.collection].count_documents({}) == 12
+
+    assert (nba['status'], nba['games'], nba['inserted'], nba['duplicates']) == ('ok', 16, 16, 8)
+    assert (epl['status'], epl['games'], epl['inserted']) == ('ok', 12, 12)
+
+    # Same pages again: the snapshots match, so nothing is parsed past the page hash or written
+    nba, epl = run({'NBA': list(NBA_PAGES)})
+    assert written == []
+    assert nba['status'] == epl['status'] == 'unchanged'
+
+
+def test_failed_page_leaves_the_league_partial(pipeline):
+    run, db, parsed, written = pipeline
+    nba, epl = run({'NBA': [*NBA_PAGES, f'{NBA.url}/week/9']})
+    assert nba['status'] == 'partial' and nba['failed_pages'] == [f'{NBA.url}/week/9']
+    assert sorted(parsed) == sorted([*NBA_PAGES, *EPL_PAGES])
+    assert len(written) == len(set(written)) == 16 + 12
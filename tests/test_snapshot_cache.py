@@ -0,0 +1,76 @@
+# tests/test_snapshot_cache.py
+# parse_with_snapshot on synthetic NBA pages: an identical page is not parsed at all, and a
+# page with one changed day section only has that section re-parsed.
+
+import pytest
+
+from src.bench.synthetic_pages import nba_schedule_page
+from src.scraper import snapshot_cache
+from src.scraper.base_scraper import LeagueScraper
+from src.scraper.nba_scraper import SCRAPER as NBA, parse_nba_content
+from src.scraper.snapshot_cache import commit_snapshot, parse_with_snapshot, split_sections
+
+URL = 'https://www.nba.com/schedule'
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_cache, 'SNAPSHOT_DIR', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(snapshot_cache, 'SNAPSHOTS_ENABLED', True)
+    parsed = []
+
+    def parse(content):
+        parsed.append(content)
+        return parse_nba_content(content)
+
+    scraper = LeagueScraper('NBA', URL, None, parse, 'schedules', '_id', NBA.section_pattern)
+    scraper.parsed = parsed
+    return scraper
+
+
+def _parse(scraper, content):
+    scraper.parsed.clear()
+    return parse_with_snapshot(scraper, content)
+
+
+def test_unchanged_page_is_not_parsed(scraper):
+    page = nba_schedule_page(days=5, games=3, seed=1)
+    games, pending = _parse(scraper, page)
+    assert games == parse_nba_content(page) and len(games) == 15
+    assert len(scraper.parsed) == 5  # one parse per day section
+    commit_snapshot(scraper, pending)
+
+    assert _parse(scraper, page) == (None, None)
+    assert scraper.parsed == []
+    assert snapshot_cache.load_snapshot_content(URL) == page
+
+
+def test_only_changed_sections_are_reparsed(scraper):
+    page = nba_schedule_page(days=5, games=3, seed=1)
+    first, pending = _parse(scraper, page)
+    commit_snapshot(scraper, pending)
+
+    sections = split_sections(page, NBA.section_pattern)
+    changed_section = sections[2].replace(' pm ET', ' am ET', 1)
+    assert changed_section != sections[2]
+    changed_page = page.replace(sections[2], changed_section)
+
+    games, pending = _parse(scraper, changed_page)
+    assert scraper.parsed == [changed_section]
+    assert games == parse_nba_content(changed_page)
+    # Games of the other sections come from the snapshot, by section digest
+    changed = [i for i, (old, new) in enumerate(zip(first, games)) if old != new]
+    assert len(changed) == 1 and 6 <= changed[0] < 9
+
+    # Until the new snapshot is committed, the old one stays the reference
+    assert _parse(scraper, changed_page)[0] == games and len(scraper.parsed) == 1
+    commit_snapshot(scraper, pending)
+    assert _parse(scraper, changed_page) == (None, None)
+
+
+def test_feeds_are_cached_whole(scraper):
+    feed = {'leagueSchedule': {'gameDates': []}}
+    games, pending = _parse(scraper, feed)
+    assert games == [] and scraper.parsed == [feed]
+    commit_snapshot(scraper, pending)
+    assert _parse(scraper, dict(feed)) == (None, None)
@@ -0,0 +1,76 @@
+# tests/test_static_export.py
+# The CDN export against mongomock and a tmp directory: unchanged files are skipped by hash,
+# files that dropped out are pruned, and the manifest only moves when content did.
+
+import json
+from datetime import date, datetime
+
+import pytest
+
+from src.api import static_export
+from src.api.schedule_resolver import resolve_locations
+from src.api.static_export import export_static
+
+TODAY = date(2025, 12, 3)  # a Wednesday; the export covers the weeks of Dec 1 and Dec 8
+
+
+def _game(game_id, game_date, start_utc, **fields):
+    return {'_id': game_id, 'game_id': game_id, 'sport': 'NBA', 'date_str': game_date, 'game_date': game_date,
+            'start_utc': start_utc, 'time_tbd': False, 'time_status': '7:30 pm ET', 'away_team': 'Celtics',
+            'home_team': 'Lakers', 'national_broadcasts': [], 'regional_map': {}, **fields}
+
+
+@pytest.fixture
+def db(mongo_db, monkeypatch):
+    monkeypatch.setattr(static_export, '_brotli', lambda: None)
+    mongo_db.schedules.insert_many([
+        _game('g1', '2025-12-02', datetime(2025, 12, 3, 0, 30)),
+        _game('g2', '2025-12-09', datetime(2025, 12, 10, 0, 30), regional_map={'803': 'Spectrum SportsNet'}),
+    ])
+    mongo_db.dma_rules.insert_one({'dma_code': '506', 'sport': 'NBA', 'team_name': 'Celtics', 'local_channel': 'NBCSB'})
+    # ZIPs imported as integers lose their leading zero
+    mongo_db.user_location_map.insert_many([
+        {'_id': 2134, 'dma_code': '506', 'state': 'MA'},
+        {'_id': '90001', 'dma_code': '803', 'state': 'CA'},
+    ])
+    return mongo_db
+
+
+def _read(root, relative_path):
+    return json.loads((root / relative_path).read_text())
+
+
+def test_export_skips_unchanged_files_and_prunes(db, tmp_path):
+    first = export_static(db, str(tmp_path), today=TODAY)
+    assert first['written'] == 8 and first['unchanged'] == 0 and first['removed'] == 0
+
+    manifest = _read(tmp_path, 'manifest.json')
+    assert manifest['weeks'] == ['2025-12-01', '2025-12-08']
+    assert manifest['markets'] == {'506': ['2025-12-01', '2025-12-08'], '803': ['2025-12-08']}
+    assert _read(tmp_path, 'zips/021.json') == {'02134': '506'}
+    assert _read(tmp_path, 'zips/900.json') == {'90001': '803'}
+    assert [g['game_id'] for g in _read(tmp_path, 'schedule/national/2025-12-01.json')['games']] == ['g1']
+    assert _read(tmp_path, 'schedule/803/2025-12-08.json')['games'][0]['local_channel'] == 'Spectrum SportsNet'
+    assert (tmp_path / 'manifest.json.gz').exists()
+
+    # Nothing changed: every file, the manifest included, is left alone
+    second = export_static(db, str(tmp_path), today=TODAY)
+    assert (second['written'], second['unchanged'], second['removed']) == (0, 8, 0)
+    assert second['version'] == first['version']
+
+    # The regional game moves out of the window and a ZIP prefix disappears
+    db.schedules.delete_one({'_id': 'g2'})
+    db.user_location_map.delete_one({'_id': '90001'})
+    third = export_static(db, str(tmp_path), today=TODAY)
+    assert third['version'] != first['version']
+    assert not (tmp_path / 'schedule/803').exists()
+    assert not (tmp_path / 'zips/900.json').exists() and not (tmp_path / 'zips/900.json.gz').exists()
+    assert _read(tmp_path, 'schedule/national/2025-12-08.json')['games'] == []
+    assert _read(tmp_path, 'manifest.json')['markets'] == {'506': ['2025-12-01']}
+    assert third['removed'] == 2 * 3  # 803/2025-12-08, 506/2025-12-08 and zips/900, each with .gz
+
+
+def test_resolve_locations_matches_integer_zips(db):
+    locations = resolve_locations(db, ['02134', '90001', '10001'])
+    assert set(locations) == {'02134', '90001'}
+    assert locations['02134']['_id'] == '02134' and locations['02134']['dma_code'] == '506'
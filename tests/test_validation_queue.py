@@ -0,0 +1,100 @@
+# tests/test_validation_queue.py
+# Keyset paging through the merged validation queue (NBA and EPL collections) against mongomock.
+
+import base64
+
+import pytest
+from bson import ObjectId
+
+from src.scraper import admin_api
+from src.scraper.admin_api import decode_cursor, encode_cursor, read_validation_queue
+
+OID_1, OID_2, OID_3 = ObjectId('65a000000000000000000001'), ObjectId('65a000000000000000000002'), ObjectId('65a000000000000000000003')
+
+NBA_GAMES = [
+    ('SaturdayDecember6_BOS_LAL', '2025-12-06'),
+    ('SaturdayDecember6_POR_MIA', '2025-12-06'),
+    (OID_1, '2025-12-06'),  # written by hand through the admin tools
+    ('SundayDecember7_NYK_ORL', '2025-12-07'),
+    ('TBD_header_game', None),  # day header the date inference could not parse
+    (OID_2, None),
+]
+EPL_GAMES = [
+    (OID_3, '2025-12-06'),
+    ('EPL_ARS_vs_CHE_saturdaydecember6', '2025-12-06'),
+    (ObjectId('65a000000000000000000004'), '2025-12-08'),
+    (ObjectId('65a000000000000000000005'), None),
+]
+
+# MongoDB order: null game_date first, then by date; NBA before EPL on the same date; within a
+# collection strings sort before ObjectIds
+EXPECTED = [
+    'TBD_header_game', str(OID_2), '65a000000000000000000005',
+    'SaturdayDecember6_BOS_LAL', 'SaturdayDecember6_POR_MIA', str(OID_1),
+    'EPL_ARS_vs_CHE_saturdaydecember6', str(OID_3),
+    'SundayDecember7_NYK_ORL',
+    '65a000000000000000000004',
+]
+
+
+@pytest.fixture
+def db(mongo_db):
+    mongo_db.schedules.insert_many(
+        [{'_id': game_id, 'sport': 'NBA', 'game_date': game_date, 'is_validated': False,
+          'regional_broadcast_placeholder': 'NBCSB'} for game_id, game_date in NBA_GAMES]
+        + [{'_id': 'validated', 'game_date': '2025-12-06', 'is_validated': True, 'regional_broadcast_placeholder': 'X'},
+           {'_id': 'national_only', 'game_date': '2025-12-06', 'is_validated': False, 'regional_broadcast_placeholder': ''}]
+    )
+    mongo_db.epl_schedules.insert_many(
+        [{'_id': game_id, 'sport': 'EPL', 'game_date': game_date, 'is_validated': False} for game_id, game_date in EPL_GAMES]
+    )
+    return mongo_db
+
+
+@pytest.mark.parametrize('page_size', [1, 2, 3, 4, 50])
+def test_pages_cover_the_queue_in_order(db, page_size, monkeypatch):
+    counts = []
+    count_documents = type(db.schedules).count_documents
+    monkeypatch.setattr(type(db.schedules), 'count_documents',
+                        lambda self, *args, **kwargs: counts.append(self.name) or count_documents(self, *args, **kwargs))
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = read_validation_queue(db, page_size, cursor)
+        pages += 1
+        assert len(page['games']) <= page_size
+        assert page['count'] == (len(EXPECTED) if pages == 1 else None)
+        seen += [game['_id'] for game in page['games']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == EXPECTED
+    assert pages == max(1, -(-len(EXPECTED) // page_size))
+    assert counts == ['schedules', 'epl_schedules']  # first page only
+
+
+def test_filters_combine_with_the_cursor(db):
+    first = read_validation_queue(db, 1, sport='NBA', start='2025-12-06', end='2025-12-06')
+    assert first['count'] == 3
+    second = read_validation_queue(db, 5, first['next_cursor'], sport='NBA', start='2025-12-06', end='2025-12-06')
+    assert [game['_id'] for game in first['games'] + second['games']] == EXPECTED[3:6]
+    assert second['next_cursor'] is None
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor({'_id': OID_1, 'game_date': '2025-12-06'}, 1)
+    assert decode_cursor(cursor)[:2] == ('2025-12-06', 1)
+    assert decode_cursor(encode_cursor({'_id': 'x', 'game_date': None}, 0))[:2] == (None, 0)
+    for tampered in ('', 'not-a-cursor', cursor[:-3], base64.urlsafe_b64encode(b'[1,2,3]').decode(),
+                     base64.urlsafe_b64encode(b'[null,0,true,"not-an-oid"]').decode(),
+                     base64.urlsafe_b64encode(b'{"a": 1}').decode()):
+        with pytest.raises(ValueError):
+            decode_cursor(tampered)
+
+
+def test_tampered_cursor_is_a_400(db):
+    client = admin_api.app.test_client()
+    response = client.get('/api/admin/unvalidated', query_string={'limit': 2, 'cursor': 'bm90IGEgY3Vyc29y'})
+    assert response.status_code == 400
+    assert client.get('/api/admin/unvalidated', query_string={'limit': 2}).status_code == 200
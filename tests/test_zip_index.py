@@ -0,0 +1,83 @@
+# tests/test_zip_index.py
+# Round trip of the memory-mapped ZIP index: built from user_location_map (mongomock, ZIPs
+# stored as integers), written, loaded back, and rejected when the file is damaged.
+
+import struct
+
+import mongomock
+import pytest
+
+from src.api import schedule_resolver
+from src.api.zip_index import MAGIC, ZipIndex, ZipIndexError, build_index, locations_from_mongo
+
+LOCATIONS = [
+    {'_id': 2134, 'dma_code': '506', 'state': 'MA', 'rsn_affiliations': {'NBA': 'NBC Sports Boston', 'NHL': 'NESN'}},
+    {'_id': 501, 'dma_code': '521', 'state': 'NY', 'rsn_affiliations': {}},  # 00501, Holtsville
+    {'_id': '10001', 'dma_code': '501', 'state': 'NY', 'rsn_affiliations': {'NBA': 'MSG'}},
+    {'_id': '10002', 'dma_code': '501', 'state': 'NY', 'rsn_affiliations': {'NBA': 'MSG'}},
+    {'_id': 99950, 'dma_code': 'ak1', 'state': 'AK'},
+    {'_id': 'not-a-zip', 'dma_code': '501', 'state': 'NY'},
+]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    db = mongomock.MongoClient().watchwherelive_db
+    db.user_location_map.insert_many([dict(location) for location in LOCATIONS])
+    path = str(tmp_path / 'zip_dma.idx')
+    stats = build_index(locations_from_mongo(db), path)
+    assert stats['zips'] == 5 and stats['skipped'] == 1
+    assert stats['markets'] == 4  # 10001 and 10002 share one record
+    return path
+
+
+def test_lookups(index_path):
+    index = ZipIndex(index_path)
+    try:
+        assert index.dma_for_zip('02134') == '506'
+        assert index.dma_for_zip(2134) == '506'
+        assert index.dma_for_zip('00501') == '521'
+        assert index.dma_for_zip('99950') == 'AK1'
+        assert index.location('02134') == {'_id': '02134', 'dma_code': '506', 'state': 'MA',
+                                          'rsn_affiliations': {'NBA': 'NBC Sports Boston', 'NHL': 'NESN'}}
+        assert index.location('10002') == {'_id': '10002', 'dma_code': '501', 'state': 'NY',
+                                          'rsn_affiliations': {'NBA': 'MSG'}}
+        assert index.location('99950')['rsn_affiliations'] == {}
+        for miss in ('90210', '00000', '99999', 'abcde', None, -1, 100000):
+            assert index.dma_for_zip(miss) is None and index.location(miss) is None
+    finally:
+        index.close()
+
+
+def test_resolver_uses_the_index(index_path, monkeypatch):
+    index = ZipIndex(index_path)
+    monkeypatch.setattr(schedule_resolver, 'get_zip_index', lambda: index)
+    try:
+        locations = schedule_resolver.resolve_locations(None, ['02134', '90210'])
+        assert list(locations) == ['02134'] and locations['02134']['dma_code'] == '506'
+    finally:
+        index.close()
+
+
+def _damage(path, offset, data):
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        f.write(data)
+
+
+@pytest.mark.parametrize('offset, data, message', [
+    (len(MAGIC) + struct.calcsize('<HHIIII') + 2 * 2134, b'\x07', 'checksum'),  # one ZIP slot
+    (len(MAGIC), struct.pack('<H', 2), 'format version'),
+    (0, b'NOTANIDX', 'not a ZIP index'),
+])
+def test_damaged_files_are_rejected(index_path, offset, data, message):
+    _damage(index_path, offset, data)
+    with pytest.raises(ZipIndexError, match=message):
+        ZipIndex(index_path)
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = tmp_path / 'short.idx'
+    path.write_bytes(MAGIC)
+    with pytest.raises(ZipIndexError):
+        ZipIndex(str(path))